@@ -10,6 +10,20 @@ import threading
 import time
 import random
 import string
+import struct
+import signal
+import queue
+import re
+import zlib
+import fcntl
+import errno
+import mmap
+import ctypes
+import platform
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
 
 class HealthPanelWindow(Gtk.Window):
     def __init__(self, parent_window, drive_info):
@@ -24,6 +38,9 @@ class HealthPanelWindow(Gtk.Window):
         # Make it stay on top
         self.set_keep_above(True)
         
+        # Set when the panel closes, to cancel a running smartctl and drop late results
+        self.closed = False
+        
         # Connect destroy signal
         self.connect("destroy", self.on_health_panel_close)
         
@@ -46,6 +63,11 @@ class HealthPanelWindow(Gtk.Window):
         
         main_box.pack_start(title_hbox, False, False, 0)
         
+        # Where the values came from: cache, refresh in progress, or live
+        self.status_label = Gtk.Label()
+        self.status_label.set_xalign(0)
+        main_box.pack_start(self.status_label, False, False, 0)
+        
         # Health data container
         self.health_data_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
         main_box.pack_start(self.health_data_box, True, True, 0)
@@ -77,6 +99,7 @@ class HealthPanelWindow(Gtk.Window):
     
     def on_health_panel_close(self, widget):
         """Called when health panel is closed"""
+        self.closed = True
         # Notify parent that panel is closed
         if self.parent_window:
             self.parent_window.health_panel = None
@@ -86,212 +109,74 @@ class HealthPanelWindow(Gtk.Window):
         self.destroy()
     
     def load_health_data(self):
-        """Load and parse SMART health data"""
+        """Show cached SMART data at once and refresh it from smartctl in the background"""
         device_name = self.drive_info['name']
         physical_device = self.parent_window._get_physical_device(device_name)
         device_path = f"/dev/{physical_device}"
         
-        # Check if smartctl is installed
-        try:
-            subprocess.run(['which', 'smartctl'], check=True, capture_output=True)
-        except subprocess.CalledProcessError:
-            self.show_error("smartctl not found")
+        cached = self.parent_window.health_cache.get(physical_device)
+        if cached:
+            health, age = cached
+            self.show_health(health)
+            if age < self.parent_window.health_cache.ttl:
+                # Prefetched or recently read - no need to ask the drive again
+                self.set_status(f"Read {format_age(age)} ago")
+                return
+            self.set_status(f"Cached {format_age(age)} ago - refreshing...")
+        
+        if not find_tool('smartctl'):
+            if cached:
+                self.set_status(f"Cached {format_age(age)} ago - smartctl not found")
+            else:
+                self.show_error("smartctl not found")
             return
         
-        # Use smartctl for SMART data access (assumes script runs with sudo)
+        threading.Thread(target=self.collect_health_data, args=(physical_device, device_path), daemon=True).start()
+    
+    def collect_health_data(self, physical_device, device_path):
+        """Worker thread: run smartctl (assumes script runs with sudo), cancelled if the panel closes"""
         try:
-            result = subprocess.run(
-                ['smartctl', '-A', device_path],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode in [0, 4]:
-                # Check if this is NVMe format (starts with SMART/Health Information)
-                if "SMART/Health Information" in result.stdout:
-                    self.parse_nvme_health_data(result.stdout)
-                else:
-                    self.parse_health_data(result.stdout)
-            else:
-                self.show_error("Failed to read SMART data")
+            health, error = collect_drive_health(device_path, cancel_check=lambda: self.closed)
         except Exception as e:
-            self.show_error(f"Error: {str(e)}")
-    
-    def parse_nvme_health_data(self, smart_output):
-        """Parse NVMe SMART data format"""
-        # Clear loading label
-        self.health_data_box.remove(self.loading_label)
-        
-        health_data = {}
-        lines = smart_output.strip().split('\n')
+            GLib.idle_add(self.refresh_failed, f"Error: {str(e)}")
+            return
         
-        for line in lines:
-            line = line.strip()
-            if ':' in line and not line.startswith('==='):
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    key = parts[0].strip()
-                    value = parts[1].strip()
-                    
-                    # Map NVMe attributes to our relevant attributes
-                    if 'Temperature' in key and 'Sensor' not in key:
-                        try:
-                            temp = int(value.split()[0])
-                            health_data['Temperature'] = f"{temp}°C"
-                        except:
-                            pass
-                    elif 'Available Spare' in key and 'Threshold' not in key:
-                        health_data['Available Reserved Space'] = value
-                    elif 'Percentage Used' in key:
-                        # This is wear indicator - invert it for SSD life left
-                        try:
-                            used_percent = int(value.replace('%', ''))
-                            life_left = 100 - used_percent
-                            health_data['Media Wearout Indicator'] = f"{life_left}%"
-                            health_data['SSD Life Left'] = f"{life_left}%"
-                        except:
-                            pass
-                    elif 'Data Units Written' in key:
-                        # Extract TB written
-                        if '[' in value and 'TB' in value:
-                            tb_written = value.split('[')[1].split('TB')[0].strip()
-                            health_data['Total LBAs Written'] = f"{tb_written} TB"
-                            health_data['Total GBs Written'] = f"{float(tb_written) * 1024:.0f} GB"
-                    elif 'Data Units Read' in key:
-                        if '[' in value and 'TB' in value:
-                            tb_read = value.split('[')[1].split('TB')[0].strip()
-                            health_data['Total LBAs Read'] = f"{tb_read} TB"
-                            health_data['Total GBs Read'] = f"{float(tb_read) * 1024:.0f} GB"
-                    elif 'Power Cycles' in key:
-                        health_data['Power Cycle Count'] = value
-                    elif 'Power On Hours' in key:
-                        hours = int(value.replace(',', ''))
-                        days = hours // 24
-                        health_data['Power On Hours'] = f"{hours}h ({days}d)"
-                    elif 'Media and Data Integrity Errors' in key:
-                        if int(value) > 0:
-                            health_data['Reported Uncorrectable Errors'] = value
-                    elif 'Unsafe Shutdowns' in key:
-                        if int(value) > 0:
-                            health_data['Unexpected Power Loss Count'] = value
-                    elif 'Controller Busy Time' in key:
-                        health_data['Controller Busy Time'] = f"{value} min"
-        
-        # Display the health data
-        if health_data:
-            for attr_name, value in sorted(health_data.items()):
-                hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-                
-                name_label = Gtk.Label(label=f"{attr_name}:")
-                name_label.set_xalign(0)
-                name_label.set_size_request(150, -1)
-                
-                value_label = Gtk.Label(label=value)
-                value_label.set_xalign(0)
-                
-                hbox.pack_start(name_label, False, False, 0)
-                hbox.pack_start(value_label, True, True, 0)
-                
-                self.health_data_box.pack_start(hbox, False, False, 2)
+        if self.closed:
+            return
+        if health is None:
+            GLib.idle_add(self.refresh_failed, error)
+            return
+        self.parent_window.health_cache.put(physical_device, health)
+        GLib.idle_add(self.refresh_done, health)
+    
+    def refresh_done(self, health):
+        """Replace whatever is shown with freshly read data"""
+        if not self.closed:
+            self.show_health(health)
+            self.set_status("")
+        return False
+    
+    def refresh_failed(self, error_msg):
+        """Keep cached values on screen if there are any, otherwise show the error"""
+        if self.closed:
+            return False
+        if self.loading_label.get_parent():
+            self.show_error(error_msg)
         else:
-            no_data_label = Gtk.Label(label="No NVMe health data found")
-            self.health_data_box.pack_start(no_data_label, True, True, 0)
-        
-        # Calculate and display overall assessment
-        self.calculate_ssd_assessment(health_data)
-        
-        self.show_all()
-
-    def parse_health_data(self, smart_output):
-        """Parse SMART attributes and display relevant ones"""
-        # Clear loading label
-        self.health_data_box.remove(self.loading_label)
-        
-        # Relevant SMART attributes for SSD health during wiping
-        relevant_attributes = {
-            '241': 'Total LBAs Written',
-            '231': 'SSD Life Left',
-            '230': 'Drive Life Protection Status',
-            '177': 'Wear Leveling Count',
-            '173': 'Wear Leveling Count',
-            '232': 'Available Reserved Space',
-            '233': 'Media Wearout Indicator',
-            '194': 'Temperature',
-            '195': 'Hardware ECC Recovered',
-            '5': 'Reallocated Sector Count',
-            '196': 'Reallocated Event Count',
-            '197': 'Current Pending Sector Count',
-            '198': 'Offline Uncorrectable Sector Count',
-            '9': 'Power On Hours',
-            '12': 'Power Cycle Count',
-            '170': 'Available Reserved Space',
-            '171': 'SSD Program Fail Count',
-            '172': 'SSD Erase Fail Count',
-            '174': 'Unexpected Power Loss Count',
-            '175': 'Power Loss Protection',
-            '176': 'Erase Fail Count',
-            '179': 'Used Reserved Block Count',
-            '180': 'Unused Reserved Block Count',
-            '181': 'Program Fail Count',
-            '182': 'Erase Fail Count',
-            '183': 'Runtime Bad Block Count',
-            '184': 'End-to-End Error',
-            '187': 'Reported Uncorrectable Errors',
-            '188': 'Command Timeout',
-            '189': 'High Fly Writes',
-            '190': 'Airflow Temperature',
-            '191': 'G-Sense Error Rate',
-            '192': 'Power-off Retract Count',
-            '193': 'Load Cycle Count',
-            '199': 'UDMA CRC Error Count',
-            '200': 'Multi-Zone Error Rate',
-            '240': 'Head Flying Hours',
-            '242': 'Total LBAs Read',
-            '245': 'Flash Write Error Rate',
-            '246': 'Total GBs Written',
-            '247': 'Total GBs Read'
-        }
-        
-        # Parse the output
-        health_data = {}
-        lines = smart_output.strip().split('\n')
-        
-        for line in lines:
-            parts = line.strip().split()
-            if len(parts) >= 10 and parts[0].isdigit():
-                attr_id = parts[0]
-                if attr_id in relevant_attributes:
-                    attr_name = relevant_attributes[attr_id]
-                    raw_value = parts[-1] if parts[-1] != '-' else parts[-2]
-                    
-                    # Format the value nicely
-                    try:
-                        if 'Temperature' in attr_name:
-                            value = f"{raw_value}°C"
-                        elif 'Hours' in attr_name:
-                            hours = int(raw_value)
-                            days = hours // 24
-                            value = f"{hours}h ({days}d)"
-                        elif 'Count' in attr_name or 'Written' in attr_name or 'Read' in attr_name:
-                            # Format large numbers
-                            num = int(raw_value)
-                            if num > 1000000:
-                                value = f"{num/1000000:.1f}M"
-                            elif num > 1000:
-                                value = f"{num/1000:.1f}K"
-                            else:
-                                value = str(num)
-                        else:
-                            value = raw_value
-                    except:
-                        value = raw_value
-                    
-                    health_data[attr_name] = value
-        
-        # Display the health data
-        if health_data:
-            for attr_name, value in sorted(health_data.items()):
+            self.set_status(f"Showing cached data - {error_msg}")
+        return False
+    
+    def set_status(self, text):
+        self.status_label.set_markup(f"<span foreground='gray'><small>{text}</small></span>" if text else "")
+    
+    def show_health(self, health):
+        """Render a DriveHealth record in place of the current rows"""
+        for child in self.health_data_box.get_children():
+            self.health_data_box.remove(child)
+        
+        rows = health.rows()
+        if rows:
+            for attr_name, value in rows:
                 hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
                 
                 name_label = Gtk.Label(label=f"{attr_name}:")
@@ -310,123 +195,18 @@ class HealthPanelWindow(Gtk.Window):
             self.health_data_box.pack_start(no_data_label, True, True, 0)
         
         # Calculate and display overall assessment
-        self.calculate_ssd_assessment(health_data)
+        self.calculate_ssd_assessment(health)
         
         self.show_all()
     
-    def calculate_ssd_assessment(self, health_data):
-        """Calculate overall SSD health assessment with 5-level system"""
-        drive_type = self.drive_info.get('type', 'Unknown')
-        
-        if 'SSD' not in drive_type:
+    def calculate_ssd_assessment(self, health):
+        """Show the overall SSD health assessment"""
+        assessment = assess_drive_health(health, self.drive_info.get('type', 'Unknown'))
+        if assessment is None:
             self.assessment_label.set_markup("<b>Drive Type:</b> <span foreground='blue'>Non-SSD</span>")
             return
         
-        # Initialize scoring factors
-        life_remaining = None
-        temperature = None
-        error_count = 0
-        reserved_space = None
-        
-        # Extract life remaining (most important factor)
-        if 'Media Wearout Indicator' in health_data or 'SSD Life Left' in health_data:
-            try:
-                key = 'Media Wearout Indicator' if 'Media Wearout Indicator' in health_data else 'SSD Life Left'
-                life_remaining = int(health_data[key].replace('%', ''))
-            except:
-                pass
-        
-        # Extract temperature
-        if 'Temperature' in health_data:
-            try:
-                temp_str = health_data['Temperature'].replace('°C', '').strip()
-                temperature = int(temp_str)
-            except:
-                pass
-        
-        # Count errors
-        error_indicators = ['Reallocated Sector Count', 'Current Pending Sector Count',
-                           'Reported Uncorrectable Errors', 'Command Timeout']
-        for indicator in error_indicators:
-            if indicator in health_data:
-                try:
-                    value = int(health_data[indicator])
-                    if value > 0:
-                        error_count += value
-                except:
-                    pass
-        
-        # Check reserved space
-        if 'Available Reserved Space' in health_data:
-            try:
-                reserved = health_data['Available Reserved Space']
-                if '%' in reserved:
-                    reserved_space = int(reserved.replace('%', ''))
-            except:
-                pass
-        
-        # Determine health level based on factors (prioritize life remaining)
-        if life_remaining is None:
-            # No life data available
-            status_text = "❓ Unknown"
-            color = "gray"
-            message = "Unable to determine SSD health"
-        elif life_remaining >= 80:
-            # Excellent: Brand new or lightly used
-            if temperature and temperature > 60:
-                status_text = "🟢 Excellent (but warm)"
-                color = "green"
-                message = f"Drive is in excellent condition. Temp: {temperature}°C"
-            else:
-                status_text = "🟢 Excellent"
-                color = "green"
-                message = "Drive is in excellent condition. Safe for wiping."
-        elif life_remaining >= 50:
-            # Good: Healthy drive
-            if temperature and temperature > 70:
-                status_text = "🟢 Good (hot)"
-                color = "green"
-                message = f"Drive is healthy but hot ({temperature}°C). Monitor temperature."
-            elif error_count > 5:
-                status_text = "🟢 Good (some errors)"
-                color = "green"
-                message = f"Drive is healthy but has {error_count} errors. Safe for wiping."
-            else:
-                status_text = "🟢 Good"
-                color = "green"
-                message = "Drive is healthy. Safe for wiping."
-        elif life_remaining >= 30:
-            # Fair: Aging but usable
-            if temperature and temperature > 70:
-                status_text = "🟡 Fair (hot)"
-                color = "orange"
-                message = f"Drive is aging and hot ({temperature}°C). Wiping will add wear."
-            elif error_count > 10:
-                status_text = "🟡 Fair (errors)"
-                color = "orange"
-                message = f"Drive is aging with {error_count} errors. Wiping will add wear."
-            else:
-                status_text = "🟡 Fair"
-                color = "orange"
-                message = f"Drive is aging ({life_remaining}% life left). Wiping will add wear."
-        elif life_remaining >= 15:
-            # Warning: Worn drive, not recommended
-            status_text = "🟠 Warning"
-            color = "#ff6600"  # Dark orange
-            message = f"⚠️ Drive is worn ({life_remaining}% life left). Wiping NOT recommended."
-        else:
-            # Critical: Very worn, DO NOT WIPE
-            status_text = "🔴 Critical"
-            color = "red"
-            message = f"🛑 Critical: Don't wipe this drive! Only {life_remaining}% life left. Risk of failure."
-        
-        # Add temperature warning for critical temps regardless of life
-        if temperature and temperature > 80:
-            status_text = "🔴 Critical"
-            color = "red"
-            message = f"🛑 Critical temperature: {temperature}°C! Don't wipe this drive."
-        
-        # Display the assessment
+        _, status_text, color, message = assessment
         self.assessment_label.set_markup(
             f"<b>SSD Status:</b> <span foreground='{color}'>{status_text}</span>\n"
             f"<span foreground='{color}'><small>{message}</small></span>"
@@ -443,8 +223,9 @@ class HealthPanelWindow(Gtk.Window):
 
 class MFTScanProgressDialog(Gtk.Window):
     """Progress dialog for MFT scanning operations"""
-    def __init__(self, parent_window, device_path):
+    def __init__(self, parent_window, device_path, cancel_callback=None):
         super().__init__(type=Gtk.WindowType.TOPLEVEL)
+        self.cancel_callback = cancel_callback
         self.set_transient_for(parent_window)
         self.set_modal(True)
         self.set_keep_above(True)
@@ -507,11 +288,2634 @@ class MFTScanProgressDialog(Gtk.Window):
 
     def on_cancel_clicked(self, widget, event=None):
         """Handle cancel button or window close"""
+        if self.cancel_callback:
+            self.cancel_callback()
         self.destroy()
         return True
 
 
+def get_cache_dir():
+    """Per-user cache directory for scan results that should survive restarts"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'barones-free-space-cleaner')
+
+
+_tool_paths = {}
+
+
+def find_tool(name):
+    """shutil.which, looked up once per process"""
+    if name not in _tool_paths:
+        _tool_paths[name] = shutil.which(name)
+    return _tool_paths[name]
+
+
+def format_age(seconds):
+    """Short human age such as 40s, 12 min or 3h"""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.0f}h"
+
+
+class MetadataScanCache:
+    """Persistent MFT/exFAT scan results keyed by volume identity (UUID/serial + size)"""
+
+    FREE_SPACE_DRIFT = 0.01  # Fraction of volume size
+    ENTRY_COUNT_DRIFT = 0.01  # Fraction of the cached entry count
+    MAX_ENTRIES = 64
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_cache_dir(), 'metadata-scans.json')
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data):
+        # Keep only the most recently scanned volumes
+        if len(data) > self.MAX_ENTRIES:
+            newest = sorted(data.items(), key=lambda item: item[1].get('scanned_at', 0), reverse=True)
+            data = dict(newest[:self.MAX_ENTRIES])
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, indent=1)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Cannot write scan cache {self.path}: {e}")
+
+    def lookup(self, volume_key, free_bytes, total_bytes, entry_count=None):
+        """Return the cached scan result if the volume has not drifted since it was scanned"""
+        with self.lock:
+            entry = self._load().get(volume_key)
+        if not entry:
+            return None
+
+        free_drift = abs(free_bytes - entry.get('free', 0))
+        if free_drift > total_bytes * self.FREE_SPACE_DRIFT:
+            print(f"🗂️ Scan cache stale for {volume_key}: free space moved by {free_drift / (1024**3):.1f} GB")
+            return None
+
+        cached_count = entry.get('entry_count')
+        if entry_count is not None and cached_count is not None:
+            if abs(entry_count - cached_count) > max(1, cached_count * self.ENTRY_COUNT_DRIFT):
+                print(f"🗂️ Scan cache stale for {volume_key}: entry count {cached_count:,} → {entry_count:,}")
+                return None
+
+        age_hours = (time.time() - entry.get('scanned_at', 0)) / 3600
+        print(f"🗂️ Using cached scan for {volume_key} ({age_hours:.1f}h old)")
+        return entry.get('result')
+
+    def store(self, volume_key, result, free_bytes, entry_count=None):
+        """Remember a scan result together with the volume state it was taken in"""
+        with self.lock:
+            data = self._load()
+            data[volume_key] = {
+                'result': result,
+                'free': free_bytes,
+                'entry_count': entry_count,
+                'scanned_at': time.time()
+            }
+            self._save(data)
+
+    def invalidate(self, volume_key):
+        """Forget a volume, e.g. after its metadata was cleaned"""
+        with self.lock:
+            data = self._load()
+            if data.pop(volume_key, None) is not None:
+                self._save(data)
+
+
+class HealthCache:
+    """Last DriveHealth per physical device for the session; entries younger than the TTL count as fresh"""
+
+    TTL = 300
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl or self.TTL
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, device):
+        """Return (health, age in seconds) or None"""
+        with self.lock:
+            entry = self.entries.get(device)
+        if not entry:
+            return None
+        health, fetched_at = entry
+        return health, time.time() - fetched_at
+
+    def fresh(self, device):
+        """Return the cached DriveHealth if it is younger than the TTL, else None"""
+        cached = self.get(device)
+        if cached and cached[1] < self.ttl:
+            return cached[0]
+        return None
+
+    def put(self, device, health):
+        with self.lock:
+            self.entries[device] = (health, time.time())
+
+
+@dataclass
+class DriveHealth:
+    """SMART health of one drive from ATA attributes or the NVMe health log (None = not reported)"""
+
+    # ATA attributes whose normalized value counts remaining endurance down from 100, by preference
+    ATA_LIFE_LEFT = (231, 233, 202, 177)
+    NVME_DATA_UNIT = 512 * 1000
+
+    nvme: bool = False
+    model: Optional[str] = None
+    smart_passed: Optional[bool] = None
+    temperature: Optional[int] = None
+    life_left: Optional[int] = None  # Percent
+    available_spare: Optional[int] = None  # Percent
+    power_on_hours: Optional[int] = None
+    power_cycles: Optional[int] = None
+    bytes_written: Optional[int] = None
+    bytes_read: Optional[int] = None
+    host_writes: Optional[tuple] = None  # (smartctl attribute name, raw count) when not counted in LBAs
+    host_reads: Optional[tuple] = None
+    reallocated_sectors: Optional[int] = None
+    pending_sectors: Optional[int] = None
+    uncorrectable_errors: Optional[int] = None
+    offline_uncorrectable: Optional[int] = None
+    command_timeouts: Optional[int] = None
+    unsafe_shutdowns: Optional[int] = None
+    controller_busy_minutes: Optional[int] = None
+
+    @classmethod
+    def from_smartctl_json(cls, text):
+        """Build from `smartctl -j -a` output; raises ValueError if it is not smartctl JSON"""
+        data = json.loads(text)
+        if not isinstance(data, dict) or 'smartctl' not in data:
+            raise ValueError("not smartctl JSON output")
+        health = cls(model=data.get('model_name'))
+        health.smart_passed = data.get('smart_status', {}).get('passed')
+        health.temperature = data.get('temperature', {}).get('current')
+        health.power_on_hours = data.get('power_on_time', {}).get('hours')
+        health.power_cycles = data.get('power_cycle_count')
+
+        nvme_log = data.get('nvme_smart_health_information_log')
+        if nvme_log:
+            health._from_nvme_log(nvme_log)
+        else:
+            health._from_ata_attributes(data.get('ata_smart_attributes', {}).get('table', []),
+                                        data.get('logical_block_size', 512))
+        return health
+
+    def _from_nvme_log(self, log):
+        self.nvme = True
+        if self.temperature is None:
+            self.temperature = log.get('temperature')
+        self.available_spare = log.get('available_spare')
+        if log.get('percentage_used') is not None:
+            # Percentage used can pass 100 on drives that outlive their rating
+            self.life_left = max(0, 100 - log['percentage_used'])
+        if log.get('data_units_written') is not None:
+            self.bytes_written = log['data_units_written'] * self.NVME_DATA_UNIT
+        if log.get('data_units_read') is not None:
+            self.bytes_read = log['data_units_read'] * self.NVME_DATA_UNIT
+        self.power_cycles = log.get('power_cycles', self.power_cycles)
+        self.power_on_hours = log.get('power_on_hours', self.power_on_hours)
+        self.uncorrectable_errors = log.get('media_errors')
+        self.unsafe_shutdowns = log.get('unsafe_shutdowns')
+        self.controller_busy_minutes = log.get('controller_busy_time')
+
+    def _from_ata_attributes(self, table, block_size):
+        attributes = {attribute.get('id'): attribute for attribute in table}
+
+        def raw(attribute_id):
+            attribute = attributes.get(attribute_id)
+            return attribute.get('raw', {}).get('value') if attribute else None
+
+        def normalized(attribute_id):
+            attribute = attributes.get(attribute_id)
+            return attribute.get('value') if attribute else None
+
+        def host_counter(lba_name, attribute_id):
+            """(bytes, None) for a counter smartctl names in LBAs, else (None, (name, raw count)) or (None, None)"""
+            lbas = next((attribute.get('raw', {}).get('value') for attribute in table
+                         if attribute.get('name') == lba_name), None)
+            if lbas is not None:
+                return lbas * block_size, None
+            # Vendors count 241/242 in 32 MiB, GiB or other units and only smartctl's name says which
+            if raw(attribute_id) is not None:
+                return None, (attributes[attribute_id].get('name') or f"Attribute_{attribute_id}", raw(attribute_id))
+            return None, None
+
+        self.life_left = next((normalized(i) for i in self.ATA_LIFE_LEFT if normalized(i) is not None), None)
+        self.available_spare = normalized(232) if normalized(232) is not None else normalized(170)
+        if self.temperature is None:
+            # Higher bytes of the raw value hold the min/max on many drives
+            temperature = raw(194) if raw(194) is not None else raw(190)
+            self.temperature = temperature & 0xFF if temperature is not None else None
+        if self.power_on_hours is None:
+            self.power_on_hours = raw(9)
+        if self.power_cycles is None:
+            self.power_cycles = raw(12)
+        self.bytes_written, self.host_writes = host_counter('Total_LBAs_Written', 241)
+        self.bytes_read, self.host_reads = host_counter('Total_LBAs_Read', 242)
+        self.reallocated_sectors = raw(5)
+        self.pending_sectors = raw(197)
+        self.uncorrectable_errors = raw(187)
+        self.offline_uncorrectable = raw(198)
+        self.command_timeouts = raw(188)
+        self.unsafe_shutdowns = raw(174)
+
+    @property
+    def error_count(self):
+        """Sum of the error counters the assessment weighs"""
+        return sum(value for value in (self.reallocated_sectors, self.pending_sectors,
+                                       self.uncorrectable_errors, self.command_timeouts) if value)
+
+    def rows(self):
+        """(label, text) pairs for the panel, only for fields the drive reported"""
+        def size(value):
+            return f"{value / 1024**4:.2f} TB" if value >= 1024**4 else f"{value / 1024**3:.0f} GB"
+
+        def counter(name_and_count):
+            # Shown under smartctl's attribute name, which carries the unit (Host_Writes_32MiB)
+            if name_and_count is None:
+                return None, None, None
+            name, count = name_and_count
+            return name.replace('_', ' '), count, lambda v: f"{v:,}"
+
+        fields = [
+            ('Temperature', self.temperature, lambda v: f"{v}°C"),
+            ('SSD Life Left', self.life_left, lambda v: f"{v}%"),
+            ('Available Spare', self.available_spare, lambda v: f"{v}%"),
+            ('Power On Hours', self.power_on_hours, lambda v: f"{v}h ({v // 24}d)"),
+            ('Power Cycle Count', self.power_cycles, lambda v: f"{v:,}"),
+            ('Data Written', self.bytes_written, size),
+            ('Data Read', self.bytes_read, size),
+            counter(self.host_writes),
+            counter(self.host_reads),
+            ('Reallocated Sectors', self.reallocated_sectors, lambda v: f"{v:,}"),
+            ('Pending Sectors', self.pending_sectors, lambda v: f"{v:,}"),
+            ('Uncorrectable Errors', self.uncorrectable_errors, lambda v: f"{v:,}"),
+            ('Offline Uncorrectable', self.offline_uncorrectable, lambda v: f"{v:,}"),
+            ('Command Timeouts', self.command_timeouts, lambda v: f"{v:,}"),
+            ('Unsafe Shutdowns', self.unsafe_shutdowns, lambda v: f"{v:,}"),
+            ('Controller Busy Time', self.controller_busy_minutes, lambda v: f"{v:,} min"),
+        ]
+        return [(label, text(value)) for label, value, text in fields if value is not None]
+
+
+def collect_drive_health(device_path, cancel_check=None):
+    """Run `smartctl -j -a` (needs root); returns (DriveHealth, None) or (None, error message)"""
+    result = StreamingCommand(['smartctl', '-j', '-a', device_path], cancel_check=cancel_check,
+                              hard_timeout=10).run()
+    if result.status == 'cancelled':
+        return None, "cancelled"
+    if result.status == 'timeout':
+        return None, "smartctl timed out"
+    # Exit status bits 0-1 mean smartctl could not talk to the device; the rest report drive conditions
+    if result.returncode is None or result.returncode & 3:
+        return None, "Failed to read SMART data"
+    try:
+        return DriveHealth.from_smartctl_json(result.stdout), None
+    except ValueError:
+        return None, "Unreadable smartctl output (smartctl 7.0+ is needed)"
+
+
+def assess_drive_health(health, drive_type):
+    """5-level SSD assessment as (level, status text, colour, message); None for drives that are not SSDs.
+
+    level is one of 'unknown', 'excellent', 'good', 'fair', 'warning' or 'critical'.
+    """
+    if 'SSD' not in drive_type:
+        return None
+    
+    life_remaining = health.life_left
+    temperature = health.temperature
+    error_count = health.error_count
+    
+    # Determine health level based on factors (prioritize life remaining)
+    if life_remaining is None:
+        # No life data available
+        level = 'unknown'
+        status_text = "❓ Unknown"
+        color = "gray"
+        message = "Unable to determine SSD health"
+    elif life_remaining >= 80:
+        # Excellent: Brand new or lightly used
+        if temperature and temperature > 60:
+            level = 'excellent'
+            status_text = "🟢 Excellent (but warm)"
+            color = "green"
+            message = f"Drive is in excellent condition. Temp: {temperature}°C"
+        else:
+            level = 'excellent'
+            status_text = "🟢 Excellent"
+            color = "green"
+            message = "Drive is in excellent condition. Safe for wiping."
+    elif life_remaining >= 50:
+        # Good: Healthy drive
+        if temperature and temperature > 70:
+            level = 'good'
+            status_text = "🟢 Good (hot)"
+            color = "green"
+            message = f"Drive is healthy but hot ({temperature}°C). Monitor temperature."
+        elif error_count > 5:
+            level = 'good'
+            status_text = "🟢 Good (some errors)"
+            color = "green"
+            message = f"Drive is healthy but has {error_count} errors. Safe for wiping."
+        else:
+            level = 'good'
+            status_text = "🟢 Good"
+            color = "green"
+            message = "Drive is healthy. Safe for wiping."
+    elif life_remaining >= 30:
+        # Fair: Aging but usable
+        if temperature and temperature > 70:
+            level = 'fair'
+            status_text = "🟡 Fair (hot)"
+            color = "orange"
+            message = f"Drive is aging and hot ({temperature}°C). Wiping will add wear."
+        elif error_count > 10:
+            level = 'fair'
+            status_text = "🟡 Fair (errors)"
+            color = "orange"
+            message = f"Drive is aging with {error_count} errors. Wiping will add wear."
+        else:
+            level = 'fair'
+            status_text = "🟡 Fair"
+            color = "orange"
+            message = f"Drive is aging ({life_remaining}% life left). Wiping will add wear."
+    elif life_remaining >= 15:
+        # Warning: Worn drive, not recommended
+        level = 'warning'
+        status_text = "🟠 Warning"
+        color = "#ff6600"  # Dark orange
+        message = f"⚠️ Drive is worn ({life_remaining}% life left). Wiping NOT recommended."
+    else:
+        # Critical: Very worn, DO NOT WIPE
+        level = 'critical'
+        status_text = "🔴 Critical"
+        color = "red"
+        message = f"🛑 Critical: Don't wipe this drive! Only {life_remaining}% life left. Risk of failure."
+    
+    # Add temperature warning for critical temps regardless of life
+    if temperature and temperature > 80:
+        level = 'critical'
+        status_text = "🔴 Critical"
+        color = "red"
+        message = f"🛑 Critical temperature: {temperature}°C! Don't wipe this drive."
+    
+    return level, status_text, color, message
+
+
+PRESSURE_SHARD_FANOUT = 256  # Default cap on shard subdirectories for metadata pressure files
+
+
+def choose_pressure_shard_count(target_files, fstype, fanout):
+    """Choose how many shard subdirectories to spread metadata pressure files across"""
+    # NTFS keeps each directory in a $I30 B+tree, exFAT in a linear directory stream
+    # that is scanned on every insert, so exFAT directories are kept much smaller
+    if 'EXFAT' in fstype.upper():
+        entries_per_shard = 256
+    else:
+        entries_per_shard = 1024
+
+    # Round up to a power of two, capped at the configured fan-out
+    shard_count = 1
+    while shard_count * entries_per_shard < target_files and shard_count < fanout:
+        shard_count *= 2
+    return max(1, min(shard_count, fanout))
+
+
+def log_pressure_rate_curve(label, rate_samples):
+    """Print create rate against file index to check per-file cost stays flat"""
+    if len(rate_samples) < 2:
+        return
+
+    print(f"📈 {label} create rate by file index:")
+    for index, window_rate in rate_samples:
+        print(f"   {index:>9,}: {window_rate:8.0f} files/sec")
+
+    # Compare the last quarter of the run against the first quarter
+    quarter = max(1, len(rate_samples) // 4)
+    first_rate = sum(r for _, r in rate_samples[:quarter]) / quarter
+    last_rate = sum(r for _, r in rate_samples[-quarter:]) / quarter
+    if first_rate > 0:
+        flatness = last_rate / first_rate * 100
+        if flatness >= 80:
+            print(f"✅ Create rate stayed flat: end of run at {flatness:.0f}% of start rate")
+        else:
+            print(f"⚠️ Create rate dropped: end of run at {flatness:.0f}% of start rate")
+
+
+def benchmark_pressure_files(directory, file_count=200000, fstype='NTFS', fanout=PRESSURE_SHARD_FANOUT,
+                             sample_every=None):
+    """Create sharded pressure files in a scratch directory and report create rate against file index"""
+    sample_every = sample_every or max(100, file_count // 20)
+    temp_dir = os.path.join(directory, f"PRESSURE_BENCH_{random.randint(1000, 9999)}")
+    shard_count = choose_pressure_shard_count(file_count, fstype, fanout)
+    shard_dirs = [os.path.join(temp_dir, f"{shard:02x}") for shard in range(shard_count)]
+    for shard_dir in shard_dirs:
+        os.makedirs(shard_dir, exist_ok=True)
+    print(f"📂 {file_count:,} files over {shard_count} shard directories in {temp_dir}")
+
+    rate_samples = []
+    created = 0
+    window_start_time = start_time = time.time()
+    window_start_count = 0
+    try:
+        for i in range(file_count):
+            filename = f"ZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZ_PRESSURE_BENCH_{i:08d}.ZZZ"
+            try:
+                with open(os.path.join(shard_dirs[i % shard_count], filename), 'w') as f:
+                    f.write("X" * 500)
+                created += 1
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    print(f"Volume full after {created:,} files")
+                    break
+                continue
+            if created % sample_every == 0:
+                window_time = time.time() - window_start_time
+                rate_samples.append((created, (created - window_start_count) / window_time if window_time > 0 else 0))
+                window_start_time = time.time()
+                window_start_count = created
+        elapsed = time.time() - start_time
+        print(f"Created {created:,} files in {elapsed:.1f}s ({created / elapsed if elapsed > 0 else 0:.0f} files/sec)")
+        log_pressure_rate_curve(f"{fstype} pressure benchmark", rate_samples)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def benchmark_health_parser(corpus_dir, repeat=200):
+    """Time DriveHealth.from_smartctl_json over captured `smartctl -j -a` outputs (*.json)"""
+    total_seconds = 0.0
+    total_parses = 0
+    for entry in sorted(os.listdir(corpus_dir)):
+        if not entry.endswith('.json'):
+            continue
+        with open(os.path.join(corpus_dir, entry), 'r') as f:
+            text = f.read()
+        try:
+            health = DriveHealth.from_smartctl_json(text)
+        except ValueError as e:
+            print(f"{entry}: not parsed ({e})")
+            continue
+        start = time.perf_counter()
+        for _ in range(repeat):
+            DriveHealth.from_smartctl_json(text)
+        elapsed = time.perf_counter() - start
+        total_seconds += elapsed
+        total_parses += repeat
+        kind = 'NVMe' if health.nvme else 'ATA'
+        print(f"{entry}: {kind}, {len(text):,} bytes, {elapsed / repeat * 1e6:.1f} µs per parse, "
+              f"{len(health.rows())} fields")
+    if total_parses:
+        print(f"{total_parses:,} parses, {total_seconds / total_parses * 1e6:.1f} µs average")
+    else:
+        print(f"No smartctl JSON files in {corpus_dir}")
+
+
+class WipePattern:
+    """Produces the bytes written for a wipe method (zeros, ones, 3487, random or keystream)"""
+
+    def __init__(self, method, chunk_size=64 * 1024 * 1024):
+        self.method = method
+        self.chunk_size = chunk_size
+        if method == "zeros":
+            self.fixed_chunk = b'\x00' * chunk_size
+        elif method == "ones":
+            self.fixed_chunk = b'\xFF' * chunk_size
+        elif method == "3487":
+            pattern = b"3487"
+            self.fixed_chunk = pattern * (chunk_size // len(pattern))
+        else:  # random / keystream - generated on the fly
+            self.fixed_chunk = None
+        # Keystream: one random block, made unique per 4K by stamping a counter, so neither
+        # compression (random content) nor block dedup (unique hashes) can shrink it
+        self.keystream_base = os.urandom(chunk_size) if method == "keystream" else None
+        self.keystream_counter = 0
+
+    def chunk(self, size=None):
+        """Next block of pattern data; fixed patterns always start on a pattern boundary"""
+        size = self.chunk_size if size is None else size
+        if self.keystream_base is not None:
+            return self._next_keystream(size)
+        if self.fixed_chunk is None:
+            return os.urandom(size)
+        if size == len(self.fixed_chunk):
+            return self.fixed_chunk
+        return self.fixed_chunk[:size]
+
+    def _next_keystream(self, size):
+        block = bytearray(self.keystream_base[:size])
+        self.keystream_counter += 1
+        for offset in range(0, size - 15, 4096):
+            struct.pack_into('<QQ', block, offset, self.keystream_counter, offset)
+        return block
+
+
+class VolumeBitmap:
+    """Allocation bitmap of a volume: bit set = unit (cluster/block) in use, LSB first"""
+
+    def __init__(self, bitmap, unit_size, unit_count, base_offset=0):
+        self.bitmap = bitmap
+        self.unit_size = unit_size
+        self.unit_count = unit_count
+        self.base_offset = base_offset  # Device byte offset of unit 0
+
+    def is_allocated(self, unit):
+        byte_index = unit >> 3
+        if unit < 0 or byte_index >= len(self.bitmap):
+            return True  # Outside the bitmap is never safe to touch
+        return bool(self.bitmap[byte_index] & (1 << (unit & 7)))
+
+    def free_unit_count(self):
+        """Number of free units"""
+        used = bin(int.from_bytes(self.bitmap[:(self.unit_count + 7) // 8], 'little')).count('1')
+        return max(0, self.unit_count - used)
+
+    def free_runs(self, start=0, count=None):
+        """Return (first_unit, unit_count) runs of free units inside [start, start + count)"""
+        end = self.unit_count if count is None else min(self.unit_count, start + count)
+        end = min(end, len(self.bitmap) * 8)
+        # Callers can start below unit 0 (exFAT cluster 2 is unit 0); a negative slice would come back empty
+        start = max(0, start)
+        if start >= end:
+            return []
+
+        first_byte = start >> 3
+        view = self.bitmap[first_byte:(end + 7) >> 3]
+        runs = []
+        run_start = None
+        run_end = None
+
+        def close_run():
+            if run_start is not None:
+                clamped_start = max(run_start, start)
+                clamped_end = min(run_end, end)
+                if clamped_end > clamped_start:
+                    runs.append((clamped_start, clamped_end - clamped_start))
+
+        # Whole free bytes, whole used bytes, and mixed bytes are handled separately for speed
+        for match in re.finditer(rb'\x00+|\xff+|[^\x00\xff]', view):
+            unit = (first_byte + match.start()) * 8
+            segment = match.group()
+            if segment[0] == 0x00:
+                if run_start is not None and run_end == unit:
+                    run_end = unit + len(segment) * 8
+                else:
+                    close_run()
+                    run_start, run_end = unit, unit + len(segment) * 8
+            elif segment[0] == 0xFF:
+                close_run()
+                run_start = run_end = None
+            else:
+                byte = segment[0]
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        close_run()
+                        run_start = run_end = None
+                    elif run_start is not None and run_end == unit + bit:
+                        run_end += 1
+                    else:
+                        close_run()
+                        run_start, run_end = unit + bit, unit + bit + 1
+        close_run()
+        return runs
+
+    def freed_since(self, snapshot):
+        """Runs that are free now but were allocated in an earlier snapshot of the same volume"""
+        if (snapshot.unit_size, snapshot.unit_count, snapshot.base_offset) != \
+                (self.unit_size, self.unit_count, self.base_offset):
+            raise ValueError("Snapshot geometry does not match the volume")
+        length = min(len(self.bitmap), len(snapshot.bitmap))
+        current = int.from_bytes(self.bitmap[:length], 'little')
+        previous = int.from_bytes(snapshot.bitmap[:length], 'little')
+        # A set bit in the mask means "leave alone": allocated now, or already free at snapshot time
+        mask = current | (((1 << (length * 8)) - 1) ^ previous)
+        return VolumeBitmap(mask.to_bytes(length, 'little'), self.unit_size, self.unit_count).free_runs()
+
+    def to_byte_ranges(self, runs):
+        """Convert unit runs to (device_offset, length) byte ranges"""
+        return [(self.base_offset + first * self.unit_size, count * self.unit_size) for first, count in runs]
+
+
+def region_matches(fd, expected, offset, read_buffer=None):
+    """True if the device already holds exactly `expected` at offset (read_buffer: aligned mmap for O_DIRECT)"""
+    size = len(expected)
+    if read_buffer is None:
+        return os.pread(fd, size, offset) == expected
+    with memoryview(read_buffer) as view:
+        if os.preadv(fd, [view[:size]], offset) != size:
+            return False
+    # Both sides are plain bytes, so == is a single memcmp
+    return read_buffer[:size] == expected
+
+
+def merge_runs(runs):
+    """Sort and merge overlapping or touching (first, count) runs"""
+    merged = []
+    for first, count in sorted(runs):
+        if merged and first <= merged[-1][0] + merged[-1][1]:
+            last_first, last_count = merged[-1]
+            merged[-1] = (last_first, max(last_count, first + count - last_first))
+        else:
+            merged.append((first, count))
+    return merged
+
+
+class RawRangeWriter:
+    """Writes a wipe pattern over byte ranges of an unmounted block device"""
+
+    WRITE_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, device_path, pattern, cancel_check=None, progress_callback=None,
+                 exclusive=True, direct_io=False, skip_matching=False, rate_limiter=None):
+        self.device_path = device_path
+        self.rate_limiter = rate_limiter
+        self.pattern = pattern
+        self.cancel_check = cancel_check
+        self.progress_callback = progress_callback
+        # Without exclusive, ranges must lie outside everything mounted on the device
+        self.exclusive = exclusive
+        # With direct_io, every range offset and length must be 4096-byte aligned
+        self.direct_io = direct_io
+        # Read each block first and leave it alone if it already holds the pattern (never for random)
+        self.skip_matching = skip_matching and pattern.fixed_chunk is not None
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+        self.cancelled = False
+
+    def write_ranges(self, ranges):
+        """Overwrite every (offset, length) range, returning the number of bytes written"""
+        total_bytes = sum(length for _, length in ranges)
+        last_progress_time = 0
+        # O_EXCL on a block device fails with EBUSY while it is mounted
+        flags = (os.O_RDWR if self.skip_matching else os.O_WRONLY) | \
+            (os.O_EXCL if self.exclusive else 0) | (os.O_DIRECT if self.direct_io else 0)
+        fd = os.open(self.device_path, flags)
+        # mmap memory is page aligned, as O_DIRECT requires
+        buffer = mmap.mmap(-1, self.WRITE_SIZE) if self.direct_io else None
+        read_buffer = mmap.mmap(-1, self.WRITE_SIZE) if self.direct_io and self.skip_matching else None
+        try:
+            for offset, length in ranges:
+                done = 0
+                while done < length:
+                    if self.cancel_check and self.cancel_check():
+                        self.cancelled = True
+                        return self.bytes_written
+                    size = min(self.WRITE_SIZE, length - done)
+                    data = self.pattern.chunk(size)
+                    if self.skip_matching and region_matches(fd, data, offset + done, read_buffer):
+                        self.bytes_skipped += size
+                        done += size
+                        continue
+                    if self.rate_limiter:
+                        self.rate_limiter.consume(size, lambda: not (self.cancel_check and self.cancel_check()))
+                    if buffer is not None:
+                        buffer[:size] = data
+                        with memoryview(buffer) as view:
+                            written = os.pwrite(fd, view[:size], offset + done)
+                    else:
+                        written = os.pwrite(fd, data, offset + done)
+                    if written <= 0:
+                        raise OSError(f"Short write at offset {offset + done}")
+                    done += written
+                    self.bytes_written += written
+
+                    now = time.time()
+                    if self.progress_callback and now - last_progress_time >= 0.5:
+                        last_progress_time = now
+                        self.progress_callback(self.bytes_written + self.bytes_skipped, total_bytes)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+            for mapping in (buffer, read_buffer):
+                if mapping is not None:
+                    mapping.close()
+        if self.progress_callback:
+            self.progress_callback(self.bytes_written + self.bytes_skipped, total_bytes)
+        return self.bytes_written
+
+
+FITRIM = 0xC0185879  # _IOWR('X', 121, struct fstrim_range)
+BLKGETSIZE64 = 0x80081272
+FS_IOC_FIEMAP = 0xC020660B
+FIEMAP_EXTENT_LAST = 0x00000001
+FIEMAP_EXTENT_UNKNOWN = 0x00000002
+FS_IOC_GETFLAGS = 0x80086601
+FS_COMPR_FL = 0x00000004
+BLKDISCARD = 0x1277
+BLKSECDISCARD = 0x127D
+SYNC_FILE_RANGE_WAIT_BEFORE = 1
+SYNC_FILE_RANGE_WRITE = 2
+SYNC_FILE_RANGE_WAIT_AFTER = 4
+
+
+def fitrim(mount_point, minimum_length=0):
+    """Discard all free space of a mounted filesystem; returns the bytes the filesystem trimmed"""
+    # struct fstrim_range { __u64 start; __u64 len; __u64 minlen; }
+    request = bytearray(struct.pack('<QQQ', 0, 0xFFFFFFFFFFFFFFFF, minimum_length))
+    fd = os.open(mount_point, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        fcntl.ioctl(fd, FITRIM, request, True)
+    finally:
+        os.close(fd)
+    return struct.unpack_from('<Q', request, 8)[0]
+
+
+def get_block_device_size(device_path):
+    """Exact size in bytes of a block device (or of a regular image file)"""
+    fd = os.open(device_path, os.O_RDONLY)
+    try:
+        if not os.path.isfile(device_path):
+            request = bytearray(8)
+            fcntl.ioctl(fd, BLKGETSIZE64, request, True)
+            return struct.unpack('<Q', request)[0]
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+
+class RawDeviceWiper:
+    """Overwrites a whole unmounted block device with a pool of O_DIRECT writers"""
+
+    RANGE_SIZE = 256 * 1024 * 1024  # Unit of work handed to each worker
+    WRITE_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, device_path, method, workers=4, cancel_check=None, pause_check=None, skip_matching=False,
+                 rate_limiter=None, worker_limit=None):
+        self.device_path = device_path
+        self.rate_limiter = rate_limiter
+        # Optional callable: pool size -> how many workers may write right now
+        self.worker_limit = worker_limit
+        self.method = method
+        self.workers = workers
+        self.cancel_check = cancel_check
+        self.pause_check = pause_check
+        # Random data never matches what is on disk, so comparing would only cost reads
+        self.skip_matching = skip_matching and method != "random"
+        self.size = get_block_device_size(device_path)
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+        self.cancelled = False
+        self.direct_io = True
+        self.lock = threading.Lock()
+        self.errors = []
+
+    def _cancelled(self):
+        return self.cancelled or bool(self.cancel_check and self.cancel_check())
+
+    def discard(self, secure=False):
+        """Discard the whole device; returns False if the device does not support it"""
+        fd = os.open(self.device_path, os.O_WRONLY | os.O_EXCL)
+        try:
+            fcntl.ioctl(fd, BLKSECDISCARD if secure else BLKDISCARD, struct.pack('<QQ', 0, self.size))
+            return True
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL):
+                return False
+            raise
+        finally:
+            os.close(fd)
+
+    def _open_writer(self):
+        """Open a per-worker descriptor, falling back to buffered I/O where O_DIRECT is refused"""
+        access = os.O_RDWR if self.skip_matching else os.O_WRONLY
+        if self.direct_io:
+            try:
+                return os.open(self.device_path, access | os.O_DIRECT)
+            except OSError as e:
+                if e.errno != errno.EINVAL:
+                    raise
+                self.direct_io = False
+        return os.open(self.device_path, access)
+
+    def _worker(self, index, ranges):
+        """Write ranges pulled from the shared queue"""
+        pattern = WipePattern(self.method, self.WRITE_SIZE)
+        # mmap memory is page aligned, as O_DIRECT requires
+        buffer = mmap.mmap(-1, self.WRITE_SIZE)
+        read_buffer = mmap.mmap(-1, self.WRITE_SIZE) if self.skip_matching else None
+        if pattern.fixed_chunk is not None:
+            buffer[:] = pattern.chunk()
+        fd = self._open_writer()
+        try:
+            while not self._cancelled():
+                # Workers above the limit sit out between ranges until it rises or the work runs out
+                while (self.worker_limit and index >= self.worker_limit(self.workers)
+                       and not ranges.empty() and not self._cancelled()):
+                    time.sleep(0.1)
+                try:
+                    offset, length = ranges.get_nowait()
+                except queue.Empty:
+                    break
+                done = 0
+                while done < length:
+                    while self.pause_check and self.pause_check() and not self._cancelled():
+                        time.sleep(0.1)
+                    if self._cancelled():
+                        return
+                    size = min(self.WRITE_SIZE, length - done)
+                    if self.skip_matching and region_matches(fd, pattern.chunk(size), offset + done,
+                                                             read_buffer if self.direct_io else None):
+                        done += size
+                        with self.lock:
+                            self.bytes_skipped += size
+                        continue
+                    if self.rate_limiter:
+                        self.rate_limiter.consume(size, lambda: not self._cancelled())
+                    if pattern.fixed_chunk is None:
+                        buffer[:size] = pattern.chunk(size)
+                    with memoryview(buffer) as view:
+                        written = os.pwrite(fd, view[:size], offset + done)
+                    if written <= 0:
+                        raise OSError(f"Short write at offset {offset + done}")
+                    done += written
+                    with self.lock:
+                        self.bytes_written += written
+            # O_DIRECT skips the page cache, not the drive's volatile write cache: flush that too
+            os.fsync(fd)
+        except Exception as e:
+            # Any failure must reach run(), or a dead worker would pass for a finished one
+            self.errors.append(e)
+            self.cancelled = True
+        finally:
+            os.close(fd)
+            buffer.close()
+            if read_buffer is not None:
+                read_buffer.close()
+
+    def run(self, progress_callback=None):
+        """Overwrite the device; returns the number of bytes written"""
+        ranges = queue.Queue()
+        for offset in range(0, self.size, self.RANGE_SIZE):
+            ranges.put((offset, min(self.RANGE_SIZE, self.size - offset)))
+
+        # Holding an exclusive claim keeps the device from being mounted while we write
+        guard_fd = os.open(self.device_path, os.O_RDONLY | os.O_EXCL)
+        try:
+            threads = [threading.Thread(target=self._worker, args=(index, ranges), daemon=True)
+                       for index in range(self.workers)]
+            for thread in threads:
+                thread.start()
+            while any(thread.is_alive() for thread in threads):
+                if progress_callback:
+                    progress_callback(self.bytes_written + self.bytes_skipped, self.size)
+                time.sleep(0.5)
+        finally:
+            os.close(guard_fd)
+
+        if self.errors:
+            raise self.errors[0]
+        if progress_callback:
+            progress_callback(self.bytes_written + self.bytes_skipped, self.size)
+        return self.bytes_written
+
+
+def fiemap_extents(path, batch=4096):
+    """Physical (offset, length) extents of a file via FS_IOC_FIEMAP"""
+    extents = []
+    header = struct.Struct('<QQIIII')
+    extent_format = struct.Struct('<QQQ16xI12x')  # logical, physical, length, flags (56 bytes)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        start = 0
+        while True:
+            request = bytearray(header.size + extent_format.size * batch)
+            header.pack_into(request, 0, start, 0xFFFFFFFFFFFFFFFF - start, 0, 0, batch, 0)
+            fcntl.ioctl(fd, FS_IOC_FIEMAP, request, True)
+            mapped = header.unpack_from(request)[3]
+            if not mapped:
+                break
+            last = None
+            for logical, physical, length, flags in extent_format.iter_unpack(
+                    memoryview(request)[header.size:header.size + extent_format.size * mapped]):
+                if not flags & FIEMAP_EXTENT_UNKNOWN:
+                    extents.append((physical, length))
+                last = (logical, length, flags)
+            if last[2] & FIEMAP_EXTENT_LAST:
+                break
+            start = last[0] + last[1]
+    finally:
+        os.close(fd)
+    return extents
+
+
+def fiemap_supported(directory):
+    """Whether files in this directory can be mapped with FS_IOC_FIEMAP"""
+    probe = os.path.join(directory, '.fiemap-probe')
+    try:
+        with open(probe, 'wb'):
+            pass
+        fiemap_extents(probe)
+        return True
+    except OSError:
+        return False
+    finally:
+        try:
+            os.remove(probe)
+        except OSError:
+            pass
+
+
+def subtract_runs(runs, removed):
+    """Parts of sorted, merged (first, count) runs not covered by sorted, merged `removed` runs"""
+    remaining = []
+    index = 0
+    for first, count in runs:
+        position = first
+        end = first + count
+        # Skip removed runs that end before this run starts
+        while index < len(removed) and removed[index][0] + removed[index][1] <= position:
+            index += 1
+        scan = index
+        while scan < len(removed) and removed[scan][0] < end:
+            removed_first, removed_count = removed[scan]
+            if removed_first > position:
+                remaining.append((position, removed_first - position))
+            position = max(position, removed_first + removed_count)
+            scan += 1
+        if position < end:
+            remaining.append((position, end - position))
+    return remaining
+
+
+class DirtyMemoryGovernor:
+    """Paces a buffered writer so Dirty + Writeback memory stays under a watermark"""
+
+    SAMPLE_INTERVAL = 0.25
+    MAX_PACING_DELAY = 0.05  # Longest sleep per write while between the low and high watermark
+
+    def __init__(self, watermark_fraction=0.05, disk_name=None):
+        self.disk_name = disk_name
+        mem_total = self._read_meminfo().get('MemTotal', 0)
+        self.high_watermark = int(mem_total * watermark_fraction)
+        self.low_watermark = self.high_watermark // 2
+        self.dirty = 0
+        self.inflight_writes = 0
+        self.queue_depth = self._read_queue_depth()
+        self.peak_dirty = 0
+        self.throttled_seconds = 0.0
+        self.running = False
+        self.thread = None
+
+    @staticmethod
+    def _read_meminfo():
+        """/proc/meminfo values in bytes"""
+        values = {}
+        try:
+            with open('/proc/meminfo', 'r') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 2 and fields[1].isdigit():
+                        values[fields[0].rstrip(':')] = int(fields[1]) * 1024
+        except OSError:
+            pass
+        return values
+
+    def _read_queue_depth(self):
+        try:
+            with open(f"/sys/block/{self.disk_name}/queue/nr_requests", 'r') as f:
+                return int(f.read().strip())
+        except (OSError, ValueError, TypeError):
+            return 0
+
+    def _sample(self):
+        meminfo = self._read_meminfo()
+        self.dirty = meminfo.get('Dirty', 0) + meminfo.get('Writeback', 0)
+        self.peak_dirty = max(self.peak_dirty, self.dirty)
+        if self.disk_name:
+            try:
+                with open(f"/sys/block/{self.disk_name}/inflight", 'r') as f:
+                    self.inflight_writes = int(f.read().split()[1])
+            except (OSError, ValueError, IndexError):
+                self.inflight_writes = 0
+
+    def _run(self):
+        while self.running:
+            self._sample()
+            time.sleep(self.SAMPLE_INTERVAL)
+
+    def start(self):
+        """Start the background sampler"""
+        if self.high_watermark and not self.running:
+            self.running = True
+            self._sample()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop the background sampler"""
+        self.running = False
+
+    def pace(self, keep_going=None):
+        """Call before each write: blocks above the high watermark, slows down between the watermarks"""
+        if not self.running:
+            return
+        start_time = time.time()
+        if self.dirty > self.high_watermark:
+            # Let writeback drain to the low watermark (hysteresis) before writing again
+            while self.running and self.dirty > self.low_watermark and (keep_going is None or keep_going()):
+                time.sleep(self.SAMPLE_INTERVAL / 2)
+        elif self.dirty > self.low_watermark:
+            share = (self.dirty - self.low_watermark) / max(1, self.high_watermark - self.low_watermark)
+            delay = self.MAX_PACING_DELAY * share
+            if self.queue_depth and self.inflight_writes >= self.queue_depth:
+                # Device queue is saturated - more dirty pages would only wait in memory
+                delay += self.MAX_PACING_DELAY
+            time.sleep(delay)
+        self.throttled_seconds += time.time() - start_time
+
+
+class IdleWindowScheduler:
+    """Pauses a writer while other programs use its disk and resumes once the disk has been quiet.
+
+    Foreign writes are the disk's written bytes minus our write_bytes from /proc/self/io, less write_slack:
+    the most of ours that can be charged there but not yet on the disk. That is the requests in flight for
+    O_DIRECT writers; buffered writers have to write_through() in WRITE_THROUGH_SIZE steps, as delayed
+    writeback would otherwise land seconds after the charge and look like someone else's.
+    """
+
+    SAMPLE_INTERVAL = 0.25
+    BUSY_WINDOW = 4  # Samples (one second) searched for foreign I/O
+    BUSY_SAMPLES = 3  # Reading in fewer samples is a burst of our own metadata, read by filesystem kernel threads
+    IDLE_SECONDS = 2.0
+    IDLE_UTILISATION = 0.10
+    FOREIGN_READ_RATE = 256 * 1024  # The fill never reads itself, so sustained read traffic is someone else
+    FOREIGN_WRITE_RATE = 4 * 1024 * 1024  # Above the journal and metadata writes our own fill causes
+    WRITE_THROUGH_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, disk_name, on_change=None, write_slack=WRITE_THROUGH_SIZE):
+        self.disk_name = disk_name
+        self.on_change = on_change
+        self.write_slack = write_slack
+        self.paused = False
+        self.pause_count = 0
+        self.paused_seconds = 0.0
+        self.running = False
+        self.thread = None
+
+    def _read_diskstats(self):
+        """(bytes read, bytes written, io_ticks ms) of the disk"""
+        with open('/proc/diskstats', 'r') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 13 and fields[2] == self.disk_name:
+                    return int(fields[5]) * 512, int(fields[9]) * 512, int(fields[12])
+        raise OSError(f"{self.disk_name} not found in /proc/diskstats")
+
+    @staticmethod
+    def _read_own_io():
+        """(read_bytes, write_bytes) this process sent to storage"""
+        values = {}
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                values[key] = int(value)
+        return values.get('read_bytes', 0), values.get('write_bytes', 0)
+
+    def _sample(self):
+        return (time.time(),) + self._read_diskstats() + self._read_own_io()
+
+    def _run(self):
+        history = [self._sample()]
+        quiet_since = None
+        paused_at = None
+        while self.running:
+            time.sleep(self.SAMPLE_INTERVAL)
+            try:
+                history.append(self._sample())
+            except (OSError, ValueError):
+                continue
+            history = history[-(self.BUSY_WINDOW + 1):]
+            first, last = history[0], history[-1]
+            elapsed = last[0] - first[0]
+            if elapsed <= 0:
+                continue
+
+            utilisation = (last[3] - first[3]) / (elapsed * 1000)
+            reading_samples = sum(1 for before, after in zip(history, history[1:])
+                                  if (after[1] - before[1]) - (after[4] - before[4])
+                                  > self.FOREIGN_READ_RATE * (after[0] - before[0]))
+            # Lower bound: our bytes still in flight at the window start may have landed inside it
+            foreign_writes = max(0, (last[2] - first[2]) - (last[5] - first[5]) - self.write_slack) / elapsed
+            busy = reading_samples >= self.BUSY_SAMPLES or foreign_writes > self.FOREIGN_WRITE_RATE
+
+            if not self.paused and busy:
+                self.paused = True
+                self.pause_count += 1
+                paused_at = last[0]
+                quiet_since = None
+                if self.on_change:
+                    self.on_change(True, utilisation)
+            elif self.paused:
+                # Resume only after our own writeback has drained and nobody else has touched the disk
+                if busy or utilisation > self.IDLE_UTILISATION:
+                    quiet_since = None
+                elif quiet_since is None:
+                    quiet_since = last[0]
+                elif last[0] - quiet_since >= self.IDLE_SECONDS:
+                    self.paused = False
+                    self.paused_seconds += last[0] - paused_at
+                    if self.on_change:
+                        self.on_change(False, utilisation)
+        if self.paused and paused_at:
+            self.paused_seconds += time.time() - paused_at
+        self.paused = False
+
+    def start(self):
+        """Start watching the disk; returns self, or None if its statistics are unavailable"""
+        try:
+            self._read_diskstats()
+            self._read_own_io()
+        except (OSError, ValueError):
+            return None
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop watching; the writer is never left paused"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+
+class BallastManager:
+    """Keeps a free-space reserve during a fill, treating finished wipe files as ballast.
+
+    A sampler thread watches statvfs and unlinks the oldest wipe files as soon as
+    other writers push free space below the reserve; the fill itself rotates the
+    oldest file out so later files move through the space that is left.
+    """
+
+    SAMPLE_INTERVAL = 0.05
+    ROTATION_PASSES = 2  # Bytes rotated after the reserve is reached, in multiples of the reserve
+
+    def __init__(self, mount_point, reserve_bytes, on_release=None):
+        self.mount_point = mount_point
+        self.reserve_bytes = reserve_bytes
+        self.on_release = on_release
+        self.files = []
+        self.lock = threading.Lock()
+        self.release_count = 0
+        self.released_bytes = 0
+        self.slowest_release = 0.0
+        self.running = False
+        self.thread = None
+
+    @staticmethod
+    def reserve_for(mount_point, reserve_gb, reserve_percent):
+        """Reserve in bytes: the larger of a fixed size and a share of the volume"""
+        st = os.statvfs(mount_point)
+        return max(int(reserve_gb * 1024**3), int(st.f_blocks * st.f_frsize * reserve_percent / 100))
+
+    def headroom(self):
+        """Bytes other programs could still lose before free space drops below the reserve"""
+        st = os.statvfs(self.mount_point)
+        return st.f_bavail * st.f_frsize - self.reserve_bytes
+
+    def add(self, path):
+        """Register a closed wipe file as ballast"""
+        with self.lock:
+            self.files.append(path)
+
+    def rotate(self):
+        """Unlink the oldest ballast file; returns the bytes it held (0 when none are left)"""
+        while True:
+            with self.lock:
+                if not self.files:
+                    return 0
+                path = self.files.pop(0)
+            try:
+                size = os.stat(path).st_blocks * 512
+                os.unlink(path)
+                return size
+            except OSError:
+                continue
+
+    def release(self):
+        """Drop ballast until free space is back above the reserve; returns bytes released"""
+        started = time.monotonic()
+        # Size the release from one sample: some filesystems free unlinked blocks lazily
+        shortfall = -self.headroom()
+        released = 0
+        while released < shortfall:
+            size = self.rotate()
+            if not size:
+                break
+            released += size
+        if released:
+            elapsed = time.monotonic() - started
+            self.release_count += 1
+            self.released_bytes += released
+            self.slowest_release = max(self.slowest_release, elapsed)
+            if self.on_release:
+                self.on_release(released, elapsed)
+        return released
+
+    def _run(self):
+        while self.running:
+            time.sleep(self.SAMPLE_INTERVAL)
+            try:
+                if self.headroom() < 0:
+                    self.release()
+            except OSError:
+                continue
+
+    def start(self):
+        """Start sampling free space; returns self"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling; ballast files stay for the caller to clean up"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+
+IO_PRIORITIES = ('normal', 'low', 'idle')
+IOPRIO_SET_SYSCALL = {'x86_64': 251, 'i386': 289, 'i686': 289, 'aarch64': 30, 'riscv64': 30,
+                      'armv7l': 314, 'ppc64le': 273, 's390x': 282}
+
+
+def set_io_priority(level):
+    """Put the calling thread in the normal, best-effort-lowest or idle I/O class; returns success"""
+    syscall_number = IOPRIO_SET_SYSCALL.get(platform.machine())
+    if syscall_number is None:
+        return False
+    ioprio_class, ioprio_data = {'normal': (2, 4), 'low': (2, 7), 'idle': (3, 0)}[level]
+    libc = ctypes.CDLL(None, use_errno=True)
+    # ioprio_set(IOPRIO_WHO_PROCESS, 0 = calling thread, class << 13 | data)
+    if libc.syscall(syscall_number, 1, 0, (ioprio_class << 13) | ioprio_data) != 0:
+        print(f"⚠️ ioprio_set failed: {os.strerror(ctypes.get_errno())}")
+        return False
+    return True
+
+
+def sync_file_range(fd, offset, length):
+    """Write a byte range of a file back to disk and wait for it; fdatasync where the call is unavailable"""
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.sync_file_range.argtypes = (ctypes.c_int, ctypes.c_int64, ctypes.c_int64, ctypes.c_uint)
+    flags = SYNC_FILE_RANGE_WAIT_BEFORE | SYNC_FILE_RANGE_WRITE | SYNC_FILE_RANGE_WAIT_AFTER
+    if libc.sync_file_range(fd, offset, length, flags) != 0:
+        error = ctypes.get_errno()
+        if error not in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            raise OSError(error, os.strerror(error))
+        os.fdatasync(fd)
+
+
+def write_through(f, data, offset, step):
+    """Write data at the position of file f (offset) in steps that each reach the disk before the next one"""
+    with memoryview(data) as view:
+        for start in range(0, len(view), step):
+            f.write(view[start:start + step])
+            f.flush()
+            sync_file_range(f.fileno(), offset + start, min(step, len(view) - start))
+
+
+class ByteRateLimiter:
+    """Token bucket limiting bytes per second across all writers; the rate can change at any time"""
+
+    def __init__(self, megabytes_per_second=0):
+        self.lock = threading.Lock()
+        self.rate = 0
+        self.limit = 0
+        self.ceiling = 0
+        self.tokens = 0.0
+        self.last_refill = time.time()
+        self.set_rate(megabytes_per_second)
+
+    def _apply(self):
+        rates = [rate for rate in (self.limit, self.ceiling) if rate]
+        self.rate = min(rates) if rates else 0
+        self.tokens = min(self.tokens, self.rate)
+        self.last_refill = time.time()
+
+    def set_rate(self, megabytes_per_second):
+        """New limit in MB/sec (0 = unlimited)"""
+        with self.lock:
+            self.limit = max(0.0, float(megabytes_per_second)) * 1024 * 1024
+            self._apply()
+
+    def set_ceiling(self, megabytes_per_second):
+        """Cap imposed by a governor on top of the user's limit, in MB/sec (0 = none)"""
+        with self.lock:
+            self.ceiling = max(0.0, float(megabytes_per_second)) * 1024 * 1024
+            self._apply()
+
+    def consume(self, byte_count, keep_going=None):
+        """Take tokens for a write, sleeping while the bucket is in debt"""
+        with self.lock:
+            if not self.rate:
+                return
+            now = time.time()
+            # Burst of at most one second's worth
+            self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= byte_count
+        while keep_going is None or keep_going():
+            with self.lock:
+                if not self.rate:
+                    return
+                now = time.time()
+                self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                debt = -self.tokens
+                wait = debt / self.rate if debt > 0 else 0
+            if wait <= 0:
+                return
+            # Short naps so a new rate or a cancel takes effect quickly
+            time.sleep(min(wait, 0.2))
+
+
+def write_control_file(path, rate_limit):
+    """Ask a running instance to change its rate limit"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(f"rate={rate_limit}\n")
+    os.replace(temp_path, path)
+
+
+class StreamingCommand:
+    """Run an external tool and stream its stdout line by line, with cancel and soft/hard timeouts"""
+
+    def __init__(self, args, line_callback=None, cancel_check=None, soft_timeout=None,
+                 hard_timeout=None, soft_timeout_callback=None, collect_output=True):
+        self.args = args
+        self.line_callback = line_callback
+        self.cancel_check = cancel_check
+        self.soft_timeout = soft_timeout
+        self.hard_timeout = hard_timeout
+        self.soft_timeout_callback = soft_timeout_callback
+        self.collect_output = collect_output
+        self.returncode = None
+        self.status = 'not_started'  # ok, failed, cancelled, timeout, not_found
+        self.lines = []
+        self.stderr = ''
+        self.elapsed = 0
+
+    @property
+    def stdout(self):
+        return ''.join(self.lines)
+
+    @property
+    def ok(self):
+        return self.status == 'ok'
+
+    def run(self):
+        """Run the command to completion, cancellation or hard timeout and return self"""
+        start_time = time.time()
+        try:
+            # New session so the whole process group can be killed on cancel
+            process = subprocess.Popen(
+                self.args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors='replace',
+                start_new_session=True
+            )
+        except FileNotFoundError:
+            self.status = 'not_found'
+            return self
+        except OSError as e:
+            self.status = 'failed'
+            self.stderr = str(e)
+            return self
+
+        lines_queue = queue.Queue(maxsize=10000)
+        stderr_lines = []
+        # Set once nobody reads the queue any more, so a reader blocked on a full queue can exit
+        stop_reading = threading.Event()
+
+        def put_line(line):
+            while not stop_reading.is_set():
+                try:
+                    lines_queue.put(line, timeout=0.2)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read_stdout():
+            for line in process.stdout:
+                if not put_line(line):
+                    return
+            put_line(None)
+
+        def read_stderr():
+            for line in process.stderr:
+                stderr_lines.append(line)
+                if len(stderr_lines) > 200:
+                    del stderr_lines[:100]
+
+        stdout_thread = threading.Thread(target=read_stdout, daemon=True)
+        stderr_thread = threading.Thread(target=read_stderr, daemon=True)
+        stdout_thread.start()
+        stderr_thread.start()
+
+        soft_timeout_reported = False
+        stop_reason = None
+        while True:
+            try:
+                line = lines_queue.get(timeout=0.2)
+            except queue.Empty:
+                line = ''
+            if line is None:
+                break
+            if line:
+                if self.collect_output:
+                    self.lines.append(line)
+                if self.line_callback:
+                    self.line_callback(line)
+
+            elapsed = time.time() - start_time
+            if self.cancel_check and self.cancel_check():
+                stop_reason = 'cancelled'
+                break
+            if self.hard_timeout is not None and elapsed > self.hard_timeout:
+                stop_reason = 'timeout'
+                break
+            if self.soft_timeout is not None and elapsed > self.soft_timeout and not soft_timeout_reported:
+                soft_timeout_reported = True
+                print(f"⏱️ {self.args[0]} still running after {self.soft_timeout:.0f}s...")
+                if self.soft_timeout_callback:
+                    self.soft_timeout_callback(elapsed)
+
+        stop_reading.set()
+        if stop_reason:
+            self._kill_process_group(process)
+            self.status = stop_reason
+        else:
+            process.wait()
+            self.status = 'ok' if process.returncode == 0 else 'failed'
+
+        stdout_thread.join(timeout=1.0)
+        stderr_thread.join(timeout=1.0)
+        self.returncode = process.returncode
+        self.stderr = ''.join(stderr_lines)
+        self.elapsed = time.time() - start_time
+        return self
+
+    @staticmethod
+    def _kill_process_group(process):
+        """Terminate the tool and everything it spawned, escalating to SIGKILL"""
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=2.0)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.wait()
+        except ProcessLookupError:
+            process.wait()
+
+
+def read_drive_temperature(disk_name, sysfs_root='/sys'):
+    """Drive temperature in °C from its hwmon sensor (NVMe, or SATA with drivetemp); None without one"""
+    device_dir = os.path.join(sysfs_root, 'block', disk_name, 'device')
+    # NVMe controllers carry hwmonN directly, SCSI devices under a hwmon/ class directory
+    for parent in (device_dir, os.path.join(device_dir, 'hwmon')):
+        try:
+            entries = sorted(os.listdir(parent))
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.startswith('hwmon') or entry == 'hwmon':
+                continue
+            try:
+                with open(os.path.join(parent, entry, 'temp1_input'), 'r') as f:
+                    return int(f.read().strip()) / 1000
+            except (OSError, ValueError):
+                continue
+    return None
+
+
+def smartctl_temperature(device_path):
+    """Current drive temperature in °C as reported by smartctl, or None"""
+    result = StreamingCommand(['smartctl', '-j', '-A', device_path], hard_timeout=10).run()
+    # smartctl's exit status is a bit mask of drive conditions; the JSON is valid regardless
+    try:
+        temperature = DriveHealth.from_smartctl_json(result.stdout).temperature
+    except ValueError:
+        return None
+    return float(temperature) if temperature is not None else None
+
+
+class ThermalGovernor:
+    """Holds a drive near a target temperature by scaling the wipe's rate ceiling and writer count.
+
+    Backs off multiplicatively while the drive is above target and recovers step by
+    step once it has cooled HYSTERESIS degrees below it. Every sample goes to the job log.
+    """
+
+    SYSFS_INTERVAL = 2.0
+    SMARTCTL_INTERVAL = 15.0  # smartctl is a process spawn and a drive command per sample
+    HYSTERESIS = 3
+    BACKOFF = 0.7
+    RECOVERY = 0.1
+    MIN_SCALE = 0.1
+    MIN_BASELINE = 1024 * 1024
+
+    def __init__(self, disk_name, target, rate_limiter, job_log=None, on_change=None):
+        self.disk_name = disk_name
+        self.target = target
+        self.rate_limiter = rate_limiter
+        self.job_log = job_log
+        self.on_change = on_change
+        self.scale = 1.0
+        self.baseline = self.MIN_BASELINE  # Fastest write rate seen at full speed, in bytes/sec
+        self.source = None
+        self.peak = None
+        self.throttled_seconds = 0.0
+        self.sample_count = 0
+        self.stop_event = threading.Event()
+        # Held while the ceiling changes, so none is set once stop() has lifted it
+        self.ceiling_lock = threading.Lock()
+        self.thread = None
+
+    def _read_temperature(self):
+        if self.source == 'hwmon':
+            return read_drive_temperature(self.disk_name)
+        return smartctl_temperature(f"/dev/{self.disk_name}")
+
+    def _disk_bytes_written(self):
+        try:
+            with open('/proc/diskstats', 'r') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 10 and fields[2] == self.disk_name:
+                        return int(fields[9]) * 512
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def allowed_workers(self, workers):
+        """How many of a writer pool may run at the current scale"""
+        return max(1, round(workers * self.scale))
+
+    def _run(self, interval):
+        started = last_time = time.time()
+        last_written = self._disk_bytes_written()
+        while not self.stop_event.wait(interval):
+            temperature = self._read_temperature()
+            now = time.time()
+            written = self._disk_bytes_written()
+            rate = (written - last_written) / (now - last_time) if None not in (written, last_written) else None
+            if self.scale < 1.0:
+                self.throttled_seconds += now - last_time
+            last_time, last_written = now, written
+            if temperature is None:
+                continue
+            self.sample_count += 1
+            self.peak = temperature if self.peak is None else max(self.peak, temperature)
+
+            previous = self.scale
+            if self.scale == 1.0 and rate:
+                self.baseline = max(self.baseline, rate)
+            if temperature > self.target:
+                self.scale = max(self.MIN_SCALE, self.scale * self.BACKOFF)
+            elif temperature <= self.target - self.HYSTERESIS and self.scale < 1.0:
+                self.scale = min(1.0, self.scale + self.RECOVERY)
+            if self.scale != previous:
+                ceiling = self.baseline * self.scale / (1024 * 1024) if self.scale < 1.0 else 0
+                # A smartctl sample can outlast stop(): its result must not reach the shared limiter
+                with self.ceiling_lock:
+                    if self.stop_event.is_set():
+                        break
+                    self.rate_limiter.set_ceiling(ceiling)
+                if self.on_change:
+                    self.on_change(temperature, self.scale, ceiling)
+
+            if self.job_log:
+                self.job_log.record('temperature', elapsed=round(now - started, 1), celsius=temperature,
+                                    scale=round(self.scale, 2),
+                                    write_mb_s=round(rate / (1024 * 1024), 1) if rate is not None else None)
+
+    def start(self):
+        """Start sampling; returns self, or None if the drive reports no temperature"""
+        if read_drive_temperature(self.disk_name) is not None:
+            self.source, interval = 'hwmon', self.SYSFS_INTERVAL
+        elif find_tool('smartctl') and smartctl_temperature(f"/dev/{self.disk_name}") is not None:
+            self.source, interval = 'smartctl', self.SMARTCTL_INTERVAL
+        else:
+            return None
+        if self.job_log:
+            self.job_log.record('thermal_governor', source=self.source, target=self.target)
+        self.thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling and lift the rate ceiling, even while a sample is still being read"""
+        with self.ceiling_lock:
+            self.stop_event.set()
+            self.rate_limiter.set_ceiling(0)
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+
+class NTFSVolumeReader:
+    """Read-only access to the NTFS $MFT and its $BITMAP straight from the raw device"""
+
+    FILE_RECORD_IN_USE = 0x0001
+    ATTR_ATTRIBUTE_LIST = 0x20
+    ATTR_FILE_NAME = 0x30
+    ATTR_DATA = 0x80
+    ATTR_BITMAP = 0xB0
+    ATTR_END = 0xFFFFFFFF
+    FIRST_USER_RECORD = 24  # Records 0-23 are reserved for NTFS system files
+    SCAN_CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, device_path, writable=False):
+        self.device_path = device_path
+        self.writable = writable
+        self.fd = None
+        self.bytes_per_sector = 512
+        self.cluster_size = 4096
+        self.record_size = 1024
+        self.volume_size = 0
+        self.mft_offset = 0
+        self.mft_runs = []
+        self.mft_data_size = 0
+        self.mft_bitmap = b''
+        self.total_records = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def open(self):
+        """Open the device and load the boot sector and $MFT layout"""
+        # O_EXCL on a block device fails with EBUSY while it is mounted
+        flags = os.O_RDWR | os.O_EXCL if self.writable else os.O_RDONLY
+        self.fd = os.open(self.device_path, flags)
+        try:
+            self._read_boot_sector()
+            self._load_mft_layout()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Close the device"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def _read_boot_sector(self):
+        """Parse the NTFS boot sector for geometry and the $MFT location"""
+        boot = os.pread(self.fd, 512, 0)
+        if len(boot) < 512 or boot[3:11] != b'NTFS    ':
+            raise ValueError(f"{self.device_path} does not have an NTFS boot sector")
+
+        self.bytes_per_sector = struct.unpack_from('<H', boot, 0x0B)[0]
+        sectors_per_cluster = boot[0x0D]
+        if sectors_per_cluster > 0x80:
+            # Clusters of 64K and larger are stored as a negative power of two
+            sectors_per_cluster = 1 << (256 - sectors_per_cluster)
+        self.cluster_size = self.bytes_per_sector * sectors_per_cluster
+
+        total_sectors, mft_lcn = struct.unpack_from('<QQ', boot, 0x28)
+        self.volume_size = total_sectors * self.bytes_per_sector
+        self.mft_offset = mft_lcn * self.cluster_size
+
+        clusters_per_record = struct.unpack_from('<b', boot, 0x40)[0]
+        if clusters_per_record < 0:
+            self.record_size = 1 << -clusters_per_record
+        else:
+            self.record_size = clusters_per_record * self.cluster_size
+
+    def _load_mft_layout(self):
+        """Read $MFT record 0 for the $DATA runlist and the record allocation $BITMAP"""
+        record = self._apply_fixups(os.pread(self.fd, self.record_size, self.mft_offset))
+        if record is None:
+            raise ValueError("$MFT record 0 is damaged")
+
+        bitmap_attr = None
+        for attr_type, offset, _length, non_resident in self._iter_attributes(record):
+            if attr_type == self.ATTR_DATA and non_resident and record[offset + 9] == 0:
+                runlist_offset = struct.unpack_from('<H', record, offset + 0x20)[0]
+                self.mft_data_size = struct.unpack_from('<Q', record, offset + 0x30)[0]
+                self.mft_runs = self._parse_runlist(record, offset + runlist_offset)
+            elif attr_type == self.ATTR_BITMAP and record[offset + 9] == 0:
+                bitmap_attr = (offset, non_resident)
+            elif attr_type == self.ATTR_ATTRIBUTE_LIST:
+                print("⚠️ $MFT has an attribute list - only the runs in record 0 will be read")
+
+        if not self.mft_runs:
+            raise ValueError("$MFT has no $DATA runlist")
+
+        # Never read past the runs we actually know about
+        mapped_size = sum(count for _, count in self.mft_runs) * self.cluster_size
+        self.total_records = min(self.mft_data_size, mapped_size) // self.record_size
+
+        if bitmap_attr is None:
+            raise ValueError("$MFT has no $BITMAP attribute")
+        offset, non_resident = bitmap_attr
+        if non_resident:
+            runlist_offset = struct.unpack_from('<H', record, offset + 0x20)[0]
+            bitmap_size = struct.unpack_from('<Q', record, offset + 0x30)[0]
+            runs = self._parse_runlist(record, offset + runlist_offset)
+            self.mft_bitmap = self._read_stream(runs, 0, bitmap_size)
+        else:
+            value_length = struct.unpack_from('<I', record, offset + 0x10)[0]
+            value_offset = struct.unpack_from('<H', record, offset + 0x14)[0]
+            self.mft_bitmap = bytes(record[offset + value_offset:offset + value_offset + value_length])
+
+    def _apply_fixups(self, record):
+        """Undo the update sequence fixups of a FILE record, or None if it is torn or not a record"""
+        if record[:4] != b'FILE':
+            return None
+        record = bytearray(record)
+        usa_offset, usa_count = struct.unpack_from('<HH', record, 4)
+        if usa_offset + usa_count * 2 > len(record):
+            return None
+        usn = record[usa_offset:usa_offset + 2]
+        for i in range(1, usa_count):
+            sector_end = i * 512 - 2
+            if sector_end + 2 > len(record):
+                break
+            if record[sector_end:sector_end + 2] != usn:
+                return None
+            record[sector_end:sector_end + 2] = record[usa_offset + i * 2:usa_offset + i * 2 + 2]
+        return record
+
+    def _iter_attributes(self, record):
+        """Yield (type, offset, length, non_resident) for each attribute in a fixed-up record"""
+        offset = struct.unpack_from('<H', record, 0x14)[0]
+        while offset + 16 <= len(record):
+            attr_type, length = struct.unpack_from('<II', record, offset)
+            if attr_type == self.ATTR_END or length < 16 or offset + length > len(record):
+                break
+            yield attr_type, offset, length, record[offset + 8]
+            offset += length
+
+    @staticmethod
+    def _parse_runlist(data, offset):
+        """Decode an NTFS mapping pairs array into (lcn, cluster_count) runs (lcn None = sparse)"""
+        runs = []
+        lcn = 0
+        while offset < len(data) and data[offset] != 0:
+            header = data[offset]
+            length_size = header & 0x0F
+            offset_size = header >> 4
+            offset += 1
+            run_length = int.from_bytes(data[offset:offset + length_size], 'little')
+            offset += length_size
+            if offset_size:
+                lcn += int.from_bytes(data[offset:offset + offset_size], 'little', signed=True)
+                runs.append((lcn, run_length))
+            else:
+                runs.append((None, run_length))
+            offset += offset_size
+        return runs
+
+    def _map_stream(self, runs, offset, length):
+        """Yield (stream_offset, device_offset, length) pieces of a stream byte range (device_offset None = sparse)"""
+        run_start = 0
+        end = offset + length
+        for lcn, count in runs:
+            run_end = run_start + count * self.cluster_size
+            if run_end > offset and run_start < end:
+                piece_start = max(offset, run_start)
+                piece_end = min(end, run_end)
+                device_offset = None if lcn is None else lcn * self.cluster_size + (piece_start - run_start)
+                yield piece_start, device_offset, piece_end - piece_start
+            run_start = run_end
+            if run_start >= end:
+                break
+
+    def _read_stream(self, runs, offset, length):
+        """Read a byte range of a non-resident stream"""
+        data = bytearray()
+        for _, device_offset, piece_length in self._map_stream(runs, offset, length):
+            if device_offset is None:
+                data += bytes(piece_length)
+            else:
+                data += os.pread(self.fd, piece_length, device_offset)
+        return bytes(data)
+
+    def read_record(self, index):
+        """Read and fix up one $MFT record, or None if it is not a valid FILE record"""
+        data = self._read_stream(self.mft_runs, index * self.record_size, self.record_size)
+        return self._apply_fixups(data)
+
+    def _non_resident_runs(self, record, offset):
+        """Runlist of a non-resident attribute at the given record offset"""
+        runlist_offset = struct.unpack_from('<H', record, offset + 0x20)[0]
+        return self._parse_runlist(record, offset + runlist_offset)
+
+    def read_volume_bitmap(self):
+        """Read the volume cluster bitmap ($Bitmap, record 6)"""
+        record = self.read_record(6)
+        if record is None:
+            raise ValueError("$Bitmap record is damaged")
+        for attr_type, offset, _length, non_resident in self._iter_attributes(record):
+            if attr_type == self.ATTR_DATA and non_resident and record[offset + 9] == 0:
+                size = struct.unpack_from('<Q', record, offset + 0x30)[0]
+                bitmap = self._read_stream(self._non_resident_runs(record, offset), 0, size)
+                return VolumeBitmap(bitmap, self.cluster_size, self.volume_size // self.cluster_size)
+        raise ValueError("$Bitmap has no non-resident $DATA attribute")
+
+    def iter_deleted_data_runs(self, cancel_check=None):
+        """Yield the former (lcn, cluster_count) data runs of deleted-but-not-reused records"""
+        records_per_chunk = max(1, self.SCAN_CHUNK_SIZE // self.record_size)
+        for first in range(0, self.total_records, records_per_chunk):
+            if cancel_check and cancel_check():
+                return
+            count = min(records_per_chunk, self.total_records - first)
+            data = self._read_stream(self.mft_runs, first * self.record_size, count * self.record_size)
+            for i in range(max(0, self.FIRST_USER_RECORD - first), count):
+                if self.record_in_use(first + i):
+                    continue
+                record = self._apply_fixups(data[i * self.record_size:(i + 1) * self.record_size])
+                if record is None or struct.unpack_from('<H', record, 0x16)[0] & self.FILE_RECORD_IN_USE:
+                    continue
+                for attr_type, offset, _length, non_resident in self._iter_attributes(record):
+                    if attr_type == self.ATTR_DATA and non_resident:
+                        for lcn, cluster_count in self._non_resident_runs(record, offset):
+                            if lcn is not None and cluster_count > 0:
+                                yield lcn, cluster_count
+
+    def count_in_use_records(self):
+        """Number of records marked in use in the $MFT $BITMAP (cheap change fingerprint)"""
+        bitmap = self.mft_bitmap[:(self.total_records + 7) // 8]
+        return bin(int.from_bytes(bitmap, 'little')).count('1')
+
+    def record_in_use(self, index):
+        """Check the $MFT $BITMAP bit of a record"""
+        byte_index = index >> 3
+        if byte_index >= len(self.mft_bitmap):
+            return False
+        return bool(self.mft_bitmap[byte_index] & (1 << (index & 7)))
+
+    def _is_stale_record(self, record):
+        """A free record that still carries a FILE header and a $FILE_NAME of a deleted file"""
+        record = self._apply_fixups(record)
+        if record is None:
+            return False
+        flags = struct.unpack_from('<H', record, 0x16)[0]
+        if flags & self.FILE_RECORD_IN_USE:
+            return False
+        for attr_type, _offset, _length, _non_resident in self._iter_attributes(record):
+            if attr_type == self.ATTR_FILE_NAME:
+                return True
+        return False
+
+    def _reapply_fixups(self, record):
+        """Move the last two bytes of every sector into the update sequence array and stamp the USN"""
+        usa_offset, usa_count = struct.unpack_from('<HH', record, 4)
+        usn = record[usa_offset:usa_offset + 2]
+        for i in range(1, usa_count):
+            sector_end = i * 512 - 2
+            if sector_end + 2 > len(record):
+                break
+            record[usa_offset + i * 2:usa_offset + i * 2 + 2] = record[sector_end:sector_end + 2]
+            record[sector_end:sector_end + 2] = usn
+        return record
+
+    def _scrub_record(self, raw_record):
+        """Strip the stale attributes of a free record, keeping a valid FILE header and fixups"""
+        record = self._apply_fixups(raw_record)
+        if record is None:
+            return None
+        attrs_offset = struct.unpack_from('<H', record, 0x14)[0]
+        if attrs_offset + 8 > len(record):
+            return None
+        if struct.unpack_from('<I', record, attrs_offset)[0] == self.ATTR_END and not any(record[attrs_offset + 8:]):
+            return None  # Already clean
+
+        record[attrs_offset:] = bytes(len(record) - attrs_offset)
+        struct.pack_into('<I', record, attrs_offset, self.ATTR_END)
+        struct.pack_into('<H', record, 0x16, 0)  # Not in use
+        struct.pack_into('<I', record, 0x18, attrs_offset + 8)  # Bytes in use
+        return self._reapply_fixups(record)
+
+    def scrub_free_records(self, cancel_check=None, progress_callback=None):
+        """Overwrite the stale attributes of every record not in use, one large write per dirty span"""
+        if not self.writable:
+            raise ValueError("Reader was not opened for writing")
+
+        stats = {
+            'total_records': self.total_records,
+            'scrubbed_records': 0,
+            'bytes_written': 0,
+            'cancelled': False
+        }
+        records_per_chunk = max(1, self.SCAN_CHUNK_SIZE // self.record_size)
+        last_progress_time = 0
+
+        for first in range(0, self.total_records, records_per_chunk):
+            if cancel_check and cancel_check():
+                stats['cancelled'] = True
+                break
+
+            count = min(records_per_chunk, self.total_records - first)
+            chunk_offset = first * self.record_size
+            data = bytearray(self._read_stream(self.mft_runs, chunk_offset, count * self.record_size))
+            dirty_first = dirty_last = None
+
+            for i in range(max(0, self.FIRST_USER_RECORD - first), count):
+                if self.record_in_use(first + i):
+                    continue
+                start = i * self.record_size
+                scrubbed = self._scrub_record(data[start:start + self.record_size])
+                if scrubbed is None:
+                    continue
+                data[start:start + self.record_size] = scrubbed
+                stats['scrubbed_records'] += 1
+                if dirty_first is None:
+                    dirty_first = i
+                dirty_last = i
+
+            if dirty_first is not None:
+                # One write per contiguous piece of the dirty span
+                span_start = dirty_first * self.record_size
+                span_end = (dirty_last + 1) * self.record_size
+                for stream_offset, device_offset, length in self._map_stream(
+                        self.mft_runs, chunk_offset + span_start, span_end - span_start):
+                    if device_offset is None:
+                        continue
+                    piece_start = stream_offset - chunk_offset
+                    os.pwrite(self.fd, data[piece_start:piece_start + length], device_offset)
+                    stats['bytes_written'] += length
+
+            now = time.time()
+            if progress_callback and now - last_progress_time >= 0.5:
+                last_progress_time = now
+                progress_callback(first + count, self.total_records, stats['scrubbed_records'])
+
+        os.fsync(self.fd)
+        return stats
+
+    def scan_mft(self, cancel_check=None, progress_callback=None):
+        """Stream the whole $MFT and count in-use, free and deleted-but-not-reused records"""
+        counts = {
+            'total_records': self.total_records,
+            'in_use_records': 0,
+            'free_records': 0,
+            'deleted_records': 0,
+            'cancelled': False
+        }
+        records_per_chunk = max(1, self.SCAN_CHUNK_SIZE // self.record_size)
+        last_progress_time = 0
+
+        for first in range(0, self.total_records, records_per_chunk):
+            if cancel_check and cancel_check():
+                counts['cancelled'] = True
+                break
+
+            count = min(records_per_chunk, self.total_records - first)
+            data = self._read_stream(self.mft_runs, first * self.record_size, count * self.record_size)
+
+            for i in range(count):
+                index = first + i
+                if self.record_in_use(index):
+                    counts['in_use_records'] += 1
+                    continue
+                counts['free_records'] += 1
+                if index < self.FIRST_USER_RECORD:
+                    continue
+                record = data[i * self.record_size:(i + 1) * self.record_size]
+                if len(record) == self.record_size and self._is_stale_record(record):
+                    counts['deleted_records'] += 1
+
+            now = time.time()
+            if progress_callback and now - last_progress_time >= 0.5:
+                last_progress_time = now
+                progress_callback(first + count, self.total_records, counts['deleted_records'])
+
+        if progress_callback and not counts['cancelled']:
+            progress_callback(self.total_records, self.total_records, counts['deleted_records'])
+        return counts
+
+
+class ExfatVolumeReader:
+    """Read-only access to the exFAT boot region, FAT, allocation bitmap and directory tree"""
+
+    ENTRY_SIZE = 32
+    ENTRY_END_OF_DIRECTORY = 0x00
+    ENTRY_ALLOCATION_BITMAP = 0x81
+    ENTRY_FILE = 0x85
+    ENTRY_STREAM_EXTENSION = 0xC0
+    ENTRY_IN_USE = 0x80
+    DELETED_ENTRY_TYPES = (0x05, 0x40, 0x41)  # File, Stream Extension, File Name with InUse cleared
+    ATTR_DIRECTORY = 0x10
+    FLAG_NO_FAT_CHAIN = 0x02
+    FAT_PAGE_SIZE = 64 * 1024
+    MAX_READ_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, device_path, writable=False):
+        self.device_path = device_path
+        self.writable = writable
+        self.fd = None
+        self.bytes_per_sector = 512
+        self.cluster_size = 4096
+        self.volume_size = 0
+        self.fat_offset = 0
+        self.heap_offset = 0
+        self.cluster_count = 0
+        self.root_cluster = 0
+        self.volume_serial = 0
+        self.bitmap_cluster = 0
+        self.bitmap_length = 0
+        self._fat_pages = {}
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def open(self):
+        """Open the device and parse the boot sector"""
+        # O_EXCL on a block device fails with EBUSY while it is mounted
+        flags = os.O_RDWR | os.O_EXCL if self.writable else os.O_RDONLY
+        self.fd = os.open(self.device_path, flags)
+        try:
+            self._read_boot_sector()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Close the device"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        self._fat_pages = {}
+
+    def _read_boot_sector(self):
+        """Parse the exFAT main boot sector"""
+        boot = os.pread(self.fd, 512, 0)
+        if len(boot) < 512 or boot[3:11] != b'EXFAT   ':
+            raise ValueError(f"{self.device_path} does not have an exFAT boot sector")
+
+        volume_length = struct.unpack_from('<Q', boot, 72)[0]
+        fat_offset, _fat_length, heap_offset, cluster_count, root_cluster, serial = \
+            struct.unpack_from('<IIIIII', boot, 80)
+        self.bytes_per_sector = 1 << boot[108]
+        self.cluster_size = self.bytes_per_sector << boot[109]
+        self.volume_size = volume_length * self.bytes_per_sector
+        self.fat_offset = fat_offset * self.bytes_per_sector
+        self.heap_offset = heap_offset * self.bytes_per_sector
+        self.cluster_count = cluster_count
+        self.root_cluster = root_cluster
+        self.volume_serial = serial
+
+    def cluster_offset(self, cluster):
+        """Device byte offset of a cluster in the cluster heap"""
+        return self.heap_offset + (cluster - 2) * self.cluster_size
+
+    def _valid_cluster(self, cluster):
+        return 2 <= cluster < self.cluster_count + 2
+
+    def fat_entry(self, cluster):
+        """Read one FAT entry, caching FAT pages as they are touched"""
+        byte_offset = cluster * 4
+        page_index = byte_offset // self.FAT_PAGE_SIZE
+        page = self._fat_pages.get(page_index)
+        if page is None:
+            page = os.pread(self.fd, self.FAT_PAGE_SIZE, self.fat_offset + page_index * self.FAT_PAGE_SIZE)
+            self._fat_pages[page_index] = page
+        offset = byte_offset % self.FAT_PAGE_SIZE
+        if offset + 4 > len(page):
+            return 0xFFFFFFFF
+        return struct.unpack_from('<I', page, offset)[0]
+
+    def cluster_runs(self, first_cluster, data_length=None, no_fat_chain=False):
+        """Return the (first_cluster, count) runs of a cluster chain, merging contiguous clusters"""
+        if not self._valid_cluster(first_cluster):
+            return []
+
+        if no_fat_chain:
+            count = max(1, -(-data_length // self.cluster_size)) if data_length else 1
+            count = min(count, self.cluster_count + 2 - first_cluster)
+            return [(first_cluster, count)]
+
+        runs = []
+        visited = 0
+        cluster = first_cluster
+        max_clusters = -(-data_length // self.cluster_size) if data_length else self.cluster_count
+        while self._valid_cluster(cluster) and visited < max_clusters:
+            if runs and runs[-1][0] + runs[-1][1] == cluster:
+                runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+            else:
+                runs.append((cluster, 1))
+            visited += 1
+            cluster = self.fat_entry(cluster)
+        return runs
+
+    def iter_run_buffers(self, runs):
+        """Yield (device_offset, data) for a list of cluster runs in reads of at most MAX_READ_SIZE"""
+        clusters_per_read = max(1, self.MAX_READ_SIZE // self.cluster_size)
+        for first_cluster, count in runs:
+            done = 0
+            while done < count:
+                batch = min(clusters_per_read, count - done)
+                device_offset = self.cluster_offset(first_cluster + done)
+                yield device_offset, os.pread(self.fd, batch * self.cluster_size, device_offset)
+                done += batch
+
+    def read_allocation_bitmap(self):
+        """Read the cluster allocation bitmap (bit set = cluster in use, bit 0 = cluster 2)"""
+        if not self.bitmap_cluster:
+            self._find_allocation_bitmap()
+        data = bytearray()
+        for _, chunk in self.iter_run_buffers(self.cluster_runs(self.bitmap_cluster, self.bitmap_length)):
+            data += chunk
+        return bytes(data[:self.bitmap_length])
+
+    def read_volume_bitmap(self):
+        """Allocation bitmap as a VolumeBitmap (unit 0 = cluster 2 at the start of the cluster heap)"""
+        return VolumeBitmap(self.read_allocation_bitmap(), self.cluster_size, self.cluster_count, self.heap_offset)
+
+    def iter_deleted_data_runs(self, cancel_check=None):
+        """Yield the former (first_cluster, cluster_count) runs named by deleted stream extensions"""
+        for _, data, _ended in self.walk_directories(cancel_check):
+            for offset in range(0, len(data), self.ENTRY_SIZE):
+                entry_type = data[offset]
+                if entry_type == self.ENTRY_END_OF_DIRECTORY:
+                    break
+                if entry_type != 0x40:  # Deleted stream extension
+                    continue
+                flags = data[offset + 1]
+                first_cluster = struct.unpack_from('<I', data, offset + 20)[0]
+                data_length = struct.unpack_from('<Q', data, offset + 24)[0]
+                if not data_length or not self._valid_cluster(first_cluster):
+                    continue
+                # FAT chains of deleted files may be stale; callers only touch clusters still free
+                for run in self.cluster_runs(first_cluster, data_length, bool(flags & self.FLAG_NO_FAT_CHAIN)):
+                    yield run
+
+    def _find_allocation_bitmap(self):
+        """Locate the allocation bitmap entry in the root directory"""
+        for _, data in self.iter_run_buffers(self.cluster_runs(self.root_cluster)):
+            for offset in range(0, len(data), self.ENTRY_SIZE):
+                entry_type = data[offset]
+                if entry_type == self.ENTRY_END_OF_DIRECTORY:
+                    break
+                if entry_type == self.ENTRY_ALLOCATION_BITMAP and not data[offset + 1] & 0x01:
+                    self.bitmap_cluster, self.bitmap_length = struct.unpack_from('<IQ', data, offset + 20)
+                    return
+        raise ValueError("exFAT allocation bitmap entry not found")
+
+    def walk_directories(self, cancel_check=None):
+        """Yield (device_offset, data, directory_ended) buffers of every live directory, breadth first"""
+        pending = [(self.root_cluster, None, False)]
+        visited = set()
+        while pending:
+            first_cluster, data_length, no_fat_chain = pending.pop(0)
+            if first_cluster in visited:
+                continue
+            visited.add(first_cluster)
+
+            pending_file_is_dir = False
+            ended = False
+            for device_offset, data in self.iter_run_buffers(
+                    self.cluster_runs(first_cluster, data_length, no_fat_chain)):
+                if cancel_check and cancel_check():
+                    return
+                for offset in range(0, len(data), self.ENTRY_SIZE):
+                    entry_type = data[offset]
+                    if entry_type == self.ENTRY_END_OF_DIRECTORY:
+                        ended = True
+                        break
+                    if entry_type == self.ENTRY_FILE:
+                        attributes = struct.unpack_from('<H', data, offset + 4)[0]
+                        pending_file_is_dir = bool(attributes & self.ATTR_DIRECTORY)
+                    elif entry_type == self.ENTRY_STREAM_EXTENSION:
+                        if pending_file_is_dir:
+                            flags = data[offset + 1]
+                            child_cluster = struct.unpack_from('<I', data, offset + 20)[0]
+                            child_length = struct.unpack_from('<Q', data, offset + 24)[0]
+                            pending.append((child_cluster, child_length, bool(flags & self.FLAG_NO_FAT_CHAIN)))
+                        pending_file_is_dir = False
+                yield device_offset, data, ended
+                if ended:
+                    break
+
+    def scan_directories(self, cancel_check=None, progress_callback=None):
+        """Count live and deleted directory entries across the whole directory tree"""
+        counts = {
+            'total_entries': 0,
+            'deleted_entries': 0,
+            'deleted_files': 0,
+            'directories': 0,
+            'bytes_read': 0,
+            'cancelled': False
+        }
+        last_progress_time = 0
+
+        for _, data, ended in self.walk_directories(cancel_check):
+            counts['bytes_read'] += len(data)
+            for offset in range(0, len(data), self.ENTRY_SIZE):
+                entry_type = data[offset]
+                if entry_type == self.ENTRY_END_OF_DIRECTORY:
+                    break
+                counts['total_entries'] += 1
+                if entry_type in self.DELETED_ENTRY_TYPES:
+                    counts['deleted_entries'] += 1
+                    if entry_type == 0x05:
+                        counts['deleted_files'] += 1
+            if ended:
+                counts['directories'] += 1
+
+            now = time.time()
+            if progress_callback and now - last_progress_time >= 0.5:
+                last_progress_time = now
+                progress_callback(counts['directories'], counts['bytes_read'], counts['deleted_entries'])
+
+        if cancel_check and cancel_check():
+            counts['cancelled'] = True
+        return counts
+
+    def scrub_deleted_entries(self, cancel_check=None, progress_callback=None):
+        """Zero the payload of every deleted entry in place, one write per dirty directory read"""
+        if not self.writable:
+            raise ValueError("Reader was not opened for writing")
+
+        stats = {
+            'scrubbed_entries': 0,
+            'directories': 0,
+            'bytes_written': 0,
+            'cancelled': False
+        }
+        last_progress_time = 0
+
+        for device_offset, data, ended in self.walk_directories(cancel_check):
+            buffer = bytearray(data)
+            dirty_first = dirty_last = None
+            for offset in range(0, len(buffer), self.ENTRY_SIZE):
+                entry_type = buffer[offset]
+                if entry_type == self.ENTRY_END_OF_DIRECTORY:
+                    break
+                if entry_type in self.DELETED_ENTRY_TYPES and any(buffer[offset + 1:offset + self.ENTRY_SIZE]):
+                    # Keep the (deleted) entry type so the directory stays well formed
+                    buffer[offset + 1:offset + self.ENTRY_SIZE] = bytes(self.ENTRY_SIZE - 1)
+                    stats['scrubbed_entries'] += 1
+                    if dirty_first is None:
+                        dirty_first = offset
+                    dirty_last = offset
+
+            if dirty_first is not None:
+                # Write whole sectors covering the changed entries
+                span_start = dirty_first // self.bytes_per_sector * self.bytes_per_sector
+                span_end = -(-(dirty_last + self.ENTRY_SIZE) // self.bytes_per_sector) * self.bytes_per_sector
+                os.pwrite(self.fd, bytes(buffer[span_start:span_end]), device_offset + span_start)
+                stats['bytes_written'] += span_end - span_start
+
+            if ended:
+                stats['directories'] += 1
+
+            now = time.time()
+            if progress_callback and now - last_progress_time >= 0.5:
+                last_progress_time = now
+                progress_callback(stats['directories'], stats['scrubbed_entries'])
+
+        if cancel_check and cancel_check():
+            stats['cancelled'] = True
+        os.fsync(self.fd)
+        return stats
+
+
+class Ext4VolumeReader:
+    """Reads ext2/3/4 block allocation bitmaps from an unmounted (or synced) device"""
+
+    SUPERBLOCK_OFFSET = 1024
+    EXT4_MAGIC = 0xEF53
+    INCOMPAT_META_BG = 0x0010
+    INCOMPAT_64BIT = 0x0080
+    RO_COMPAT_BIGALLOC = 0x0200
+    BG_BLOCK_UNINIT = 0x0002
+
+    def __init__(self, device_path, writable=False):
+        self.device_path = device_path
+        self.writable = writable
+        self.fd = None
+        self.block_size = 4096
+        self.cluster_size = 4096
+        self.blocks_count = 0
+        self.first_data_block = 0
+        self.clusters_per_group = 0
+        self.group_count = 0
+        self.desc_size = 32
+        self.volume_size = 0
+        self.is_64bit = False
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def open(self):
+        """Open the device and parse the superblock"""
+        flags = os.O_RDWR | os.O_EXCL if self.writable else os.O_RDONLY
+        self.fd = os.open(self.device_path, flags)
+        try:
+            self._read_superblock()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Close the device"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def _read_superblock(self):
+        """Parse the fields needed to locate the block bitmaps"""
+        sb = os.pread(self.fd, 1024, self.SUPERBLOCK_OFFSET)
+        if len(sb) < 1024 or struct.unpack_from('<H', sb, 0x38)[0] != self.EXT4_MAGIC:
+            raise ValueError(f"{self.device_path} does not have an ext2/3/4 superblock")
+
+        incompat = struct.unpack_from('<I', sb, 0x60)[0]
+        ro_compat = struct.unpack_from('<I', sb, 0x64)[0]
+        if incompat & self.INCOMPAT_META_BG:
+            raise ValueError("ext4 meta_bg layout is not supported")
+
+        self.is_64bit = bool(incompat & self.INCOMPAT_64BIT)
+        self.block_size = 1024 << struct.unpack_from('<I', sb, 0x18)[0]
+        self.first_data_block = struct.unpack_from('<I', sb, 0x14)[0]
+        self.blocks_count = struct.unpack_from('<I', sb, 0x04)[0]
+        if self.is_64bit:
+            self.blocks_count |= struct.unpack_from('<I', sb, 0x150)[0] << 32
+            self.desc_size = struct.unpack_from('<H', sb, 0xFE)[0] or 64
+
+        # With bigalloc the bitmaps track clusters of several blocks
+        if ro_compat & self.RO_COMPAT_BIGALLOC:
+            self.cluster_size = 1024 << struct.unpack_from('<I', sb, 0x1C)[0]
+            self.clusters_per_group = struct.unpack_from('<I', sb, 0x24)[0]
+        else:
+            self.cluster_size = self.block_size
+            self.clusters_per_group = struct.unpack_from('<I', sb, 0x20)[0]
+
+        blocks_per_cluster = self.cluster_size // self.block_size
+        cluster_count = -(-(self.blocks_count - self.first_data_block) // blocks_per_cluster)
+        self.group_count = -(-cluster_count // self.clusters_per_group)
+        self.volume_size = self.blocks_count * self.block_size
+
+    def read_volume_bitmap(self):
+        """Concatenate every group's block bitmap; BLOCK_UNINIT groups count as allocated"""
+        group_bytes = self.clusters_per_group // 8
+        table_offset = (self.first_data_block + 1) * self.block_size
+        descriptors = os.pread(self.fd, self.group_count * self.desc_size, table_offset)
+        if len(descriptors) < self.group_count * self.desc_size:
+            raise ValueError("ext4 group descriptor table is truncated")
+
+        bitmap = bytearray()
+        for group in range(self.group_count):
+            desc = descriptors[group * self.desc_size:(group + 1) * self.desc_size]
+            flags = struct.unpack_from('<H', desc, 0x12)[0]
+            if flags & self.BG_BLOCK_UNINIT:
+                # Never initialised on disk - do not trust it to be free
+                bitmap += b'\xff' * group_bytes
+                continue
+            bitmap_block = struct.unpack_from('<I', desc, 0x00)[0]
+            if self.is_64bit and self.desc_size >= 64:
+                bitmap_block |= struct.unpack_from('<I', desc, 0x20)[0] << 32
+            bitmap += os.pread(self.fd, group_bytes, bitmap_block * self.block_size)
+
+        unit_count = (self.blocks_count - self.first_data_block) * self.block_size // self.cluster_size
+        return VolumeBitmap(bytes(bitmap), self.cluster_size, unit_count, self.first_data_block * self.block_size)
+
+
+class UnclaimedSpaceScanner:
+    """Maps areas of a partitioned disk that no partition or filesystem claims (gaps and slack)"""
+
+    RESERVED_HEAD = 1024 * 1024  # Partition table, boot loader and alignment padding
+    RESERVED_TAIL = 1024 * 1024  # Covers the backup GPT at any sector size
+    ALIGNMENT = 4096
+    MIN_INTERVAL = 64 * 1024
+    # Containers whose metadata may live anywhere in the partition, including its end
+    OPAQUE_FSTYPES = ('linux_raid_member', 'crypto_LUKS', 'LVM2_member', 'zfs_member',
+                      'bcache', 'ddf_raid_member', 'isw_raid_member', 'swap')
+
+    def __init__(self, disk_name, sysfs_root='/sys/class/block', dev_root='/dev'):
+        self.disk_name = disk_name
+        self.sysfs_root = sysfs_root
+        self.dev_root = dev_root
+
+    def _read_sysfs(self, *parts):
+        with open(os.path.join(self.sysfs_root, *parts), 'r') as f:
+            return int(f.read().strip())
+
+    def _list_partitions(self):
+        """(name, number, start_byte, size_bytes) for every partition of the disk"""
+        partitions = []
+        disk_dir = os.path.join(self.sysfs_root, self.disk_name)
+        for name in sorted(os.listdir(disk_dir)):
+            if not os.path.exists(os.path.join(disk_dir, name, 'partition')):
+                continue
+            partitions.append((
+                name,
+                self._read_sysfs(self.disk_name, name, 'partition'),
+                self._read_sysfs(self.disk_name, name, 'start') * 512,
+                self._read_sysfs(self.disk_name, name, 'size') * 512
+            ))
+        return partitions
+
+    def _filesystem_claim(self, name, size, fstype):
+        """Bytes at the start of a partition its filesystem uses, plus extra (offset, length) claims"""
+        fstype = (fstype or '').lower()
+        holders = os.path.join(self.sysfs_root, name, 'holders')
+        if fstype in [t.lower() for t in self.OPAQUE_FSTYPES] or (os.path.isdir(holders) and os.listdir(holders)):
+            return size, []
+
+        reader_class = {'ntfs': NTFSVolumeReader, 'exfat': ExfatVolumeReader, 'ext2': Ext4VolumeReader,
+                        'ext3': Ext4VolumeReader, 'ext4': Ext4VolumeReader}.get(fstype)
+        if not reader_class:
+            return size, []
+        try:
+            with reader_class(os.path.join(self.dev_root, name)) as reader:
+                fs_size = reader.volume_size
+                sector = getattr(reader, 'bytes_per_sector', 512)
+        except (OSError, ValueError, struct.error):
+            return size, []
+        if not fs_size:
+            return size, []
+
+        if reader_class is NTFSVolumeReader:
+            # The backup boot sector follows the volume, or sits in the partition's last sector
+            return min(size, fs_size + sector), [(size - sector, sector)]
+        return min(size, fs_size), []
+
+    def scan(self, pttype, fstypes):
+        """Return {'intervals': [(offset, length, kind)], 'skipped': reason or None}"""
+        result = {'intervals': [], 'skipped': None}
+        if pttype not in ('gpt', 'dos'):
+            result['skipped'] = "no partition table"
+            return result
+
+        disk_size = self._read_sysfs(self.disk_name, 'size') * 512
+        partitions = self._list_partitions()
+        if pttype == 'dos' and any(number >= 5 for _, number, _, _ in partitions):
+            # Extended boot records live in the space between logical partitions
+            result['skipped'] = "MBR disk with logical partitions"
+            return result
+
+        claimed = [(0, self.RESERVED_HEAD), (disk_size - self.RESERVED_TAIL, self.RESERVED_TAIL)]
+        filesystem_ends = set()
+        for name, _number, start, size in partitions:
+            used, extra = self._filesystem_claim(name, size, fstypes.get(name))
+            claimed.append((start, used))
+            claimed.extend((start + offset, length) for offset, length in extra)
+            if used < size:
+                filesystem_ends.add(start + used)
+
+        position = 0
+        for start, length in merge_runs(claimed):
+            if start > position:
+                self._add_interval(result['intervals'], position, start, filesystem_ends)
+            position = max(position, start + length)
+        if position < disk_size:
+            self._add_interval(result['intervals'], position, disk_size, filesystem_ends)
+        return result
+
+    def _add_interval(self, intervals, start, end, filesystem_ends):
+        # Round inwards so the interval never touches a claimed byte and suits O_DIRECT
+        kind = 'slack' if start in filesystem_ends else 'gap'
+        start = -(-start // self.ALIGNMENT) * self.ALIGNMENT
+        end = end // self.ALIGNMENT * self.ALIGNMENT
+        if end - start >= self.MIN_INTERVAL:
+            intervals.append((start, end - start, kind))
+
+
+class FreeSpaceSnapshotStore:
+    """Free-space bitmaps saved after successful wipes, keyed by volume identity"""
+
+    FULL_PASS_INTERVAL = 7  # Force a full fill after this many incremental runs
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(get_cache_dir(), 'snapshots')
+
+    def _path(self, volume_key):
+        return os.path.join(self.directory, re.sub(r'[^A-Za-z0-9._-]', '_', volume_key) + '.snap')
+
+    def load(self, volume_key):
+        """Return (VolumeBitmap, info) for a volume, or None"""
+        try:
+            with open(self._path(volume_key), 'rb') as f:
+                header = json.loads(f.readline())
+                bitmap = zlib.decompress(f.read())
+        except (OSError, ValueError, zlib.error):
+            return None
+        snapshot = VolumeBitmap(bitmap, header['unit_size'], header['unit_count'], header['base_offset'])
+        return snapshot, header
+
+    def save(self, volume_key, bitmap, incremental_runs=0):
+        """Store the bitmap of a freshly wiped volume"""
+        header = {
+            'unit_size': bitmap.unit_size,
+            'unit_count': bitmap.unit_count,
+            'base_offset': bitmap.base_offset,
+            'incremental_runs': incremental_runs,
+            'taken_at': time.time()
+        }
+        path = self._path(volume_key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(json.dumps(header).encode() + b'\n')
+                f.write(zlib.compress(bitmap.bitmap, 6))
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"⚠️ Cannot write free-space snapshot {path}: {e}")
+
+    def discard(self, volume_key):
+        """Drop a volume's snapshot"""
+        try:
+            os.remove(self._path(volume_key))
+        except OSError:
+            pass
+
+
+class JobLog:
+    """JSON-lines record of one wipe job (settings, samples, outcome) in the cache directory"""
+
+    MAX_LOGS = 50
+
+    def __init__(self, kind, drive_name, directory=None):
+        self.directory = directory or os.path.join(get_cache_dir(), 'jobs')
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', f"{time.strftime('%Y%m%d-%H%M%S')}-{kind}-{drive_name}")
+        self.path = os.path.join(self.directory, f"{name}.jsonl")
+        self.lock = threading.Lock()
+        self.failed = False
+        self._prune()
+
+    def _prune(self):
+        """Keep only the newest logs"""
+        try:
+            logs = sorted(entry for entry in os.listdir(self.directory) if entry.endswith('.jsonl'))
+        except OSError:
+            return
+        for entry in logs[:max(0, len(logs) - self.MAX_LOGS + 1)]:
+            try:
+                os.remove(os.path.join(self.directory, entry))
+            except OSError:
+                pass
+
+    def record(self, event, **fields):
+        """Append one event with a wall-clock timestamp"""
+        if self.failed:
+            return
+        line = json.dumps(dict(time=round(time.time(), 1), event=event, **fields))
+        with self.lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self.path, 'a') as f:
+                    f.write(line + '\n')
+            except OSError as e:
+                self.failed = True
+                print(f"⚠️ Cannot write job log {self.path}: {e}")
+
+
 class FreeSpaceWipeWindow(Gtk.Window):
+    # Bytes a metadata-pressure file counts against the rate limit besides its content (record/cluster)
+    METADATA_FILE_COST = 4096
+    
+    # (mode id, label) for the Mode dropdown
+    WIPE_MODES = [
+        ('fill', "Free space fill"),
+        ('offline_metadata', "Offline metadata scrub (unmounts drive)"),
+        ('targeted', "Targeted deleted-file residue (unmounts drive)"),
+        ('targeted_fill', "Targeted pre-pass + free space fill"),
+        ('incremental', "Incremental re-wipe since last snapshot (unmounts drive)"),
+        ('trim', "SSD TRIM - discard free space, no writes"),
+        ('raw', "Whole partition - unmounted partitions only, destroys all data"),
+        ('gaps', "Partition gaps and filesystem slack on the whole disk")
+    ]
+
     def __init__(self):
         super().__init__(title="Barones Free Space Cleaner")
         self.set_default_size(340, 300)  # Reduced width from 450 to 340
@@ -529,6 +2933,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
         self.wipe_thread = None
         self.current_drive_index = -1
         self.health_panel = None  # Track health panel window
+        self.health_cache = HealthCache()
 
         # MFT scanning background thread infrastructure
         self.mft_scan_thread = None
@@ -543,6 +2948,32 @@ class FreeSpaceWipeWindow(Gtk.Window):
         self.exfat_scan_cache = {}  # Cache exFAT scan results by device path
         self.exfat_scan_thread = None
 
+        # Scan results that survive restarts and remounts, keyed by volume identity
+        self.metadata_scan_cache = MetadataScanCache()
+        # Free-space bitmaps from the last successful wipe, for incremental re-wipes
+        self.snapshot_store = FreeSpaceSnapshotStore()
+        # Per mount point: did the user accept zeros instead of random on an encrypted volume?
+        self.crypt_pattern_choice = {}
+        self.random_throughput = None
+
+        # Metadata pressure files are spread over shard subdirectories (max fan-out)
+        self.pressure_shard_fanout = PRESSURE_SHARD_FANOUT
+        
+        # Opportunistic mode: the idle scheduler pauses the writer on top of the user's Pause button
+        self.idle_scheduler = None
+        
+        # Thermal governor of the running job (None when off or the drive has no sensor)
+        self.thermal_governor = None
+        
+        # Safe fill: keep the larger of the GB setting and this share of the volume free
+        self.ballast_reserve_percent = 1.0
+        
+        # I/O class of wipe threads and a shared byte-rate budget (changeable live)
+        self.io_priority = 'normal'
+        self.rate_limiter = ByteRateLimiter(0)
+        self.control_file = os.path.join(get_cache_dir(), 'control')
+        self.control_file_mtime = None
+
         # Main vertical box
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         self.add(vbox)
@@ -619,6 +3050,61 @@ class FreeSpaceWipeWindow(Gtk.Window):
         
         vbox.pack_start(wipe_type_container, False, False, 10)
         
+        # Mode selector - how the selected pattern is applied
+        mode_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        mode_label = Gtk.Label(label="Mode:", xalign=0)
+        self.mode_combo = Gtk.ComboBoxText()
+        for mode_id, mode_text in self.WIPE_MODES:
+            self.mode_combo.append(mode_id, mode_text)
+        self.mode_combo.set_active_id('fill')
+        mode_hbox.pack_start(mode_label, False, False, 0)
+        mode_hbox.pack_start(self.mode_combo, True, True, 0)
+        vbox.pack_start(mode_hbox, False, False, 0)
+        
+        # Background-friendliness: I/O class and bandwidth budget
+        budget_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        priority_label = Gtk.Label(label="I/O priority:", xalign=0)
+        self.io_priority_combo = Gtk.ComboBoxText()
+        for level, text in zip(IO_PRIORITIES, ("Normal", "Low (best effort 7)", "Idle only")):
+            self.io_priority_combo.append(level, text)
+        self.io_priority_combo.set_active_id(self.io_priority)
+        self.io_priority_combo.connect("changed", self.on_io_priority_changed)
+        rate_label = Gtk.Label(label="Rate limit (MB/s, 0 = none):", xalign=0)
+        self.rate_limit_spin = Gtk.SpinButton.new_with_range(0, 10000, 5)
+        self.rate_limit_spin.set_value(0)
+        self.rate_limit_spin.connect("value-changed", self.on_rate_limit_changed)
+        budget_hbox.pack_start(priority_label, False, False, 0)
+        budget_hbox.pack_start(self.io_priority_combo, False, False, 0)
+        budget_hbox.pack_start(rate_label, False, False, 10)
+        budget_hbox.pack_start(self.rate_limit_spin, False, False, 0)
+        self.check_thermal = Gtk.CheckButton(label="Hold drive at (°C):")
+        self.check_thermal.set_tooltip_text("Slow the wipe down while the drive is hotter than this "
+                                            "(drive sensor via hwmon, or smartctl)")
+        self.thermal_target_spin = Gtk.SpinButton.new_with_range(40, 85, 1)
+        self.thermal_target_spin.set_value(70)
+        budget_hbox.pack_start(self.check_thermal, False, False, 10)
+        budget_hbox.pack_start(self.thermal_target_spin, False, False, 0)
+        vbox.pack_start(budget_hbox, False, False, 5)
+        
+        # Safe fill: stop at a reserve instead of filling the volume to the last block
+        reserve_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        self.check_ballast = Gtk.CheckButton(label="Safe fill - keep free (GB):")
+        self.check_ballast.set_tooltip_text("Stop at a reserve (this size or 1% of the volume, whichever is larger), "
+                                            "then rotate the oldest wipe files; they are deleted at once if other "
+                                            "programs need the space")
+        self.ballast_reserve_spin = Gtk.SpinButton.new_with_range(0, 1000, 1)
+        self.ballast_reserve_spin.set_value(2)
+        reserve_hbox.pack_start(self.check_ballast, False, False, 0)
+        reserve_hbox.pack_start(self.ballast_reserve_spin, False, False, 0)
+        dirty_label = Gtk.Label(label="Dirty memory cap (% of RAM, 0 = none):", xalign=0)
+        dirty_label.set_tooltip_text("Pace the fill so unwritten data in the page cache stays under this "
+                                     "share of RAM, leaving memory to other programs")
+        self.dirty_watermark_spin = Gtk.SpinButton.new_with_range(0, 50, 1)
+        self.dirty_watermark_spin.set_value(5)
+        reserve_hbox.pack_start(dirty_label, False, False, 10)
+        reserve_hbox.pack_start(self.dirty_watermark_spin, False, False, 0)
+        vbox.pack_start(reserve_hbox, False, False, 0)
+        
         # Checkboxes
         hbox_checks = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=20)
         self.check_start_again = Gtk.CheckButton(label="Start again when finished")
@@ -626,6 +3112,21 @@ class FreeSpaceWipeWindow(Gtk.Window):
         self.check_start_again.connect("toggled", self.on_start_again_toggled)
         hbox_checks.pack_start(self.check_start_again, False, False, 0)
         hbox_checks.pack_start(self.check_cycle_wipe, False, False, 0)
+        self.check_trim_verify = Gtk.CheckButton(label="Verify TRIM by sampling")
+        self.check_trim_verify.set_tooltip_text("After TRIM, read random free blocks back and count how many are zeros")
+        hbox_checks.pack_start(self.check_trim_verify, False, False, 0)
+        self.check_trim_after = Gtk.CheckButton(label="TRIM after wipe")
+        self.check_trim_after.set_tooltip_text("Discard the wiped space once the wipe files are deleted so an SSD "
+                                               "regains full write speed without waiting for garbage collection")
+        hbox_checks.pack_start(self.check_trim_after, False, False, 0)
+        self.check_skip_clean = Gtk.CheckButton(label="Skip already-clean blocks")
+        self.check_skip_clean.set_tooltip_text("Raw-device modes read each block first and only write blocks that "
+                                               "do not already hold the pattern (not used with random)")
+        hbox_checks.pack_start(self.check_skip_clean, False, False, 0)
+        self.check_opportunistic = Gtk.CheckButton(label="Opportunistic (only while disk is idle)")
+        self.check_opportunistic.set_tooltip_text("Pause automatically within a second when other programs use "
+                                                  "the disk and resume once it has been idle for two seconds")
+        hbox_checks.pack_start(self.check_opportunistic, False, False, 0)
         vbox.pack_start(hbox_checks, False, False, 10)
         
         # Buttons at bottom
@@ -773,11 +3274,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
         
         # Use lsblk to get block devices with mount points and filesystem type
         try:
-            result = subprocess.run(
-                ['lsblk', '-J', '-o', 'NAME,MOUNTPOINT,SIZE,FSTYPE'],
-                capture_output=True,
-                text=True
-            )
+            result = StreamingCommand(['lsblk', '-J', '-o', 'NAME,MOUNTPOINT,SIZE,FSTYPE,TYPE'], hard_timeout=15).run()
             data = json.loads(result.stdout)
         except:
             self.drives_combo.append_text("Error detecting drives")
@@ -817,10 +3314,73 @@ class FreeSpaceWipeWindow(Gtk.Window):
         
         if len(self.drives) > 0:
             self.drives_combo.set_active(0)
+            self._prefetch_health()
         else:
             self.drives_combo.append_text("No drives detected")
             self.drives_combo.set_active(0)
     
+    def _prefetch_health(self):
+        """Read SMART data for every listed physical disk in the background, one smartctl call per disk"""
+        if not find_tool('smartctl'):
+            return
+        devices = sorted({self._get_physical_device(drive['name']) for drive in self.drives
+                          if drive['name'] != 'unknown'})
+        devices = [device for device in devices if self.health_cache.fresh(device) is None]
+        if devices:
+            threading.Thread(target=self._prefetch_health_worker, args=(devices,), daemon=True).start()
+    
+    def _prefetch_health_worker(self, devices):
+        """Collect health for the disks in parallel into the health cache"""
+        start_time = time.time()
+        
+        def collect(device):
+            # One disk's failure must not cost the others their results
+            try:
+                return collect_drive_health(f"/dev/{device}")
+            except Exception as e:
+                return None, str(e)
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(devices))) as pool:
+            results = list(pool.map(collect, devices))
+        for device, (health, error) in zip(devices, results):
+            if health:
+                self.health_cache.put(device, health)
+            else:
+                print(f"🩺 No health data for {device}: {error}")
+        read = sum(1 for health, _ in results if health)
+        print(f"🩺 Prefetched health of {read}/{len(devices)} disks in {time.time() - start_time:.1f}s")
+    
+    def _confirm_drive_health(self, drive_info):
+        """Warn before wiping a drive whose prefetched health is poor, even when stale; never runs smartctl itself"""
+        cached = self.health_cache.get(self._get_physical_device(drive_info['name']))
+        if cached is None or cached[1] >= self.health_cache.ttl:
+            # Refresh in the background for the next start; a stale record is still better than none
+            self._prefetch_health()
+        if cached is None:
+            return True
+        health, age = cached
+        assessment = assess_drive_health(health, drive_info.get('type', 'Unknown'))
+        if assessment and assessment[0] in ('warning', 'critical'):
+            message = assessment[3]
+        elif health.smart_passed is False:
+            message = "The drive's SMART self-assessment reports FAILED."
+        else:
+            return True
+        if age >= self.health_cache.ttl:
+            message += f"\n(SMART data read {format_age(age)} ago.)"
+        
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            flags=0,
+            message_type=Gtk.MessageType.WARNING,
+            buttons=Gtk.ButtonsType.OK_CANCEL,
+            text=f"{drive_info['name']} may not survive a wipe"
+        )
+        dialog.format_secondary_text(f"{message}\n\nWiping adds heavy writes to this drive. Wipe anyway?")
+        response = dialog.run()
+        dialog.destroy()
+        return response == Gtk.ResponseType.OK
+    
     def _find_root_device(self, device):
         """Find the device name that has / mounted and trace to physical device"""
         # Check if this device has root mountpoint
@@ -882,10 +3442,37 @@ class FreeSpaceWipeWindow(Gtk.Window):
                 self.drives_combo.append_text(display_name)
             except (PermissionError, OSError):
                 pass
+        elif not mount_point and device.get('type') == 'part' and not device.get('children'):
+            # Unmounted partition with nothing stacked on it - only usable by the raw partition mode
+            self._add_unmounted_partition(device)
         
         # Check children (partitions)
         for child in device.get('children', []):
             self._scan_device(child)
+
+    def _add_unmounted_partition(self, device):
+        """List an unmounted partition for whole-partition wiping"""
+        device_name = device.get('name', 'unknown')
+        fstype = device.get('fstype') or ''
+        try:
+            with open(f"/sys/class/block/{device_name}/size", 'r') as f:
+                size = int(f.read().strip()) * 512
+        except (OSError, ValueError):
+            return
+        drive_type = self._get_drive_type(device_name)
+        fs_display = fstype.upper() if fstype else "no filesystem"
+        display_name = f"[unmounted] /dev/{device_name} ({drive_type} - {fs_display}) - {size / (1024**3):.1f} GB partition"
+        
+        self.drives.append({
+            'mount_point': None,
+            'device_path': f"/dev/{device_name}",
+            'free': size,
+            'total': size,
+            'name': device_name,
+            'type': drive_type,
+            'fstype': fstype
+        })
+        self.drives_combo.append_text(display_name)
     
     def _get_base_device(self, device_name):
         """Get base device name, handling NVMe and regular drives differently"""
@@ -986,39 +3573,452 @@ class FreeSpaceWipeWindow(Gtk.Window):
         drive_info = self.drives[active]
         
         # Get selected wipe method
-        if self.radio_zeros.get_active():
-            wipe_method = "zeros"
-        elif self.radio_random.get_active():
-            wipe_method = "random"
-        elif self.radio_ones.get_active():
-            wipe_method = "ones"
-        elif self.radio_3487.get_active():
-            wipe_method = "3487"
-        else:
+        wipe_method = self._get_selected_wipe_method()
+        if wipe_method is None:
             # MFT Clean Only - handle separately
             self._start_mft_clean_only(drive_info)
             return
         
+        mode = self.mode_combo.get_active_id() or 'fill'
+        # TRIM only unmaps; everything else adds heavy writes
+        if mode != 'trim' and not self._confirm_drive_health(drive_info):
+            return
+        if wipe_method == "random" and mode in ('fill', 'targeted', 'targeted_fill', 'incremental'):
+            wipe_method = self._choose_pattern_for_encryption(drive_info, wipe_method)
+        if mode == 'gaps':
+            scan = self._scan_unclaimed_space(drive_info)
+            if scan and self._confirm_gap_sweep(scan):
+                self._start_operation(self._sweep_unclaimed_space, scan, wipe_method)
+            return
+        if (mode == 'raw') != (drive_info['mount_point'] is None):
+            self._show_mode_mismatch(drive_info)
+            return
+        if mode == 'raw':
+            if self._confirm_raw_wipe(drive_info):
+                self._start_operation(self._raw_partition_wipe, drive_info, wipe_method)
+            return
+        if mode == 'offline_metadata':
+            if self._confirm_offline_operation(drive_info, "Offline Metadata Scrub"):
+                self._start_operation(self._offline_metadata_scrub, drive_info)
+            return
+        if mode in ('targeted', 'targeted_fill'):
+            if self._confirm_offline_operation(drive_info, "Targeted Residue Overwrite"):
+                self._start_operation(self._targeted_residue_wipe, drive_info, wipe_method, mode == 'targeted_fill')
+            return
+        if mode == 'incremental':
+            if self._confirm_offline_operation(drive_info, "Incremental Re-wipe"):
+                self._start_operation(self._incremental_rewipe, drive_info, wipe_method)
+            return
+        if mode == 'trim':
+            self._start_operation(self._trim_free_space, drive_info, self.check_trim_verify.get_active())
+            return
+        
         # Start wiping in a thread
+        self._start_operation(self._wipe_free_space, drive_info, wipe_method)
+    
+    def _get_selected_wipe_method(self):
+        """Wipe pattern chosen with the radio buttons, or None"""
+        if self.radio_zeros.get_active():
+            return "zeros"
+        if self.radio_random.get_active():
+            return "random"
+        if self.radio_ones.get_active():
+            return "ones"
+        if self.radio_3487.get_active():
+            return "3487"
+        return None
+
+    def _start_idle_scheduler(self, drive_info, write_slack=IdleWindowScheduler.WRITE_THROUGH_SIZE):
+        """Start the opportunistic idle-window scheduler for the drive's disk if enabled"""
+        self.idle_scheduler = None
+        if not self.check_opportunistic.get_active():
+            return
+        disk = self._get_physical_device(drive_info['name'])
+
+        def on_change(paused, utilisation):
+            if paused:
+                print(f"⏸️ {disk} busy with other I/O ({utilisation * 100:.0f}% utilised) - wipe paused")
+                GLib.idle_add(self._update_info_label, f"Paused: {disk} is busy with other programs' I/O")
+            else:
+                print(f"▶️ {disk} idle again - wipe resumed")
+
+        self.idle_scheduler = IdleWindowScheduler(disk, on_change, write_slack).start()
+        if self.idle_scheduler:
+            print(f"🕰️ Opportunistic mode: watching {disk} in /proc/diskstats")
+
+    def _stop_idle_scheduler(self):
+        """Stop the idle scheduler and describe how long it held the wipe back"""
+        scheduler, self.idle_scheduler = self.idle_scheduler, None
+        if not scheduler:
+            return None
+        scheduler.stop()
+        if not scheduler.pause_count:
+            return None
+        return f"Yielded to other I/O {scheduler.pause_count} times ({scheduler.paused_seconds:.0f}s)"
+
+    def _start_thermal_governor(self, drive_info, job_log):
+        """Start the thermal governor for the drive's disk if enabled"""
+        self.thermal_governor = None
+        if not self.check_thermal.get_active():
+            return
+        disk = self._get_physical_device(drive_info['name'])
+        target = self.thermal_target_spin.get_value()
+
+        def on_change(temperature, scale, ceiling):
+            if scale < 1.0:
+                print(f"🌡️ {disk} at {temperature:.0f}°C - writing at {scale * 100:.0f}% ({ceiling:.0f} MB/sec)")
+                GLib.idle_add(self._update_info_label, f"{disk} at {temperature:.0f}°C - slowed down to cool off")
+            else:
+                print(f"🌡️ {disk} back to {temperature:.0f}°C - full speed")
+
+        self.thermal_governor = ThermalGovernor(disk, target, self.rate_limiter, job_log, on_change).start()
+        if self.thermal_governor:
+            print(f"🌡️ Holding {disk} at {target:.0f}°C ({self.thermal_governor.source} sensor)")
+        else:
+            print(f"🌡️ {disk} reports no temperature - thermal limit not applied")
+
+    def _stop_thermal_governor(self):
+        """Stop the thermal governor and describe what it did"""
+        governor, self.thermal_governor = self.thermal_governor, None
+        if not governor:
+            return None
+        governor.stop()
+        if governor.peak is None:
+            return None
+        summary = f"Peak {governor.peak:.0f}°C"
+        if governor.throttled_seconds >= 1:
+            summary += f", slowed for {governor.throttled_seconds:.0f}s to hold {governor.target:.0f}°C"
+        return summary
+
+    def _worker_limit(self, workers):
+        """Writer count the thermal governor allows right now"""
+        governor = self.thermal_governor
+        return governor.allowed_workers(workers) if governor else workers
+
+    def _start_ballast(self, mount_point):
+        """Start the free-space sampler that keeps the safe-fill reserve"""
+        reserve = BallastManager.reserve_for(mount_point, self.ballast_reserve_spin.get_value(),
+                                             self.ballast_reserve_percent)
+
+        def on_release(released, elapsed):
+            print(f"⚓ Free space fell below the reserve - released {released / (1024**2):.0f} MB "
+                  f"of wipe files in {elapsed * 1000:.0f} ms")
+
+        print(f"⚓ Safe fill: keeping {reserve / (1024**3):.1f} GB free on {mount_point}")
+        return BallastManager(mount_point, reserve, on_release).start()
+
+    def _waiting_for_disk(self):
+        """True while the user paused or opportunistic mode is holding back for foreign I/O"""
+        return self.paused or bool(self.idle_scheduler and self.idle_scheduler.paused)
+
+    def _run_worker(self, target, *args):
+        """Thread body for every wipe worker: apply the I/O class, then run"""
+        if self.io_priority != 'normal' and set_io_priority(self.io_priority):
+            print(f"🐢 Wipe thread running with {self.io_priority} I/O priority")
+        try:
+            target(*args)
+        except Exception as e:
+            # Workers catch the errors they expect; anything else would leave every control locked
+            summary = f"{target.__name__.strip('_').replace('_', ' ').capitalize()} failed: {e}"
+            print(f"❌ {summary}")
+            self._stop_idle_scheduler()
+            self._stop_thermal_governor()
+            GLib.idle_add(self._operation_complete, summary)
+
+    def on_io_priority_changed(self, combo):
+        self.io_priority = combo.get_active_id() or 'normal'
+
+    def on_rate_limit_changed(self, spin):
+        self.rate_limiter.set_rate(spin.get_value())
+        print(f"🚦 Rate limit: {spin.get_value():.0f} MB/sec" if spin.get_value() else "🚦 Rate limit off")
+
+    def _poll_control_file(self):
+        """Apply rate changes written by `--set-rate` from another shell"""
+        try:
+            mtime = os.path.getmtime(self.control_file)
+        except OSError:
+            return True
+        if mtime != self.control_file_mtime:
+            self.control_file_mtime = mtime
+            try:
+                with open(self.control_file, 'r') as f:
+                    for line in f:
+                        key, _, value = line.strip().partition('=')
+                        if key == 'rate':
+                            # Goes through on_rate_limit_changed like a UI change
+                            self.rate_limit_spin.set_value(float(value))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring control file {self.control_file}: {e}")
+        return True
+
+    def configure(self, rate_limit=None, io_priority=None, control_file=None, dirty_watermark=None,
+                  pressure_fanout=None):
+        """Apply command line options"""
+        if control_file:
+            self.control_file = control_file
+        try:
+            # Changes made before this instance started are not live commands
+            self.control_file_mtime = os.path.getmtime(self.control_file)
+        except OSError:
+            pass
+        GLib.timeout_add_seconds(1, self._poll_control_file)
+        if io_priority:
+            self.io_priority_combo.set_active_id(io_priority)
+        if rate_limit is not None:
+            self.rate_limit_spin.set_value(rate_limit)
+        if dirty_watermark is not None:
+            self.dirty_watermark_spin.set_value(dirty_watermark)
+        if pressure_fanout:
+            self.pressure_shard_fanout = pressure_fanout
+
+    def _start_operation(self, target, *args):
+        """Run a wipe-mode worker in a thread with the controls locked"""
         self.wiping = True
         self.paused = False
         self.cancelled = False
         self.start_button.set_sensitive(False)
+        self.mft_clean_button.set_sensitive(False)
         self.pause_button.set_sensitive(True)
         
-        # Disable drive selection and wipe methods during operation
+        # Disable drive selection, wipe methods and mode during operation
         self.drives_combo.set_sensitive(False)
+        self.mode_combo.set_sensitive(False)
         self.radio_zeros.set_sensitive(False)
         self.radio_random.set_sensitive(False)
         self.radio_ones.set_sensitive(False)
         self.radio_3487.set_sensitive(False)
         
-        self.wipe_thread = threading.Thread(
-            target=self._wipe_free_space,
-            args=(drive_info, wipe_method)
-        )
+        self.wipe_thread = threading.Thread(target=self._run_worker, args=(target, *args))
         self.wipe_thread.start()
     
+    def _operation_complete(self, summary=None, restart=False):
+        """Reset UI after a wipe-mode worker finished, keeping its summary visible"""
+        self.wiping = False
+        self.paused = False
+        
+        if restart and not self.cancelled and self.check_start_again.get_active():
+            if summary:
+                self.info_label.set_text(summary)
+            GLib.timeout_add(500, self._restart_wipe)
+            return False
+        
+        self.current_drive_index = -1
+        
+        self.start_button.set_sensitive(True)
+        self.mft_clean_button.set_sensitive(True)
+        self.pause_button.set_sensitive(False)
+        self.pause_button.set_label("Pause")
+        self.progress_bar.set_fraction(0)
+        if summary:
+            self.info_label.set_text(summary)
+        
+        self.drives_combo.set_sensitive(True)
+        self.mode_combo.set_sensitive(True)
+        self.radio_zeros.set_sensitive(True)
+        self.radio_random.set_sensitive(True)
+        self.radio_ones.set_sensitive(True)
+        self.radio_3487.set_sensitive(True)
+        return False
+    
+    def _confirm_offline_operation(self, drive_info, title):
+        """Ask before unmounting a drive and writing to its raw device"""
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            flags=0,
+            message_type=Gtk.MessageType.WARNING,
+            buttons=Gtk.ButtonsType.OK_CANCEL,
+            text=title
+        )
+        dialog.format_secondary_text(
+            f"{drive_info['mount_point']} will be unmounted and its device written to directly. "
+            "Close every program using this drive first.\n\n"
+            "The drive is mounted again when the operation finishes."
+        )
+        response = dialog.run()
+        dialog.destroy()
+        return response == Gtk.ResponseType.OK
+    
+    def _show_mode_mismatch(self, drive_info):
+        """Explain that raw mode and unmounted partitions only go together"""
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            flags=0,
+            message_type=Gtk.MessageType.INFO,
+            buttons=Gtk.ButtonsType.OK,
+            text="Mode not available for this drive"
+        )
+        if drive_info['mount_point'] is None:
+            dialog.format_secondary_text(
+                f"{drive_info['device_path']} is not mounted. Choose the whole partition mode to wipe it, "
+                "or mount it to wipe only its free space.")
+        else:
+            dialog.format_secondary_text(
+                "Whole partition mode only works on unmounted partitions. "
+                f"Unmount {drive_info['mount_point']} first if you really want to erase it completely.")
+        dialog.run()
+        dialog.destroy()
+
+    def _confirm_raw_wipe(self, drive_info):
+        """Ask before destroying everything on a partition"""
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            flags=0,
+            message_type=Gtk.MessageType.WARNING,
+            buttons=Gtk.ButtonsType.OK_CANCEL,
+            text=f"Erase all of {drive_info['device_path']}?"
+        )
+        dialog.format_secondary_text(
+            f"Every byte of {drive_info['device_path']} ({drive_info['total'] / (1024**3):.1f} GB, "
+            f"{drive_info.get('fstype') or 'no filesystem'}) will be overwritten. "
+            "All files on this partition are destroyed and cannot be recovered.")
+        response = dialog.run()
+        dialog.destroy()
+        return response == Gtk.ResponseType.OK
+    
+    def _scan_unclaimed_space(self, drive_info):
+        """Map gaps and slack on the drive's physical disk, or explain why that is not possible"""
+        disk = self._get_physical_device(drive_info['name'])
+        result = StreamingCommand(['lsblk', '-J', '-o', 'NAME,FSTYPE,PTTYPE,TYPE', f"/dev/{disk}"], hard_timeout=10).run()
+        try:
+            tree = json.loads(result.stdout)['blockdevices'][0]
+        except (ValueError, KeyError, IndexError):
+            tree = None
+
+        message = None
+        scan = None
+        if not tree or tree.get('type') != 'disk':
+            message = f"Cannot read the partition layout of /dev/{disk}"
+        else:
+            fstypes = {child.get('name'): child.get('fstype') for child in tree.get('children', [])}
+            try:
+                scan = UnclaimedSpaceScanner(disk).scan(tree.get('pttype'), fstypes)
+                scan['disk'] = disk
+                if scan['skipped']:
+                    message = f"/dev/{disk} skipped: {scan['skipped']}"
+                elif not scan['intervals']:
+                    message = f"/dev/{disk} has no unclaimed space outside its partitions and filesystems"
+            except (OSError, ValueError) as e:
+                message = f"Cannot scan /dev/{disk}: {e}"
+
+        if message:
+            print(f"🧭 {message}")
+            dialog = Gtk.MessageDialog(transient_for=self, flags=0, message_type=Gtk.MessageType.INFO,
+                                       buttons=Gtk.ButtonsType.OK, text="Nothing to sweep")
+            dialog.format_secondary_text(message)
+            dialog.run()
+            dialog.destroy()
+            return None
+        return scan
+
+    def _confirm_gap_sweep(self, scan):
+        """Show the unclaimed intervals and ask before overwriting them"""
+        lines = [f"{kind:<5}  {offset / (1024**2):>12,.1f} MiB  +{length / (1024**2):,.1f} MiB"
+                 for offset, length, kind in scan['intervals']]
+        total = sum(length for _, length, _ in scan['intervals'])
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            flags=0,
+            message_type=Gtk.MessageType.WARNING,
+            buttons=Gtk.ButtonsType.OK_CANCEL,
+            text=f"Overwrite {total / (1024**3):.2f} GB of unclaimed space on /dev/{scan['disk']}?"
+        )
+        dialog.format_secondary_text(
+            "These areas belong to no partition or filesystem (offset, size):\n\n" + "\n".join(lines[:20]) +
+            (f"\n... and {len(lines) - 20} more" if len(lines) > 20 else ""))
+        response = dialog.run()
+        dialog.destroy()
+        return response == Gtk.ResponseType.OK
+
+    def _find_crypt_layer(self, device_name):
+        """Return the dm-crypt mapping a device sits on (walking dm slaves, e.g. LVM on LUKS), or None"""
+        block = device_name
+        if not os.path.exists(f"/sys/class/block/{block}"):
+            block = None
+            for dm in os.listdir('/sys/block'):
+                try:
+                    with open(f"/sys/block/{dm}/dm/name", 'r') as f:
+                        if f.read().strip() == device_name:
+                            block = dm
+                            break
+                except OSError:
+                    continue
+
+        pending = [block] if block else []
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            try:
+                with open(f"/sys/class/block/{current}/dm/uuid", 'r') as f:
+                    uuid = f.read().strip()
+                with open(f"/sys/class/block/{current}/dm/name", 'r') as f:
+                    name = f.read().strip()
+            except OSError:
+                uuid = name = ''
+            if uuid.startswith('CRYPT-'):
+                # dmsetup is only needed to rule out cipher_null/ECB mappings, which leak plaintext patterns
+                table = StreamingCommand(['dmsetup', 'table', name], hard_timeout=10).run()
+                fields = table.stdout.split() if table.ok else []
+                cipher = fields[3] if len(fields) > 3 and fields[2] == 'crypt' else None
+                return {'dm': current, 'name': name, 'type': uuid.split('-')[1], 'cipher': cipher}
+            try:
+                pending.extend(os.listdir(f"/sys/class/block/{current}/slaves"))
+            except OSError:
+                pass
+        return None
+
+    def _measure_random_throughput(self):
+        """MB/sec os.urandom manages on this machine (measured once)"""
+        if self.random_throughput is None:
+            generated = 0
+            start_time = time.time()
+            while time.time() - start_time < 0.25:
+                generated += len(os.urandom(4 * 1024 * 1024))
+            self.random_throughput = generated / (time.time() - start_time) / (1024 * 1024)
+        return self.random_throughput
+
+    def _choose_pattern_for_encryption(self, drive_info, method):
+        """Offer zeros instead of random when dm-crypt already turns every write into random-looking data"""
+        mount_point = drive_info['mount_point']
+        if mount_point in self.crypt_pattern_choice:
+            return "zeros" if self.crypt_pattern_choice[mount_point] else method
+
+        layer = self._find_crypt_layer(drive_info['name'])
+        if not layer:
+            return method
+        cipher = layer['cipher'] or ''
+        if not cipher or 'null' in cipher or 'ecb' in cipher:
+            print(f"🔐 {layer['name']} cipher '{cipher or 'unknown'}' - keeping random data")
+            return method
+
+        random_rate = self._measure_random_throughput()
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            flags=0,
+            message_type=Gtk.MessageType.QUESTION,
+            buttons=Gtk.ButtonsType.YES_NO,
+            text="Encrypted drive: write zeros instead of random?"
+        )
+        dialog.format_secondary_text(
+            f"{mount_point} is on {layer['type']} encryption ({layer['name']}, {cipher}). "
+            "Everything written through it is stored as ciphertext, so zeros end up on the disk "
+            "looking exactly like random data.\n\n"
+            f"Generating random data runs at about {random_rate:.0f} MB/sec here; zeros cost nothing, "
+            "so the wipe is limited only by the disk and the encryption.\n\n"
+            "Use zeros for this drive?")
+        response = dialog.run()
+        dialog.destroy()
+
+        use_zeros = response == Gtk.ResponseType.YES
+        self.crypt_pattern_choice[mount_point] = use_zeros
+        if use_zeros:
+            print(f"🔐 {mount_point} on {layer['name']} ({cipher}): writing zeros instead of random, "
+                  f"random generation would cap at {random_rate:.0f} MB/sec")
+            return "zeros"
+        return method
+    
     def on_pause_clicked(self, button):
         if self.paused:
             self.paused = False
@@ -1073,36 +4073,94 @@ class FreeSpaceWipeWindow(Gtk.Window):
                 mount_point = drive_info['mount_point']
                 fstype = drive_info.get('fstype', '').upper()
 
-                if 'NTFS' in fstype:
-                    # Check cache first
+                if mount_point is None:
+                    self.mft_status_label.set_markup("<span foreground='gray'>Unmounted partition - whole partition mode only</span>")
+                elif 'NTFS' in fstype:
+                    # Check this session's cache first; the persistent cache is checked by the worker
                     if mount_point in self.mft_scan_cache:
                         self._update_tooltip_with_mft_info(self.mft_scan_cache[mount_point])
                     else:
-                        # Start background scan with progress dialog
                         self._start_background_mft_scan(drive_info)
                 elif 'EXFAT' in fstype:
-                    # Check cache first
                     if mount_point in self.exfat_scan_cache:
                         self._update_tooltip_with_exfat_info(self.exfat_scan_cache[mount_point])
                     else:
-                        # Start background scan with progress dialog
                         self._start_background_exfat_scan(drive_info)
                 else:
                     self.mft_status_label.set_markup("<span foreground='gray'>Metadata cleaning not supported</span>")
             else:
                 self.mft_status_label.set_markup("<span foreground='gray'>No drive selected</span>")
 
+    def _get_volume_identity(self, mount_point):
+        """Stable key for a volume: filesystem type, UUID/volume serial and size"""
+        raw_device = self._get_raw_device(mount_point)
+        if not raw_device:
+            return None
+        result = StreamingCommand(['lsblk', '-J', '-b', '-o', 'UUID,SIZE,FSTYPE', raw_device], hard_timeout=10).run()
+        try:
+            device = json.loads(result.stdout)['blockdevices'][0]
+        except (ValueError, KeyError, IndexError):
+            return None
+        if not device.get('uuid'):
+            return None
+        return f"{device.get('fstype') or 'unknown'}:{device['uuid']}:{device.get('size') or 0}"
+
+    def _get_scan_fingerprint(self, drive_info):
+        """Current volume key, free/total bytes and a cheap entry count to validate cached scans"""
+        mount_point = drive_info['mount_point']
+        volume_key = self._get_volume_identity(mount_point)
+        if not volume_key:
+            return None
+        usage = shutil.disk_usage(mount_point)
+
+        entry_count = None
+        if 'NTFS' in drive_info.get('fstype', '').upper():
+            # In-use $MFT records move with every file created or deleted
+            try:
+                with NTFSVolumeReader(self._get_raw_device(mount_point)) as reader:
+                    entry_count = reader.count_in_use_records()
+            except (OSError, ValueError, TypeError, struct.error):
+                pass
+        return volume_key, usage.free, usage.total, entry_count
+
+    def _lookup_persistent_scan(self, drive_info):
+        """Cached metadata scan for this volume if nothing has really changed since"""
+        try:
+            fingerprint = self._get_scan_fingerprint(drive_info)
+        except OSError:
+            return None
+        if not fingerprint:
+            return None
+        volume_key, free, total, entry_count = fingerprint
+        return self.metadata_scan_cache.lookup(volume_key, free, total, entry_count)
+
+    def _store_persistent_scan(self, drive_info, scan_info):
+        """Remember a metadata scan across restarts and remounts"""
+        if not scan_info:
+            return
+        try:
+            fingerprint = self._get_scan_fingerprint(drive_info)
+        except OSError:
+            return
+        if fingerprint:
+            volume_key, free, _total, entry_count = fingerprint
+            self.metadata_scan_cache.store(volume_key, scan_info, free, entry_count)
+
+    def _invalidate_persistent_scan(self, drive_info):
+        """Drop cached scans for a volume whose metadata we just changed"""
+        self.mft_scan_cache.pop(drive_info['mount_point'], None)
+        self.exfat_scan_cache.pop(drive_info['mount_point'], None)
+        volume_key = self._get_volume_identity(drive_info['mount_point'])
+        if volume_key:
+            self.metadata_scan_cache.invalidate(volume_key)
+
     def _start_background_mft_scan(self, drive_info):
-        """Start MFT scanning in background thread with progress dialog"""
-        # Show initial scanning message
+        """Check the persistent cache and, if needed, scan the MFT in a background thread"""
         if hasattr(self, 'mft_status_label') and self.mft_status_label:
-            self.mft_status_label.set_markup("<span foreground='blue'><i>Scanning MFT...</i></span>")
-        print(f"🔍 Starting MFT background scan for: {drive_info['mount_point']}")
-
-        # Create and show progress dialog
-        self.mft_scan_progress_dialog = MFTScanProgressDialog(self, drive_info['mount_point'])
+            self.mft_status_label.set_markup("<span foreground='blue'><i>Checking cache...</i></span>")
 
         # Start background thread
+        self.mft_scan_progress_dialog = None
         self.mft_scan_cancel = False
         self.mft_scan_thread = threading.Thread(
             target=self._mft_scan_thread_worker,
@@ -1111,20 +4169,44 @@ class FreeSpaceWipeWindow(Gtk.Window):
         self.mft_scan_thread.daemon = True
         self.mft_scan_thread.start()
 
+    def _show_mft_scan_progress(self, drive_info):
+        """Cache miss: show that a full MFT scan is running, with a progress dialog"""
+        if hasattr(self, 'mft_status_label') and self.mft_status_label:
+            self.mft_status_label.set_markup("<span foreground='blue'><i>Scanning MFT...</i></span>")
+        print(f"🔍 Starting MFT background scan for: {drive_info['mount_point']}")
+        self.mft_scan_progress_dialog = MFTScanProgressDialog(
+            self, drive_info['mount_point'], cancel_callback=self._cancel_mft_scan)
+        return False
+
     def _mft_scan_thread_worker(self, drive_info):
         """Worker thread for MFT scanning"""
         try:
             mount_point = drive_info['mount_point']
 
+            # The fingerprint runs lsblk/df and reads the raw device, so it never runs on the GTK thread
+            cached_info = self._lookup_persistent_scan(drive_info)
+            if cached_info:
+                self.mft_scan_cache[mount_point] = cached_info
+                GLib.idle_add(self._finish_mft_scan, cached_info)
+                return
+            GLib.idle_add(self._show_mft_scan_progress, drive_info)
+
             # Update progress dialog
             if self.mft_scan_progress_dialog:
                 self.mft_scan_progress_dialog.update_progress("<b>Reading basic MFT info...</b>")
 
             # Perform the actual MFT scan
-            enhanced_mft_info = self._get_enhanced_mft_info(mount_point)
+            enhanced_mft_info = self._get_enhanced_mft_info(
+                mount_point, cancel_check=lambda: self.mft_scan_cancel)
+
+            if self.mft_scan_cancel:
+                print("🛑 MFT scan cancelled by user - result not cached")
+                GLib.idle_add(self._finish_mft_scan_cancelled)
+                return
 
             # Cache the result
             self.mft_scan_cache[mount_point] = enhanced_mft_info
+            self._store_persistent_scan(drive_info, enhanced_mft_info)
 
             # Update UI in main thread
             GLib.idle_add(self._finish_mft_scan, enhanced_mft_info)
@@ -1155,6 +4237,17 @@ class FreeSpaceWipeWindow(Gtk.Window):
                 print(f"⚠️ No MFT info available")
         return False  # Don't repeat this callback
 
+    def _cancel_mft_scan(self):
+        """Called from the progress dialog - stop the running MFT scan"""
+        self.mft_scan_cancel = True
+        self.mft_scan_progress_dialog = None
+
+    def _finish_mft_scan_cancelled(self):
+        """Called when the user cancelled the MFT scan - update UI"""
+        if hasattr(self, 'mft_status_label') and self.mft_status_label:
+            self.mft_status_label.set_markup("<span foreground='gray'>Scan cancelled</span>")
+        return False
+
     def _finish_mft_scan_error(self):
         """Called when MFT scan errors - update UI"""
         if self.mft_scan_progress_dialog:
@@ -1234,53 +4327,73 @@ class FreeSpaceWipeWindow(Gtk.Window):
             self.mft_tooltip_window.hide()
 
     def _start_background_exfat_scan(self, drive_info):
-        """Start exFAT scanning in background thread with progress dialog"""
-        # Show warning popup
-        dialog = Gtk.MessageDialog(
-            parent=self,
-            flags=Gtk.DialogFlags.MODAL,
-            type=Gtk.MessageType.INFO,
-            buttons=Gtk.ButtonsType.OK,
-            text="Scanning exFAT Directory"
-        )
-        dialog.format_secondary_text(
-            "Analyzing exFAT directory entries. This may take several minutes on external or large drives.\n\n"
-            "Please wait..."
-        )
-        dialog.run()
-        dialog.destroy()
-
-        # Show initial scanning message
+        """Check the persistent cache and, if needed, scan exFAT directories in a background thread"""
         if hasattr(self, 'mft_status_label') and self.mft_status_label:
-            self.mft_status_label.set_markup("<span foreground='blue'><i>Scanning exFAT...</i></span>")
-        print(f"🔍 Starting exFAT background scan for: {drive_info['mount_point']}")
-
-        # Create and show progress dialog
-        self.exfat_scan_progress_dialog = MFTScanProgressDialog(self, drive_info['mount_point'])
+            self.mft_status_label.set_markup("<span foreground='blue'><i>Checking cache...</i></span>")
 
         # Start background thread
+        self.exfat_scan_progress_dialog = None
         self.exfat_scan_cancel = False
         self.exfat_scan_thread = threading.Thread(
             target=self._exfat_scan_thread_worker,
             args=(drive_info,)
         )
-        self.exfat_scan_thread.daemon = True
-        self.exfat_scan_thread.start()
+        self.exfat_scan_thread.daemon = True
+        self.exfat_scan_thread.start()
+
+    def _show_exfat_scan_progress(self, drive_info):
+        """Cache miss: tell the user a full exFAT scan is running, with a progress dialog"""
+        if hasattr(self, 'mft_status_label') and self.mft_status_label:
+            self.mft_status_label.set_markup("<span foreground='blue'><i>Scanning exFAT...</i></span>")
+        print(f"🔍 Starting exFAT background scan for: {drive_info['mount_point']}")
+        self.exfat_scan_progress_dialog = MFTScanProgressDialog(
+            self, drive_info['mount_point'], cancel_callback=self._cancel_exfat_scan)
+
+        # Notice only - the scan is already running, so don't block the main loop on it
+        dialog = Gtk.MessageDialog(
+            parent=self,
+            flags=0,
+            type=Gtk.MessageType.INFO,
+            buttons=Gtk.ButtonsType.OK,
+            text="Scanning exFAT Directory"
+        )
+        dialog.format_secondary_text(
+            "Analyzing exFAT directory entries. This may take several minutes on external or large drives.\n\n"
+            "Please wait..."
+        )
+        dialog.connect("response", lambda d, response: d.destroy())
+        dialog.show()
+        return False
 
     def _exfat_scan_thread_worker(self, drive_info):
         """Worker thread for exFAT scanning"""
         try:
             mount_point = drive_info['mount_point']
 
+            # The fingerprint runs lsblk/df, so it never runs on the GTK thread
+            cached_info = self._lookup_persistent_scan(drive_info)
+            if cached_info:
+                self.exfat_scan_cache[mount_point] = cached_info
+                GLib.idle_add(self._finish_exfat_scan, cached_info)
+                return
+            GLib.idle_add(self._show_exfat_scan_progress, drive_info)
+
             # Update progress dialog
             if self.exfat_scan_progress_dialog:
                 self.exfat_scan_progress_dialog.update_progress("<b>Scanning exFAT directory entries...</b>")
 
             # Perform the actual exFAT scan
-            enhanced_exfat_info = self._get_enhanced_exfat_info(mount_point)
+            enhanced_exfat_info = self._get_enhanced_exfat_info(
+                mount_point, cancel_check=lambda: self.exfat_scan_cancel)
+
+            if self.exfat_scan_cancel:
+                print("🛑 exFAT scan cancelled by user - result not cached")
+                GLib.idle_add(self._finish_mft_scan_cancelled)
+                return
 
             # Cache the result
             self.exfat_scan_cache[mount_point] = enhanced_exfat_info
+            self._store_persistent_scan(drive_info, enhanced_exfat_info)
 
             # Update UI in main thread
             GLib.idle_add(self._finish_exfat_scan, enhanced_exfat_info)
@@ -1311,6 +4424,11 @@ class FreeSpaceWipeWindow(Gtk.Window):
                 print(f"⚠️ No exFAT info available")
         return False  # Don't repeat this callback
 
+    def _cancel_exfat_scan(self):
+        """Called from the progress dialog - stop the running exFAT scan"""
+        self.exfat_scan_cancel = True
+        self.exfat_scan_progress_dialog = None
+
     def _finish_exfat_scan_error(self):
         """Called when exFAT scan errors - update UI"""
         if self.exfat_scan_progress_dialog:
@@ -1331,7 +4449,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
             print("⚠️ mft_status_label not found")
             return False
 
-        if not exfat_info or exfat_info['deleted_entries'] == 0:
+        if not exfat_info or (exfat_info['deleted_entries'] == 0 and exfat_info.get('method') != 'native_exfat'):
             markup = "<span foreground='gray'>exFAT info unavailable</span>"
             self.mft_status_label.set_markup(markup)
             print(f"📝 Set label: exFAT info unavailable")
@@ -1352,26 +4470,10 @@ class FreeSpaceWipeWindow(Gtk.Window):
 
     def _start_mft_clean_only(self, drive_info):
         """Start MFT cleaning only (called from Start button when MFT option selected)"""
+        if drive_info['mount_point'] is None:
+            return
         # Start MFT cleaning in a thread (no free space wipe)
-        self.wiping = True
-        self.paused = False
-        self.cancelled = False
-        self.start_button.set_sensitive(False)
-        self.mft_clean_button.set_sensitive(False)
-        self.pause_button.set_sensitive(True)
-        
-        # Disable drive selection and wipe methods during operation
-        self.drives_combo.set_sensitive(False)
-        self.radio_zeros.set_sensitive(False)
-        self.radio_random.set_sensitive(False)
-        self.radio_ones.set_sensitive(False)
-        self.radio_3487.set_sensitive(False)
-        
-        self.wipe_thread = threading.Thread(
-            target=self._clean_metadata_only,
-            args=(drive_info,)
-        )
-        self.wipe_thread.start()
+        self._start_operation(self._clean_metadata_only, drive_info)
     
     def on_cancel_clicked(self, button):
         if self.wiping:
@@ -1389,88 +4491,196 @@ class FreeSpaceWipeWindow(Gtk.Window):
             return
         
         drive_info = self.drives[active]
+        if drive_info['mount_point'] is None:
+            return
         
         # Start MFT cleaning in a thread (no free space wipe)
-        self.wiping = True
-        self.paused = False
-        self.cancelled = False
-        self.start_button.set_sensitive(False)
-        self.mft_clean_button.set_sensitive(False)
-        self.pause_button.set_sensitive(True)
-        
-        # Disable drive selection during operation
-        self.drives_combo.set_sensitive(False)
-        
-        self.wipe_thread = threading.Thread(
-            target=self._clean_metadata_only,
-            args=(drive_info,)
-        )
-        self.wipe_thread.start()
+        self._start_operation(self._clean_metadata_only, drive_info)
     
-    def _get_mft_info_sleuthkit(self, device_path):
+    def _get_mft_info_sleuthkit(self, device_path, cancel_check=None):
         """Get MFT information using Sleuth Kit if available"""
+        raw_device = self._get_raw_device(device_path)
+        if not raw_device:
+            return {}
+        print(f"📍 Found device: {raw_device}")
+
+        mft_info = {}
+
+        def parse_fsstat_line(line):
+            if 'Size of MFT Entries' in line:
+                try:
+                    # Parse "Size of MFT Entries: 1024 bytes"
+                    size_str = line.split(':')[1].strip().split()[0]
+                    mft_info['entry_size'] = int(size_str)
+                    print(f"   ✓ MFT Entry size: {mft_info['entry_size']} bytes")
+                except Exception as e:
+                    print(f"   ✗ Error parsing entry size: {e}")
+            elif line.strip().startswith('Range:') and 'Total' not in line:
+                try:
+                    # Parse "Range: 0 - 453444" to get total MFT entries
+                    # Only matches "Range:" lines, NOT "Total Cluster Range" or "Total Sector Range"
+                    parts = line.split('-')
+                    if len(parts) >= 2:
+                        max_entry = int(parts[-1].strip())
+                        mft_info['total_entries'] = max_entry + 1  # Range is 0-indexed, so add 1
+                        print(f"   ✓ Total MFT entries: {mft_info['total_entries']:,} (range 0-{max_entry})")
+                except Exception as e:
+                    print(f"   ✗ Error parsing MFT range: {line.strip()} - {e}")
+
+        # Use fsstat to get MFT information (assumes script runs with sudo)
+        print(f"🔍 Running: fsstat -f ntfs {raw_device}")
+        fsstat_result = StreamingCommand(
+            ['fsstat', '-f', 'ntfs', raw_device],
+            line_callback=parse_fsstat_line,
+            cancel_check=cancel_check,
+            soft_timeout=15,
+            hard_timeout=30
+        ).run()
+
+        if fsstat_result.ok:
+            if 'total_entries' not in mft_info or mft_info['total_entries'] == 0:
+                print(f"⚠️ fsstat did not provide total_entries. Full output:\n{fsstat_result.stdout}")
+            return mft_info
+        elif fsstat_result.status == 'timeout':
+            print("⏱️ fsstat timed out")
+        elif fsstat_result.status == 'cancelled':
+            print("🛑 fsstat cancelled")
+        elif fsstat_result.status == 'not_found':
+            print("❌ fsstat not installed (Sleuth Kit)")
+        else:
+            print(f"❌ fsstat failed with code {fsstat_result.returncode}: {fsstat_result.stderr}")
+        return {}
+
+    def _get_raw_device(self, mount_point):
+        """Find the block device backing a mount point"""
         try:
-            # Try to get device path from mount point
-            result = subprocess.run(['df', device_path], capture_output=True, text=True)
-            if result.returncode == 0:
+            result = StreamingCommand(['df', mount_point], hard_timeout=10).run()
+            if result.ok:
                 lines = result.stdout.strip().split('\n')
                 if len(lines) >= 2:
                     device_line = lines[1].split()
-                    if len(device_line) >= 1:
-                        raw_device = device_line[0]
-                        print(f"📍 Found device: {raw_device}")
-
-                        # Use fsstat to get MFT information (assumes script runs with sudo)
-                        try:
-                            print(f"🔍 Running: fsstat -f ntfs {raw_device}")
-                            fsstat_result = subprocess.run(
-                                ['fsstat', '-f', 'ntfs', raw_device],
-                                capture_output=True, text=True, timeout=30
-                            )
-
-                            if fsstat_result.returncode == 0:
-                                # Parse fsstat output for MFT info
-                                mft_info = {}
-                                print(f"📊 fsstat output (first 2000 chars):\n{fsstat_result.stdout[:2000]}")
-
-                                for line in fsstat_result.stdout.split('\n'):
-                                    if 'Size of MFT Entries' in line:
-                                        try:
-                                            # Parse "Size of MFT Entries: 1024 bytes"
-                                            size_str = line.split(':')[1].strip().split()[0]
-                                            mft_info['entry_size'] = int(size_str)
-                                            print(f"   ✓ MFT Entry size: {mft_info['entry_size']} bytes")
-                                        except Exception as e:
-                                            print(f"   ✗ Error parsing entry size: {e}")
-                                    elif line.strip().startswith('Range:') and 'Total' not in line:
-                                        try:
-                                            # Parse "Range: 0 - 453444" to get total MFT entries
-                                            # Only matches "Range:" lines, NOT "Total Cluster Range" or "Total Sector Range"
-                                            parts = line.split('-')
-                                            if len(parts) >= 2:
-                                                max_entry = int(parts[-1].strip())
-                                                mft_info['total_entries'] = max_entry + 1  # Range is 0-indexed, so add 1
-                                                print(f"   ✓ Total MFT entries: {mft_info['total_entries']:,} (range 0-{max_entry})")
-                                        except Exception as e:
-                                            print(f"   ✗ Error parsing MFT range: {line} - {e}")
-
-                                if 'total_entries' not in mft_info or mft_info['total_entries'] == 0:
-                                    print(f"⚠️ fsstat did not provide total_entries. Full output:\n{fsstat_result.stdout}")
-
-                                return mft_info
-                            else:
-                                print(f"❌ fsstat failed with code {fsstat_result.returncode}: {fsstat_result.stderr}")
-                        except subprocess.TimeoutExpired:
-                            print("⏱️ fsstat timed out")
-                        except Exception as e:
-                            print(f"❌ fsstat error: {e}")
+                    if len(device_line) >= 1 and device_line[0].startswith('/dev/'):
+                        return device_line[0]
         except Exception as e:
-            print(f"❌ Sleuth Kit detection error: {e}")
-        return {}
+            print(f"⚠️ Cannot resolve device for {mount_point}: {e}")
+        return None
+
+    def _get_native_mft_info(self, mount_point, cancel_check=None):
+        """Count free and deleted MFT records by parsing $MFT and its $BITMAP in-process"""
+        raw_device = self._get_raw_device(mount_point)
+        if not raw_device:
+            return None
+
+        def report_progress(done, total, deleted):
+            if self.mft_scan_progress_dialog:
+                percent = done / total * 100 if total > 0 else 0
+                self.mft_scan_progress_dialog.update_progress(
+                    f"<b>Reading $MFT: {percent:.0f}%</b>\n<i>{deleted:,} deleted records so far</i>")
+
+        try:
+            print(f"📊 Reading $MFT directly from {raw_device}...")
+            scan_start = time.time()
+            with NTFSVolumeReader(raw_device) as reader:
+                print(f"   Record size: {reader.record_size} bytes, cluster size: {reader.cluster_size} bytes")
+                print(f"   $MFT records: {reader.total_records:,}")
+                counts = reader.scan_mft(cancel_check=cancel_check, progress_callback=report_progress)
+                record_size = reader.record_size
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Native $MFT scan unavailable ({e}) - falling back to Sleuth Kit")
+            return None
+
+        if counts['cancelled']:
+            print("🛑 Native $MFT scan cancelled")
+            return None
+
+        scan_time = time.time() - scan_start
+        mft_bytes = counts['total_records'] * record_size
+        rate = mft_bytes / scan_time / (1024 * 1024) if scan_time > 0 else 0
+        print(f"✅ Native $MFT scan finished in {scan_time:.1f}s ({rate:.0f} MB/sec)")
+        print(f"   In use: {counts['in_use_records']:,}  Free: {counts['free_records']:,}  "
+              f"Deleted (not reused): {counts['deleted_records']:,}")
+
+        return {
+            'method': 'native_mft',
+            'total_entries': counts['total_records'],
+            'entry_size': record_size,
+            'allocated_entries': counts['in_use_records'],
+            'used_entries': counts['deleted_records'],  # Deleted entries = cleanup targets
+            'unused_records': counts['free_records']
+        }
+
+    def _count_mft_entries_with_fls(self, mft_info, device_path, cancel_check=None):
+        """Count free MFT entries with fls -d -r, streaming its output with live counts"""
+        raw_device = self._get_raw_device(device_path)
+        if not raw_device:
+            return
 
-    def _get_enhanced_mft_info(self, device_path):
+        # Update progress dialog
+        if self.mft_scan_progress_dialog:
+            self.mft_scan_progress_dialog.update_progress("<b>Scanning file entries...</b>\n<i>This may take several minutes...</i>")
+
+        print(f"📊 Scanning FREE MFT entries on {raw_device}... (soft timeout: 2 minutes, hard: 15 minutes)")
+        print(f"   Using: fls -f ntfs -d -r (finds unallocated/free MFT entries only)")
+
+        # Use -d flag to find ONLY deleted/free MFT entries
+        # These are entries with IN_USE flag CLEARED but still contain deleted file metadata
+        # This is what needs to be wiped to remove traces of deleted files
+        counter = {'entries': 0, 'last_update': 0}
+
+        def count_line(line):
+            if line.strip():
+                counter['entries'] += 1
+            now = time.time()
+            if now - counter['last_update'] >= 0.5:
+                counter['last_update'] = now
+                if self.mft_scan_progress_dialog:
+                    self.mft_scan_progress_dialog.update_progress(
+                        f"<b>{counter['entries']:,} deleted entries so far</b>\n<i>Scanning file entries...</i>")
+
+        def report_slow_scan(elapsed):
+            if self.mft_scan_progress_dialog:
+                self.mft_scan_progress_dialog.update_progress(
+                    f"<b>{counter['entries']:,} deleted entries so far</b>\n<i>Very large drive - still scanning...</i>")
+
+        fls_result = StreamingCommand(
+            ['fls', '-f', 'ntfs', '-d', '-r', raw_device],
+            line_callback=count_line,
+            cancel_check=cancel_check,
+            soft_timeout=120,
+            hard_timeout=900,
+            soft_timeout_callback=report_slow_scan,
+            collect_output=False
+        ).run()
+
+        if fls_result.ok:
+            # Free MFT entries = targets for wiping
+            free_mft_entries = counter['entries']
+            mft_info['used_entries'] = free_mft_entries
+            mft_info['method'] = 'fls_analysis'
+
+            print(f"📊 Free MFT Entries Found (IN_USE flag cleared):")
+            print(f"   Free/reusable entries: {free_mft_entries:,}")
+            print(f"   These entries still contain deleted file metadata that should be wiped")
+
+            # Update progress
+            if self.mft_scan_progress_dialog:
+                self.mft_scan_progress_dialog.update_progress(f"<b>Found {free_mft_entries:,} free MFT entries</b>\n<i>Finalizing...</i>")
+        elif fls_result.status == 'timeout':
+            print("⚠️ fls timed out after 15 minutes - skipping used entry detection")
+            print("   This usually happens with very large or slow drives (external/USB)")
+            if self.mft_scan_progress_dialog:
+                self.mft_scan_progress_dialog.update_progress("<b>⚠️ Scan timed out (15 min)</b>\n<i>Very large drive detected</i>")
+        elif fls_result.status == 'cancelled':
+            print(f"🛑 fls cancelled after {counter['entries']:,} entries")
+        else:
+            print(f"fls failed: {fls_result.stderr}")
+            if self.mft_scan_progress_dialog:
+                self.mft_scan_progress_dialog.update_progress("<b>fls command failed</b>")
+
+    def _get_enhanced_mft_info(self, device_path, cancel_check=None):
         """Get comprehensive MFT information including free entries"""
         mft_info = {
+            'method': 'unknown',
             'total_entries': 0,
             'used_entries': 0,  # This is now "deleted_entries"
             'allocated_entries': 0,  # Active files in MFT
@@ -1481,74 +4691,20 @@ class FreeSpaceWipeWindow(Gtk.Window):
             'fragmentation_level': 'Unknown'
         }
         
-        # 1. Get basic MFT info (existing method)
-        basic_info = self._get_mft_info_sleuthkit(device_path)
-        if basic_info and 'total_entries' in basic_info:
-            mft_info['total_entries'] = basic_info['total_entries']
-            mft_info['entry_size'] = basic_info.get('entry_size', 1024)
-        
-        # 2. Count used entries via fls (file listing)
-        try:
-            # Try to get device path from mount point
-            result = subprocess.run(['df', device_path], capture_output=True, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                if len(lines) >= 2:
-                    device_line = lines[1].split()
-                    if len(device_line) >= 1:
-                        raw_device = device_line[0]
-                        
-                        # Use fls to count used MFT entries (assumes script runs with sudo)
-                        # INCREASED TIMEOUT: 30s → 120s (2 min) for large/external drives
-                        try:
-                            # Update progress dialog
-                            if self.mft_scan_progress_dialog:
-                                self.mft_scan_progress_dialog.update_progress("<b>Scanning file entries...</b>\n<i>This may take several minutes...</i>")
-
-                            print(f"📊 Scanning FREE MFT entries on {raw_device}... (timeout: 2 minutes)")
-                            print(f"   Using: fls -f ntfs -d -r (finds unallocated/free MFT entries only)")
-
-                            # Use -d flag to find ONLY deleted/free MFT entries
-                            # These are entries with IN_USE flag CLEARED but still contain deleted file metadata
-                            # This is what needs to be wiped to remove traces of deleted files
-                            fls_result = subprocess.run(
-                                ['fls', '-f', 'ntfs', '-d', '-r', raw_device],
-                                capture_output=True, text=True, timeout=120
-                            )
-                            if fls_result.returncode == 0:
-                                # Count free MFT entries
-                                free_mft_entries = 0
-
-                                for line in fls_result.stdout.split('\n'):
-                                    if line.strip():
-                                        free_mft_entries += 1
-
-                                # Free MFT entries = targets for wiping
-                                mft_info['used_entries'] = free_mft_entries
-
-                                print(f"📊 Free MFT Entries Found (IN_USE flag cleared):")
-                                print(f"   Free/reusable entries: {free_mft_entries:,}")
-                                print(f"   These entries still contain deleted file metadata that should be wiped")
-
-                                # Update progress
-                                if self.mft_scan_progress_dialog:
-                                    self.mft_scan_progress_dialog.update_progress(f"<b>Found {free_mft_entries:,} free MFT entries</b>\n<i>Finalizing...</i>")
-                            else:
-                                print(f"fls failed: {fls_result.stderr}")
-                                if self.mft_scan_progress_dialog:
-                                    self.mft_scan_progress_dialog.update_progress("<b>fls command failed</b>")
-                        except subprocess.TimeoutExpired:
-                            print("⚠️ fls timed out after 2 minutes - skipping used entry detection")
-                            print("   This usually happens with very large or slow drives (external/USB)")
-                            if self.mft_scan_progress_dialog:
-                                self.mft_scan_progress_dialog.update_progress("<b>⚠️ Scan timed out (2 min)</b>\n<i>Very large drive detected</i>")
-                        except Exception as e:
-                            print(f"fls error: {e}")
-                            if self.mft_scan_progress_dialog:
-                                self.mft_scan_progress_dialog.update_progress(f"<b>Error during scan:</b> {str(e)[:50]}")
-        except Exception as e:
-            print(f"Enhanced MFT detection error: {e}")
-        
+        # 1. Read $MFT and its $BITMAP directly (exact counts, streams at sequential-read speed)
+        native_info = self._get_native_mft_info(device_path, cancel_check)
+        if native_info:
+            mft_info.update(native_info)
+        else:
+            # 2. Fall back to Sleuth Kit: basic MFT info from fsstat
+            basic_info = self._get_mft_info_sleuthkit(device_path, cancel_check)
+            if basic_info and 'total_entries' in basic_info:
+                mft_info['total_entries'] = basic_info['total_entries']
+                mft_info['entry_size'] = basic_info.get('entry_size', 1024)
+
+            # Count used entries via fls (file listing), streamed so progress is live
+            self._count_mft_entries_with_fls(mft_info, device_path, cancel_check)
+
         # 3. Calculate percentages and meaningful "free_entries" for cleaning
         if mft_info['total_entries'] > 0:
             # With fls -d approach:
@@ -1558,7 +4714,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
             mft_info['free_entries'] = free_mft_entries  # The entries that need wiping
 
             # Calculate percentages
-            if free_mft_entries > 0:
+            if free_mft_entries > 0 or mft_info['method'] == 'native_mft':
                 mft_info['used_percentage'] = (free_mft_entries / mft_info['total_entries']) * 100
             else:
                 # Estimate if fls failed
@@ -1663,7 +4819,12 @@ class FreeSpaceWipeWindow(Gtk.Window):
         
         try:
             # Get enhanced MFT info including free entries
-            enhanced_mft_info = self._get_enhanced_mft_info(mount_point)
+            # Reuse the scan from this session or a previous one unless the volume has changed
+            enhanced_mft_info = self.mft_scan_cache.get(mount_point) or self._lookup_persistent_scan(drive_info)
+            if not enhanced_mft_info:
+                enhanced_mft_info = self._get_enhanced_mft_info(mount_point, cancel_check=lambda: self.cancelled)
+                if enhanced_mft_info and not self.cancelled:
+                    self._store_persistent_scan(drive_info, enhanced_mft_info)
             target_files = None
 
             # FIRST CHOICE: Use enhanced MFT analysis with free entry detection
@@ -1682,6 +4843,13 @@ class FreeSpaceWipeWindow(Gtk.Window):
                 print(f"   Target to clean: {target_files:,} files (95% × {free_entries:,})")
                 print(f"   Drive type: {drive_type}")
 
+            # An exact native scan that found no stale records leaves nothing to overwrite
+            elif enhanced_mft_info and enhanced_mft_info.get('method') == 'native_mft':
+                print(f"✅ Native $MFT scan found no stale records among {enhanced_mft_info['total_entries']:,} "
+                      f"entries - skipping the pressure pass")
+                self._cleanup_mft_files(temp_dir, [])
+                return True
+
             # FALLBACK: Use basic MFT info if enhanced detection fails
             elif enhanced_mft_info and enhanced_mft_info['total_entries'] > 0:
                 # Fallback to original method but with reduced limits
@@ -1717,6 +4885,11 @@ class FreeSpaceWipeWindow(Gtk.Window):
             print(f"Phase 1: Creating {target_files:,} files...")
             
             files_created = []
+            # Spread files over shard subdirectories so no single $I30 index grows huge
+            shard_dirs = self._create_pressure_shards(temp_dir, target_files, 'NTFS')
+            rate_samples = []
+            window_start_time = time.time()
+            window_start_count = 0
             phase1_start = time.time()
             mft_entry_size = enhanced_mft_info.get('entry_size', 1024) if enhanced_mft_info else 1024  # Default 1KB
             last_update_time = phase1_start
@@ -1758,7 +4931,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
                 
                 # Create filename that maximizes MFT usage
                 filename = f"ZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZ_MFT_CLEAN_PRO_{i:08d}_MAXIMUM_MFT_ENTRY_USAGE_FOR_BIG_DRIVES.ZZZ"
-                filepath = os.path.join(temp_dir, filename)
+                filepath = os.path.join(shard_dirs[i % len(shard_dirs)], filename)
                 
                 try:
                     # CCLEANER-STYLE RATE LIMITING: Much slower for all external drives
@@ -1780,6 +4953,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
                     with open(filepath, 'w') as f:
                         f.write(content)
                     files_created.append(filepath)
+                    self.rate_limiter.consume(len(content) + self.METADATA_FILE_COST, lambda: not self.cancelled)
                     
                     # Progress update every 10k files with speed and time monitoring
                     if i % 10000 == 0 and i > 0:
@@ -1803,8 +4977,17 @@ class FreeSpaceWipeWindow(Gtk.Window):
                         else:
                             time_str = f"{secs}s"
                         
+                        # Record the create rate of this 10k window to check it stays flat
+                        # Files that failed to create do not count towards the window
+                        window_time = time.time() - window_start_time
+                        window_files = len(files_created) - window_start_count
+                        window_rate = window_files / window_time if window_time > 0 else 0
+                        rate_samples.append((len(files_created), window_rate))
+                        window_start_time = time.time()
+                        window_start_count = len(files_created)
+                        
                         # Console output (for debugging)
-                        print(f"PRO Created {i:,} files... ({rate:.0f} files/sec)")
+                        print(f"PRO Created {i:,} files... ({rate:.0f} files/sec, last window at {window_rate:.0f} files/sec)")
                         
                         # UI Progress Bar Update - NOW INCLUDES FILES/SEC AND TIME!
                         progress = i / target_files
@@ -1834,6 +5017,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
             
             phase1_time = time.time() - phase1_start
             print(f"✅ Phase 1 completed: {len(files_created):,} files created in {phase1_time:.1f} seconds")
+            log_pressure_rate_curve("MFT Phase 1", rate_samples)
             
         except Exception as e:
             print(f"MFT cleaning error: {e}")
@@ -1895,6 +5079,27 @@ class FreeSpaceWipeWindow(Gtk.Window):
         dialog.run()
         dialog.destroy()
     
+    def _create_pressure_shards(self, temp_dir, target_files, fstype):
+        """Create shard subdirectories for metadata pressure files and return their paths"""
+        shard_count = choose_pressure_shard_count(target_files, fstype, self.pressure_shard_fanout)
+        shard_dirs = []
+        for shard in range(shard_count):
+            shard_dir = os.path.join(temp_dir, f"{shard:02x}")
+            try:
+                os.makedirs(shard_dir, exist_ok=True)
+                shard_dirs.append(shard_dir)
+            except OSError as e:
+                print(f"⚠️ Cannot create shard directory {shard_dir}: {e}")
+                break
+
+        if not shard_dirs:
+            # Fall back to the single flat directory
+            shard_dirs = [temp_dir]
+
+        print(f"📂 Spreading {target_files:,} files over {len(shard_dirs)} shard directories "
+              f"(~{target_files // len(shard_dirs):,} files each)")
+        return shard_dirs
+
     def _create_mft_file_with_usb_limiting(self, i, filepath, mft_entry_size, drive_info):
         """Create individual MFT file with rate limiting for external drives"""
         try:
@@ -1924,6 +5129,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
             
             with open(filepath, 'w') as f:
                 f.write(content)
+            self.rate_limiter.consume(len(content) + self.METADATA_FILE_COST, lambda: not self.cancelled)
             
             # DEBUG: Verify file was actually written
             if os.path.exists(filepath):
@@ -1979,6 +5185,10 @@ class FreeSpaceWipeWindow(Gtk.Window):
                             if os.path.isfile(file_path):
                                 os.remove(file_path)
                                 files_removed += 1
+                            elif os.path.isdir(file_path):
+                                # Shard subdirectory - remove it with whatever is left inside
+                                files_removed += len(os.listdir(file_path))
+                                shutil.rmtree(file_path)
                         except Exception as e:
                             print(f"⚠️ Error removing remaining file {filename}: {e}")
                 
@@ -2021,6 +5231,10 @@ class FreeSpaceWipeWindow(Gtk.Window):
                             if os.path.isfile(file_path):
                                 os.remove(file_path)
                                 files_removed += 1
+                            elif os.path.isdir(file_path):
+                                # Shard subdirectory - remove it with whatever is left inside
+                                files_removed += len(os.listdir(file_path))
+                                shutil.rmtree(file_path)
                         except Exception as e:
                             print(f"⚠️ Error removing remaining file {filename}: {e}")
                 
@@ -2035,7 +5249,46 @@ class FreeSpaceWipeWindow(Gtk.Window):
         
         print(f"✅ exFAT cleanup completed - total files removed: {files_removed:,}")
 
-    def _get_enhanced_exfat_info(self, device_path):
+    def _get_native_exfat_info(self, mount_point, cancel_check=None):
+        """Count deleted exFAT directory entries by walking the directory clusters in-process"""
+        raw_device = self._get_raw_device(mount_point)
+        if not raw_device:
+            return None
+
+        def report_progress(directories, bytes_read, deleted):
+            if self.exfat_scan_progress_dialog:
+                self.exfat_scan_progress_dialog.update_progress(
+                    f"<b>Scanned {directories:,} directories ({bytes_read / (1024 * 1024):.0f} MB)</b>\n"
+                    f"<i>{deleted:,} deleted entries so far</i>")
+
+        try:
+            print(f"📊 Reading exFAT directory tree directly from {raw_device}...")
+            scan_start = time.time()
+            with ExfatVolumeReader(raw_device) as reader:
+                print(f"   Cluster size: {reader.cluster_size} bytes, clusters: {reader.cluster_count:,}")
+                counts = reader.scan_directories(cancel_check=cancel_check, progress_callback=report_progress)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Native exFAT scan unavailable ({e}) - falling back to Sleuth Kit")
+            return None
+
+        if counts['cancelled']:
+            print("🛑 Native exFAT scan cancelled")
+            return None
+
+        scan_time = time.time() - scan_start
+        rate = counts['bytes_read'] / scan_time / (1024 * 1024) if scan_time > 0 else 0
+        print(f"✅ Native exFAT scan finished in {scan_time:.1f}s ({rate:.0f} MB/sec)")
+        print(f"   Directories: {counts['directories']:,}  Entries: {counts['total_entries']:,}  "
+              f"Deleted entries: {counts['deleted_entries']:,} ({counts['deleted_files']:,} files)")
+
+        return {
+            'method': 'native_exfat',
+            'total_entries': counts['total_entries'],
+            'deleted_entries': counts['deleted_entries'],
+            'deleted_files': counts['deleted_files']
+        }
+
+    def _get_enhanced_exfat_info(self, device_path, cancel_check=None):
         """Get comprehensive exFAT directory information including deleted entries"""
         exfat_info = {
             'total_entries': 0,
@@ -2045,46 +5298,56 @@ class FreeSpaceWipeWindow(Gtk.Window):
             'method': 'unknown'
         }
 
-        # Get device path from mount point
-        try:
-            result = subprocess.run(['df', device_path], capture_output=True, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                if len(lines) >= 2:
-                    device_line = lines[1].split()
-                    if len(device_line) >= 1:
-                        raw_device = device_line[0]
-
-                        # Use fls to count deleted exFAT directory entries
-                        try:
-                            print(f"📊 Scanning FREE exFAT directory entries on {raw_device}...")
-                            print(f"   Using: fls -f exfat -d -r (finds unallocated/free directory entries only)")
-
-                            # Use -d flag to find ONLY deleted/free directory entries
-                            # No timeout - let it run until complete (can take time on large drives)
-                            fls_result = subprocess.run(
-                                ['fls', '-f', 'exfat', '-d', '-r', raw_device],
-                                capture_output=True, text=True, timeout=None
-                            )
-                            if fls_result.returncode == 0:
-                                # Count free directory entries
-                                deleted_entries = 0
-                                for line in fls_result.stdout.split('\n'):
-                                    if line.strip():
-                                        deleted_entries += 1
-
-                                exfat_info['deleted_entries'] = deleted_entries
-                                exfat_info['method'] = 'fls_analysis'
-
-                                print(f"✅ Free exFAT Directory Entries Found (IN_USE flag cleared):")
-                                print(f"   Free/reusable entries: {deleted_entries:,}")
-                                print(f"   These entries still contain deleted file metadata that should be wiped")
-                            else:
-                                print(f"⚠️ fls failed: {fls_result.stderr}")
-                        except Exception as e:
-                            print(f"⚠️ fls error: {e}")
-        except Exception as e:
-            print(f"⚠️ Enhanced exFAT detection error: {e}")
+        # Walk the directory clusters directly first (exact counts, sequential-read speed)
+        native_info = self._get_native_exfat_info(device_path, cancel_check)
+        if native_info:
+            exfat_info.update(native_info)
+            total = exfat_info['total_entries']
+            exfat_info['deleted_percentage'] = exfat_info['deleted_entries'] / total * 100 if total > 0 else 0
+            return exfat_info
+
+        # Fall back to Sleuth Kit, streamed so the scan thread can be cancelled
+        raw_device = self._get_raw_device(device_path)
+        if raw_device:
+            print(f"📊 Scanning FREE exFAT directory entries on {raw_device}...")
+            print(f"   Using: fls -f exfat -d -r (finds unallocated/free directory entries only)")
+
+            # Use -d flag to find ONLY deleted/free directory entries
+            counter = {'entries': 0, 'last_update': 0}
+
+            def count_line(line):
+                if line.strip():
+                    counter['entries'] += 1
+                now = time.time()
+                if now - counter['last_update'] >= 0.5:
+                    counter['last_update'] = now
+                    if self.exfat_scan_progress_dialog:
+                        self.exfat_scan_progress_dialog.update_progress(
+                            f"<b>{counter['entries']:,} deleted entries so far</b>\n<i>Scanning exFAT directory entries...</i>")
+
+            fls_result = StreamingCommand(
+                ['fls', '-f', 'exfat', '-d', '-r', raw_device],
+                line_callback=count_line,
+                cancel_check=cancel_check,
+                soft_timeout=120,
+                hard_timeout=1800,
+                collect_output=False
+            ).run()
+
+            if fls_result.ok:
+                deleted_entries = counter['entries']
+                exfat_info['deleted_entries'] = deleted_entries
+                exfat_info['method'] = 'fls_analysis'
+
+                print(f"✅ Free exFAT Directory Entries Found (IN_USE flag cleared):")
+                print(f"   Free/reusable entries: {deleted_entries:,}")
+                print(f"   These entries still contain deleted file metadata that should be wiped")
+            elif fls_result.status == 'timeout':
+                print("⚠️ fls timed out after 30 minutes")
+            elif fls_result.status == 'cancelled':
+                print(f"🛑 fls cancelled after {counter['entries']:,} entries")
+            else:
+                print(f"⚠️ fls failed: {fls_result.stderr}")
 
         # FALLBACK: Use drive-size based estimation if fls analysis unavailable
         if exfat_info['deleted_entries'] == 0:
@@ -2190,13 +5453,14 @@ class FreeSpaceWipeWindow(Gtk.Window):
 
         try:
             # Get enhanced exFAT directory analysis from cache (user should have already scanned)
-            enhanced_exfat_info = self.exfat_scan_cache.get(mount_point)
+            enhanced_exfat_info = self.exfat_scan_cache.get(mount_point) or self._lookup_persistent_scan(drive_info)
             target_files_phase1 = None
             target_files_phase3 = None
 
             # FIRST CHOICE: Use cached exFAT analysis with deleted entry detection
             if enhanced_exfat_info and enhanced_exfat_info['deleted_entries'] > 0:
-                deleted_entries = enhanced_exfat_info['deleted_entries']
+                # Native scans count every 32-byte entry; one pressure file replaces a whole entry set
+                deleted_entries = enhanced_exfat_info.get('deleted_files') or enhanced_exfat_info['deleted_entries']
 
                 # Target: wipe 95% of deleted directory entries, similar to MFT approach
                 target_percentage = 0.95
@@ -2218,6 +5482,12 @@ class FreeSpaceWipeWindow(Gtk.Window):
             GLib.idle_add(self._update_info_label, f"exFAT Cleaning: Creating {target_files_phase1:,} metadata files...")
 
             files_created = []
+            final_files = []
+            # Spread entries over shard subdirectories so no directory stream grows huge
+            shard_dirs = self._create_pressure_shards(temp_dir, target_files_phase1, 'EXFAT')
+            rate_samples = []
+            window_start_time = time.time()
+            window_start_count = 0
             phase1_start = time.time()
 
             # Rate limiter: 100 files/sec (10ms per file)
@@ -2234,13 +5504,14 @@ class FreeSpaceWipeWindow(Gtk.Window):
 
                 # Use longer names to consume more directory entry space
                 filename = f"ZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZ_EXFAT_DIR_{i:06d}_LONGNAME.ZZZ"
-                filepath = os.path.join(temp_dir, filename)
+                filepath = os.path.join(shard_dirs[i % len(shard_dirs)], filename)
 
                 try:
                     # Create with random content to allocate clusters (binary mode for urandom)
                     with open(filepath, 'wb') as f:
                         f.write(os.urandom(500))  # 500 random bytes - enough to allocate a cluster
                     files_created.append(filepath)
+                    self.rate_limiter.consume(500 + self.METADATA_FILE_COST, lambda: not self.cancelled)
 
                     # CCLEANER-STYLE RATE LIMITING: Slower for external drives (similar to MFT)
                     device_name = drive_info.get('name', 'unknown')
@@ -2263,6 +5534,14 @@ class FreeSpaceWipeWindow(Gtk.Window):
                                 break
                             time.sleep(0.001)  # Check every 1ms for cancellation
 
+                    # Record the create rate of this 500-file window to check it stays flat
+                    if i % 500 == 0 and i > 0:
+                        window_time = time.time() - window_start_time
+                        window_files = len(files_created) - window_start_count
+                        rate_samples.append((len(files_created), window_files / window_time if window_time > 0 else 0))
+                        window_start_time = time.time()
+                        window_start_count = len(files_created)
+
                     # Update progress with percentage and time estimate (every 500 files)
                     if i % 500 == 0:
                         progress = i / target_files_phase1 if target_files_phase1 > 0 else 0
@@ -2298,6 +5577,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
             
             phase1_time = time.time() - phase1_start
             print(f"exFAT Phase 1 completed: {len(files_created)} entries in {phase1_time:.1f} seconds")
+            log_pressure_rate_curve("exFAT Phase 1", rate_samples)
 
             # Check if user cancelled - skip to cleanup if so
             if self.cancelled:
@@ -2330,7 +5610,6 @@ class FreeSpaceWipeWindow(Gtk.Window):
                     GLib.idle_add(self._update_info_label, f"exFAT Cleaning: Final directory overwrite ({target_files_phase3:,} entries)...")
                     print(f"exFAT Phase 3: Creating {target_files_phase3:,} final directory entries...")
 
-                    final_files = []
                     for i in range(target_files_phase3):
                         # Check for cancellation
                         if self.cancelled:
@@ -2340,13 +5619,14 @@ class FreeSpaceWipeWindow(Gtk.Window):
                         file_start_time = time.time()
 
                         filename = f"ZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZZ_EXFAT_FINAL_{i:05d}.ZZZ"
-                        filepath = os.path.join(temp_dir, filename)
+                        filepath = os.path.join(shard_dirs[i % len(shard_dirs)], filename)
 
                         try:
                             # Create with random content for final overwrite (binary mode)
                             with open(filepath, 'wb') as f:
                                 f.write(os.urandom(250))  # 250 random bytes for final overwrite
                             final_files.append(filepath)
+                            self.rate_limiter.consume(250 + self.METADATA_FILE_COST, lambda: not self.cancelled)
 
                             # CCLEANER-STYLE RATE LIMITING: Slower for external drives
                             if is_external:
@@ -2376,7 +5656,6 @@ class FreeSpaceWipeWindow(Gtk.Window):
                 else:
                     print("🛑 User cancelled during Phase 2 - skipping to cleanup")
                     phase3_time = 0
-                    final_files = []
             
             # Phase 4: Clean up
             cleanup_start = time.time()
@@ -2411,6 +5690,651 @@ class FreeSpaceWipeWindow(Gtk.Window):
             self._cleanup_exfat_files(temp_dir, all_files)
             return False
     
+    def _get_mount_entry(self, mount_point):
+        """Device, filesystem type and options of a mount point from /proc/self/mounts"""
+        try:
+            with open('/proc/self/mounts', 'r') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 4:
+                        # Mount points with spaces are octal-escaped
+                        path = fields[1].replace('\\040', ' ')
+                        if path == mount_point:
+                            return {'device': fields[0], 'fstype': fields[2], 'options': fields[3]}
+        except OSError:
+            pass
+        return None
+
+    def _unmount_volume(self, mount_point):
+        """Flush and unmount a volume for offline work, returning its mount entry or None"""
+        mount_entry = self._get_mount_entry(mount_point)
+        if not mount_entry:
+            print(f"❌ {mount_point} is not mounted")
+            return None
+
+        os.sync()
+        print(f"⏏️ Unmounting {mount_point} ({mount_entry['device']})...")
+        result = StreamingCommand(['umount', mount_point], hard_timeout=60).run()
+        if not result.ok:
+            print(f"❌ Cannot unmount {mount_point}: {result.stderr.strip()}")
+            return None
+        return mount_entry
+
+    def _remount_volume(self, mount_point, mount_entry):
+        """Mount a volume again after offline work, with its original options when possible"""
+        os.makedirs(mount_point, exist_ok=True)
+        device = mount_entry['device']
+        attempts = []
+        if mount_entry['fstype'] != 'fuseblk':
+            attempts.append(['mount', '-t', mount_entry['fstype'], '-o', mount_entry['options'], device, mount_point])
+        attempts.append(['mount', device, mount_point])
+
+        for args in attempts:
+            result = StreamingCommand(args, hard_timeout=60).run()
+            if result.ok:
+                print(f"✅ Remounted {device} on {mount_point}")
+                return True
+            print(f"⚠️ {' '.join(args[:3])}... failed: {result.stderr.strip()}")
+        print(f"❌ Could not remount {device} - mount it again manually")
+        return False
+
+    def _offline_metadata_scrub(self, drive_info):
+        """Unmount the volume and scrub stale metadata straight on the block device"""
+        mount_point = drive_info['mount_point']
+        fstype = drive_info.get('fstype', '').upper()
+        raw_device = self._get_raw_device(mount_point)
+        summary = "Offline metadata scrub failed"
+
+        if 'NTFS' not in fstype and 'EXFAT' not in fstype:
+            GLib.idle_add(self._operation_complete, "Offline metadata scrub supports NTFS and exFAT only")
+            return
+        if not raw_device:
+            GLib.idle_add(self._operation_complete, "Offline scrub: cannot find the drive's device")
+            return
+
+        GLib.idle_add(self._update_info_label, f"Unmounting {mount_point}...")
+        mount_entry = self._unmount_volume(mount_point)
+        if not mount_entry:
+            GLib.idle_add(self._operation_complete, f"Cannot unmount {mount_point} - is it in use?")
+            return
+
+        try:
+            if 'NTFS' in fstype:
+                summary = self._scrub_ntfs_offline(raw_device)
+            else:
+                summary = self._scrub_exfat_offline(raw_device)
+        except OSError as e:
+            print(f"❌ Offline scrub error: {e}")
+            summary = f"Offline metadata scrub failed: {e.strerror or e}"
+        finally:
+            GLib.idle_add(self._update_info_label, f"Mounting {mount_point} again...")
+            if not self._remount_volume(mount_point, mount_entry):
+                summary += f" - remount {raw_device} manually"
+            self._invalidate_persistent_scan(drive_info)
+            GLib.idle_add(self._operation_complete, summary)
+
+    def _scrub_ntfs_offline(self, raw_device):
+        """Overwrite stale attributes of every free $MFT record on an unmounted NTFS device"""
+        start_time = time.time()
+
+        def report_progress(done, total, scrubbed):
+            elapsed = time.time() - start_time
+            rate = done / elapsed if elapsed > 0 else 0
+            GLib.idle_add(self.progress_bar.set_fraction, done / total if total > 0 else 0)
+            GLib.idle_add(self._update_info_label,
+                          f"Offline MFT scrub: {scrubbed:,} records scrubbed ({rate:,.0f} records/sec)")
+
+        print(f"🧽 Offline MFT scrub on {raw_device}...")
+        with NTFSVolumeReader(raw_device, writable=True) as reader:
+            stats = reader.scrub_free_records(cancel_check=lambda: self.cancelled,
+                                              progress_callback=report_progress)
+
+        elapsed = time.time() - start_time
+        print(f"✅ Offline MFT scrub: {stats['scrubbed_records']:,} of {stats['total_records']:,} records "
+              f"scrubbed, {stats['bytes_written'] / (1024 * 1024):.1f} MB written in {elapsed:.1f}s")
+        if stats['cancelled']:
+            return f"MFT scrub cancelled after {stats['scrubbed_records']:,} records"
+        return f"MFT scrub done: {stats['scrubbed_records']:,} stale records cleared in {elapsed:.0f}s"
+
+    def _scrub_exfat_offline(self, raw_device):
+        """Zero the name and stream-extension payloads of deleted entries on an unmounted exFAT device"""
+        start_time = time.time()
+
+        def report_progress(directories, scrubbed):
+            GLib.idle_add(self.progress_bar.pulse)
+            GLib.idle_add(self._update_info_label,
+                          f"Offline exFAT scrub: {directories:,} directories, {scrubbed:,} entries zeroed")
+
+        print(f"🧽 Offline exFAT scrub on {raw_device}...")
+        with ExfatVolumeReader(raw_device, writable=True) as reader:
+            stats = reader.scrub_deleted_entries(cancel_check=lambda: self.cancelled,
+                                                 progress_callback=report_progress)
+
+        elapsed = time.time() - start_time
+        print(f"✅ Offline exFAT scrub: {stats['scrubbed_entries']:,} entries in {stats['directories']:,} "
+              f"directories, {stats['bytes_written'] / 1024:.0f} KB written in {elapsed:.1f}s")
+        if stats['cancelled']:
+            return f"exFAT scrub cancelled after {stats['scrubbed_entries']:,} entries"
+        return f"exFAT scrub done: {stats['scrubbed_entries']:,} deleted entries zeroed in {elapsed:.0f}s"
+
+    def _collect_residue_ranges(self, raw_device, fstype):
+        """Byte ranges of deleted files' former clusters that are still free, plus total free bytes"""
+        reader_class = NTFSVolumeReader if 'NTFS' in fstype else ExfatVolumeReader
+        with reader_class(raw_device) as reader:
+            bitmap = reader.read_volume_bitmap()
+            # exFAT numbers clusters from 2, the bitmap from 0
+            unit_shift = 0 if reader_class is NTFSVolumeReader else 2
+            deleted_runs = merge_runs(
+                (first - unit_shift, count)
+                for first, count in reader.iter_deleted_data_runs(cancel_check=lambda: self.cancelled))
+
+        free_runs = []
+        for first, count in deleted_runs:
+            free_runs.extend(bitmap.free_runs(first, count))
+        ranges = bitmap.to_byte_ranges(free_runs)
+        total_free = bitmap.free_unit_count() * bitmap.unit_size
+        print(f"🎯 Deleted-file runs: {len(deleted_runs):,}, still unallocated: {len(free_runs):,} runs "
+              f"({sum(length for _, length in ranges) / (1024**3):.2f} GB of {total_free / (1024**3):.1f} GB free)")
+        return ranges, total_free
+
+    def _targeted_residue_wipe(self, drive_info, method, then_fill=False):
+        """Overwrite only the still-free clusters that deleted NTFS/exFAT files used to occupy"""
+        mount_point = drive_info['mount_point']
+        fstype = drive_info.get('fstype', '').upper()
+        raw_device = self._get_raw_device(mount_point)
+
+        if 'NTFS' not in fstype and 'EXFAT' not in fstype:
+            GLib.idle_add(self._operation_complete, "Targeted mode supports NTFS and exFAT only")
+            return
+        if not raw_device:
+            GLib.idle_add(self._operation_complete, "Targeted mode: cannot find the drive's device")
+            return
+
+        GLib.idle_add(self._update_info_label, f"Unmounting {mount_point}...")
+        mount_entry = self._unmount_volume(mount_point)
+        if not mount_entry:
+            GLib.idle_add(self._operation_complete, f"Cannot unmount {mount_point} - is it in use?")
+            return
+
+        summary = "Targeted overwrite failed"
+        try:
+            GLib.idle_add(self._update_info_label, "Finding deleted files' former clusters...")
+            start_time = time.time()
+            ranges, total_free = self._collect_residue_ranges(raw_device, fstype)
+            targeted_bytes = sum(length for _, length in ranges)
+
+            def report_progress(done, total):
+                elapsed = time.time() - start_time
+                rate = done / elapsed / (1024 * 1024) if elapsed > 0 else 0
+                GLib.idle_add(self.progress_bar.set_fraction, done / total if total > 0 else 1.0)
+                GLib.idle_add(self._update_info_label,
+                              f"Targeted: {done / (1024**3):.2f} of {total / (1024**3):.2f} GB at {rate:.1f} MB/sec")
+
+            writer = RawRangeWriter(raw_device, WipePattern(method, RawRangeWriter.WRITE_SIZE),
+                                    cancel_check=lambda: self.cancelled, progress_callback=report_progress,
+                                    skip_matching=self.check_skip_clean.get_active(),
+                                    rate_limiter=self.rate_limiter)
+            written = writer.write_ranges(ranges) if not self.cancelled else 0
+            elapsed = time.time() - start_time
+
+            percent_of_free = targeted_bytes / total_free * 100 if total_free > 0 else 0
+            summary = (f"Targeted: {written / (1024**3):.2f} GB residue overwritten "
+                       f"({percent_of_free:.2f}% of {total_free / (1024**3):.1f} GB free) in {elapsed:.0f}s")
+            summary += self._skip_summary(writer.bytes_skipped)
+            if writer.cancelled or self.cancelled:
+                summary = f"Targeted overwrite cancelled after {written / (1024**3):.2f} GB"
+            print(f"✅ {summary}")
+        except (OSError, ValueError, struct.error) as e:
+            print(f"❌ Targeted overwrite error: {e}")
+            summary = f"Targeted overwrite failed: {e}"
+        finally:
+            GLib.idle_add(self._update_info_label, f"Mounting {mount_point} again...")
+            remounted = self._remount_volume(mount_point, mount_entry)
+            if not remounted:
+                summary += f" - remount {raw_device} manually"
+
+        if then_fill and remounted and not self.cancelled:
+            # Continue with the regular fill, which resets the UI when it finishes
+            print(f"➡️ {summary} - continuing with free space fill")
+            self._wipe_free_space(drive_info, method)
+        else:
+            GLib.idle_add(self._operation_complete, summary)
+
+    def _open_bitmap_reader(self, raw_device, fstype):
+        """Volume reader that can produce a free-space bitmap for this filesystem, or None"""
+        if 'NTFS' in fstype:
+            return NTFSVolumeReader(raw_device)
+        if 'EXFAT' in fstype:
+            return ExfatVolumeReader(raw_device)
+        if fstype in ('EXT2', 'EXT3', 'EXT4'):
+            return Ext4VolumeReader(raw_device)
+        return None
+
+    def _snapshot_free_space(self, drive_info):
+        """Save the free-space bitmap of a volume whose free space was just wiped"""
+        mount_point = drive_info['mount_point']
+        raw_device = self._get_raw_device(mount_point)
+        volume_key = self._get_volume_identity(mount_point)
+        reader = self._open_bitmap_reader(raw_device, drive_info.get('fstype', '').upper()) if raw_device else None
+        if not reader or not volume_key:
+            return None
+        try:
+            # Flush the wipe files' deallocation before reading the bitmap behind the filesystem's back
+            os.sync()
+            with reader:
+                bitmap = reader.read_volume_bitmap()
+            self.snapshot_store.save(volume_key, bitmap)
+            print(f"📸 Free-space snapshot saved for {volume_key} "
+                  f"({bitmap.free_unit_count() * bitmap.unit_size / (1024**3):.1f} GB free)")
+            return bitmap
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Cannot snapshot free space: {e}")
+            return None
+
+    def _incremental_rewipe(self, drive_info, method):
+        """Overwrite only space freed since the last snapshot; falls back to a full fill when needed"""
+        mount_point = drive_info['mount_point']
+        fstype = drive_info.get('fstype', '').upper()
+        raw_device = self._get_raw_device(mount_point)
+        volume_key = self._get_volume_identity(mount_point)
+        reader = self._open_bitmap_reader(raw_device, fstype) if raw_device else None
+        if not reader or not volume_key:
+            GLib.idle_add(self._operation_complete, "Incremental mode supports NTFS, exFAT and ext2/3/4 only")
+            return
+
+        stored = self.snapshot_store.load(volume_key)
+        if not stored:
+            print("📸 No free-space snapshot yet - running a full fill")
+            self._wipe_free_space(drive_info, method)
+            return
+        snapshot, header = stored
+        if header.get('incremental_runs', 0) >= self.snapshot_store.FULL_PASS_INTERVAL:
+            print(f"📸 {header['incremental_runs']} incremental runs since the last full pass - running a full fill")
+            self._wipe_free_space(drive_info, method)
+            return
+
+        GLib.idle_add(self._update_info_label, f"Unmounting {mount_point}...")
+        mount_entry = self._unmount_volume(mount_point)
+        if not mount_entry:
+            GLib.idle_add(self._operation_complete, f"Cannot unmount {mount_point} - is it in use?")
+            return
+
+        summary = "Incremental re-wipe failed"
+        succeeded = False
+        try:
+            start_time = time.time()
+            with reader:
+                bitmap = reader.read_volume_bitmap()
+            runs = bitmap.freed_since(snapshot)
+            ranges = bitmap.to_byte_ranges(runs)
+            target_bytes = sum(length for _, length in ranges)
+            total_free = bitmap.free_unit_count() * bitmap.unit_size
+            print(f"📸 Freed since snapshot: {len(runs):,} runs, {target_bytes / (1024**3):.2f} GB "
+                  f"of {total_free / (1024**3):.1f} GB free")
+
+            def report_progress(done, total):
+                elapsed = time.time() - start_time
+                rate = done / elapsed / (1024 * 1024) if elapsed > 0 else 0
+                GLib.idle_add(self.progress_bar.set_fraction, done / total if total > 0 else 1.0)
+                GLib.idle_add(self._update_info_label,
+                              f"Incremental: {done / (1024**3):.2f} of {total / (1024**3):.2f} GB at {rate:.1f} MB/sec")
+
+            writer = RawRangeWriter(raw_device, WipePattern(method, RawRangeWriter.WRITE_SIZE),
+                                    cancel_check=lambda: self.cancelled, progress_callback=report_progress,
+                                    skip_matching=self.check_skip_clean.get_active(),
+                                    rate_limiter=self.rate_limiter)
+            written = writer.write_ranges(ranges)
+            if writer.cancelled:
+                summary = f"Incremental re-wipe cancelled after {written / (1024**3):.2f} GB"
+            else:
+                # Everything free right now has been overwritten at some point
+                self.snapshot_store.save(volume_key, bitmap, header.get('incremental_runs', 0) + 1)
+                summary = (f"Incremental: {written / (1024**3):.2f} GB freed since last wipe overwritten "
+                           f"(skipped {(total_free - target_bytes) / (1024**3):.1f} GB already clean) "
+                           f"in {time.time() - start_time:.0f}s{self._skip_summary(writer.bytes_skipped)}")
+                succeeded = True
+            print(f"✅ {summary}")
+        except (OSError, ValueError, struct.error) as e:
+            print(f"❌ Incremental re-wipe error: {e}")
+            summary = f"Incremental re-wipe failed: {e}"
+            if isinstance(e, ValueError):
+                # Geometry changed (resize/reformat): start over with a full pass next time
+                self.snapshot_store.discard(volume_key)
+        finally:
+            GLib.idle_add(self._update_info_label, f"Mounting {mount_point} again...")
+            if not self._remount_volume(mount_point, mount_entry):
+                summary += f" - remount {raw_device} manually"
+                succeeded = False
+
+        GLib.idle_add(self._operation_complete, summary, succeeded)
+
+    def _get_discard_info(self, drive_info):
+        """Discard capabilities of the drive's physical disk from sysfs"""
+        info = {'granularity': 0, 'max_bytes': 0, 'zeroes_data': 0}
+        physical = self._get_physical_device(drive_info['name'])
+        for key, name in (('granularity', 'discard_granularity'), ('max_bytes', 'discard_max_bytes'),
+                          ('zeroes_data', 'discard_zeroes_data')):
+            try:
+                with open(f"/sys/block/{physical}/queue/{name}", 'r') as f:
+                    info[key] = int(f.read().strip())
+            except (OSError, ValueError):
+                pass
+        return info
+
+    def _sample_trimmed_blocks(self, drive_info, samples=64):
+        """Read random free units behind the filesystem and return (zero_count, sampled)"""
+        raw_device = self._get_raw_device(drive_info['mount_point'])
+        reader = self._open_bitmap_reader(raw_device, drive_info.get('fstype', '').upper()) if raw_device else None
+        if not reader:
+            return 0, 0
+        with reader:
+            bitmap = reader.read_volume_bitmap()
+        free_runs = bitmap.free_runs()
+        if not free_runs:
+            return 0, 0
+
+        zero_count = 0
+        sampled = 0
+        fd = os.open(raw_device, os.O_RDONLY)
+        try:
+            # Drop cached device pages so the reads come from the drive
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            for first, count in random.choices(free_runs, weights=[count for _, count in free_runs], k=samples):
+                unit = first + random.randrange(count)
+                data = os.pread(fd, bitmap.unit_size, bitmap.base_offset + unit * bitmap.unit_size)
+                sampled += 1
+                if data.count(0) == len(data):
+                    zero_count += 1
+        finally:
+            os.close(fd)
+        return zero_count, sampled
+
+    def _trim_free_space(self, drive_info, verify=False):
+        """Ask the filesystem to discard its free space instead of overwriting it"""
+        mount_point = drive_info['mount_point']
+        discard = self._get_discard_info(drive_info)
+        print(f"✂️ Discard granularity {discard['granularity']} bytes, max {discard['max_bytes']} bytes, "
+              f"discard_zeroes_data={discard['zeroes_data']}")
+        if not discard['max_bytes']:
+            GLib.idle_add(self._operation_complete, f"{drive_info['name']} does not support discard - use a fill instead")
+            return
+
+        GLib.idle_add(self._update_info_label, f"Trimming free space on {mount_point}...")
+        GLib.idle_add(self.progress_bar.pulse)
+        try:
+            start_time = time.time()
+            trimmed = fitrim(mount_point, discard['granularity'])
+            elapsed = time.time() - start_time
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY):
+                summary = f"The filesystem on {mount_point} does not support FITRIM"
+            else:
+                summary = f"TRIM failed: {e}"
+            print(f"❌ {summary}")
+            GLib.idle_add(self._operation_complete, summary)
+            return
+
+        summary = (f"TRIM: {trimmed / (1024**3):.1f} GB discarded in {elapsed:.1f}s "
+                   f"(granularity {discard['granularity'] // 1024} KB, discard_zeroes_data={discard['zeroes_data']})")
+        if verify and not self.cancelled:
+            GLib.idle_add(self._update_info_label, "Sampling trimmed blocks...")
+            try:
+                zero_count, sampled = self._sample_trimmed_blocks(drive_info)
+                if sampled:
+                    summary += f" - {zero_count}/{sampled} sampled free blocks read as zeros"
+                    if zero_count < sampled:
+                        # Drive keeps old data readable until garbage collection - not a secure erase
+                        summary += "; the rest still hold data, run a fill for a guaranteed wipe"
+                else:
+                    summary += " - read-back check not available for this filesystem"
+            except (OSError, ValueError, struct.error) as e:
+                print(f"⚠️ Read-back check failed: {e}")
+        print(f"✅ {summary}")
+        GLib.idle_add(self._operation_complete, summary)
+
+    def _read_free_map(self, drive_info, wipe_folder):
+        """Merged free byte ranges of a mounted volume from its allocation bitmap, or None"""
+        fstype = drive_info.get('fstype', '').upper()
+        if fstype.startswith('EXT'):
+            # BLOCK_UNINIT groups read as allocated, so the bitmap misses most free space on lightly used volumes
+            print("📍 ext2/3/4 bitmap leaves out uninitialised block groups - no pre-fill free space comparison")
+            return None
+        # Only worth a sync and a full bitmap read if the wipe files can be mapped afterwards
+        if not fiemap_supported(wipe_folder):
+            return None
+        raw_device = self._get_raw_device(drive_info['mount_point'])
+        reader = self._open_bitmap_reader(raw_device, fstype) if raw_device else None
+        if not reader:
+            return None
+        try:
+            os.sync()
+            with reader:
+                bitmap = reader.read_volume_bitmap()
+            return bitmap.to_byte_ranges(bitmap.free_runs())
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Cannot read the free-space map: {e}")
+            return None
+
+    def _report_extent_coverage(self, wipe_folder, free_map=None):
+        """Where the wipe files physically landed (FIEMAP), compared with the pre-fill free map"""
+        start_time = time.time()
+        extents = []
+        file_count = 0
+        try:
+            # One flush for all files: delayed-allocation extents have no physical address yet
+            os.sync()
+            for entry in os.scandir(wipe_folder):
+                if entry.is_file(follow_symlinks=False):
+                    extents.extend(fiemap_extents(entry.path))
+                    file_count += 1
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL):
+                print("📍 Filesystem does not support FIEMAP - no physical coverage report")
+            else:
+                print(f"⚠️ FIEMAP coverage failed: {e}")
+            return None
+        if not extents:
+            return None
+
+        extent_count = len(extents)
+        extents = merge_runs(extents)
+        mapped_bytes = sum(length for _, length in extents)
+        summary = f"Wipe files cover {mapped_bytes / (1024**3):.1f} GB in {extent_count:,} extents"
+        if free_map:
+            free_bytes = sum(length for _, length in free_map)
+            uncovered = subtract_runs(merge_runs(free_map), extents)
+            uncovered_bytes = sum(length for _, length in uncovered)
+            largest = sorted((length for _, length in uncovered), reverse=True)[:3]
+            summary = (f"{(free_bytes - uncovered_bytes) / (1024**3):.1f} of {free_bytes / (1024**3):.1f} GB "
+                       f"pre-fill free space covered; {len(uncovered):,} uncovered fragments")
+            if largest:
+                summary += " (largest " + ", ".join(f"{length / (1024**2):.1f} MB" for length in largest) + ")"
+        print(f"📍 {summary} - {file_count:,} files mapped in {time.time() - start_time:.1f}s")
+        return summary
+
+    def _physical_free(self, mount_point):
+        """Free bytes as the filesystem accounts them (after compression and dedup)"""
+        try:
+            stats = os.statvfs(mount_point)
+            return stats.f_bfree * stats.f_frsize
+        except OSError:
+            return 0
+
+    def _detect_compression(self, drive_info, wipe_folder):
+        """Reasons the fill's data might be compressed or deduplicated (empty list if none)"""
+        reasons = []
+        entry = self._get_mount_entry(drive_info['mount_point']) or {}
+        options = entry.get('options', '').split(',')
+        if entry.get('fstype') == 'btrfs':
+            for option in options:
+                if option.split('=')[0] in ('compress', 'compress-force') and not option.endswith('=no'):
+                    reasons.append(f"btrfs {option}")
+        elif entry.get('fstype') == 'zfs':
+            result = StreamingCommand(['zfs', 'get', '-H', '-o', 'property,value', 'compression,dedup',
+                                       entry['device']], hard_timeout=10).run()
+            for line in result.stdout.splitlines():
+                fields = line.split('\t')
+                if len(fields) == 2 and fields[1] != 'off':
+                    reasons.append(f"ZFS {fields[0]}={fields[1]}")
+
+        # Compressed attribute inherited by the wipe folder (NTFS compressed folders, btrfs chattr +c)
+        try:
+            fd = os.open(wipe_folder, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                flags = bytearray(8)
+                fcntl.ioctl(fd, FS_IOC_GETFLAGS, flags, True)
+                if struct.unpack_from('<I', flags)[0] & FS_COMPR_FL:
+                    reasons.append("compressed folder attribute")
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+        return reasons
+
+    def _post_wipe_trim(self, drive_info, bitmap=None):
+        """Discard the just-wiped free space and return a summary line for the UI"""
+        mount_point = drive_info['mount_point']
+        discard = self._get_discard_info(drive_info)
+        if not discard['max_bytes']:
+            print(f"✂️ {drive_info['name']} does not support discard - skipping post-wipe TRIM")
+            return None
+
+        GLib.idle_add(self._update_info_label, "Trimming wiped space...")
+        start_time = time.time()
+        try:
+            trimmed = fitrim(mount_point, discard['granularity'])
+        except OSError as e:
+            print(f"⚠️ Post-wipe TRIM failed: {e}")
+            return f"Wipe finished - TRIM not possible on {mount_point}: {e.strerror}"
+        elapsed = time.time() - start_time
+
+        summary = f"Wipe finished - TRIM reclaimed {trimmed / (1024**3):.1f} GB in {elapsed:.1f}s"
+        if bitmap:
+            # FITRIM only reports a total; the free-space bitmap shows how fragmented it was
+            runs = bitmap.free_runs()
+            if runs:
+                largest = max(count for _, count in runs) * bitmap.unit_size
+                average = sum(count for _, count in runs) * bitmap.unit_size / len(runs)
+                summary += (f" across {len(runs):,} free ranges (largest {largest / (1024**2):.0f} MB, "
+                            f"average {average / (1024**2):.1f} MB)")
+        print(f"✂️ {summary}")
+        return summary
+
+    def _raw_partition_wipe(self, drive_info, method):
+        """Overwrite an entire unmounted partition, using secure discard when the device offers it"""
+        device_path = drive_info['device_path']
+        try:
+            wiper = RawDeviceWiper(device_path, method, workers=min(8, os.cpu_count() or 4),
+                                   cancel_check=lambda: self.cancelled, pause_check=self._waiting_for_disk,
+                                   skip_matching=self.check_skip_clean.get_active(),
+                                   rate_limiter=self.rate_limiter, worker_limit=self._worker_limit)
+        except OSError as e:
+            GLib.idle_add(self._operation_complete, f"Cannot open {device_path}: {e.strerror}")
+            return
+        job_log = JobLog('raw', drive_info['name'])
+        job_log.record('start', device=device_path, size=wiper.size, method=method, workers=wiper.workers)
+        print(f"💽 Raw wipe of {device_path}: {wiper.size:,} bytes with {wiper.workers} workers")
+
+        try:
+            GLib.idle_add(self._update_info_label, f"Trying secure discard on {device_path}...")
+            start_time = time.time()
+            if wiper.discard(secure=True):
+                summary = (f"{device_path}: {wiper.size / (1024**3):.1f} GB securely discarded "
+                           f"in {time.time() - start_time:.1f}s")
+                print(f"✅ {summary}")
+                job_log.record('end', summary=summary)
+                GLib.idle_add(self._operation_complete, summary)
+                return
+
+            def report_progress(done, total):
+                elapsed = time.time() - start_time
+                rate = done / elapsed if elapsed > 0 else 0
+                remaining = (total - done) / rate if rate > 0 else 0
+                GLib.idle_add(self.progress_bar.set_fraction, done / total if total > 0 else 1.0)
+                GLib.idle_add(self._update_info_label,
+                              f"{done:,} of {total:,} bytes  Rate: {rate / (1024 * 1024):.1f} MB/sec  "
+                              f"Est Time Remaining: {int(remaining // 60)}m {int(remaining % 60)}s")
+
+            # Every O_DIRECT write is on the disk once it returns: only the ones in flight can be unaccounted
+            self._start_idle_scheduler(drive_info, wiper.workers * RawDeviceWiper.WRITE_SIZE)
+            self._start_thermal_governor(drive_info, job_log)
+            try:
+                written = wiper.run(report_progress)
+            finally:
+                idle_summary = self._stop_idle_scheduler()
+                thermal_summary = self._stop_thermal_governor()
+            elapsed = time.time() - start_time
+            if self.cancelled:
+                summary = f"{device_path}: cancelled after {written:,} of {wiper.size:,} bytes"
+            else:
+                summary = (f"{device_path}: {written:,} bytes overwritten in {elapsed:.0f}s"
+                           f"{'' if wiper.direct_io else ' (buffered I/O)'}{self._skip_summary(wiper.bytes_skipped)}")
+                # Unmap the now-overwritten blocks, as the post-wipe TRIM does for filesystems
+                if self.check_trim_after.get_active() and wiper.discard():
+                    summary += ", then discarded"
+            for extra in (idle_summary, thermal_summary):
+                if extra:
+                    summary += f" - {extra}"
+            print(f"✅ {summary}")
+        except Exception as e:
+            summary = f"{device_path}: raw wipe failed - {e}"
+            print(f"❌ {summary}")
+        job_log.record('end', summary=summary)
+        GLib.idle_add(self._operation_complete, summary)
+
+    def _sweep_unclaimed_space(self, scan, method):
+        """Overwrite partition gaps and filesystem slack, re-checking the layout first"""
+        disk = scan['disk']
+        device_path = f"/dev/{disk}"
+        result = StreamingCommand(['lsblk', '-J', '-o', 'NAME,FSTYPE,PTTYPE,TYPE', device_path], hard_timeout=10).run()
+        try:
+            tree = json.loads(result.stdout)['blockdevices'][0]
+            fstypes = {child.get('name'): child.get('fstype') for child in tree.get('children', [])}
+            fresh = UnclaimedSpaceScanner(disk).scan(tree.get('pttype'), fstypes)
+        except (ValueError, KeyError, IndexError, OSError) as e:
+            GLib.idle_add(self._operation_complete, f"Cannot re-read the layout of {device_path}: {e}")
+            return
+        if fresh['intervals'] != scan['intervals']:
+            GLib.idle_add(self._operation_complete, f"The layout of {device_path} changed - nothing written, scan again")
+            return
+
+        ranges = [(offset, length) for offset, length, _ in scan['intervals']]
+        start_time = time.time()
+
+        def report_progress(done, total):
+            elapsed = time.time() - start_time
+            rate = done / elapsed / (1024 * 1024) if elapsed > 0 else 0
+            GLib.idle_add(self.progress_bar.set_fraction, done / total if total > 0 else 1.0)
+            GLib.idle_add(self._update_info_label,
+                          f"Unclaimed space: {done / (1024**3):.2f} of {total / (1024**3):.2f} GB at {rate:.1f} MB/sec")
+
+        # Partitions may be mounted, so no exclusive claim; the ranges lie outside all of them
+        writer = RawRangeWriter(device_path, WipePattern(method, RawRangeWriter.WRITE_SIZE),
+                                cancel_check=lambda: self.cancelled, progress_callback=report_progress,
+                                exclusive=False, direct_io=True, skip_matching=self.check_skip_clean.get_active(),
+                                rate_limiter=self.rate_limiter)
+        try:
+            written = writer.write_ranges(ranges)
+            gaps = sum(1 for _, _, kind in scan['intervals'] if kind == 'gap')
+            slack = len(scan['intervals']) - gaps
+            summary = (f"{device_path}: {written / (1024**3):.2f} GB of unclaimed space overwritten "
+                       f"({gaps} gaps, {slack} filesystem slack areas) in {time.time() - start_time:.0f}s"
+                       f"{self._skip_summary(writer.bytes_skipped)}")
+            if writer.cancelled:
+                summary = f"{device_path}: sweep cancelled after {written / (1024**3):.2f} GB"
+            print(f"✅ {summary}")
+        except OSError as e:
+            summary = f"{device_path}: sweep failed - {e}"
+            print(f"❌ {summary}")
+        GLib.idle_add(self._operation_complete, summary)
+
+    def _skip_summary(self, bytes_skipped):
+        """Summary suffix for blocks the read-compare stage left alone"""
+        if not bytes_skipped:
+            return ""
+        print(f"🔁 Read-compare skipped {bytes_skipped:,} bytes that already held the pattern")
+        return f", {bytes_skipped / (1024**3):.2f} GB already clean and skipped (writes avoided)"
+
     def _update_info_label(self, text):
         """Update the info label text"""
         self.info_label.set_text(text)
@@ -2426,6 +6350,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
             print("NTFS drive detected - cleaning MFT metadata only...")
             GLib.idle_add(self._update_info_label, "Cleaning MFT metadata only...")
             success = self._clean_mft_metadata(mount_point, drive_info)
+            self._invalidate_persistent_scan(drive_info)
             if success:
                 GLib.idle_add(self._update_info_label, "MFT metadata cleaning completed!")
             else:
@@ -2434,6 +6359,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
             print("exFAT drive detected - cleaning directory metadata only...")
             GLib.idle_add(self._update_info_label, "Cleaning exFAT metadata only...")
             success = self._clean_exfat_metadata(mount_point, drive_info)
+            self._invalidate_persistent_scan(drive_info)
             if success:
                 GLib.idle_add(self._update_info_label, "exFAT metadata cleaning completed!")
             else:
@@ -2445,21 +6371,8 @@ class FreeSpaceWipeWindow(Gtk.Window):
         GLib.idle_add(self._metadata_clean_complete)
     
     def _metadata_clean_complete(self):
-        """Reset UI after metadata-only cleaning"""
-        self.wiping = False
-        self.paused = False
-        
-        # Re-enable all controls
-        self.start_button.set_sensitive(True)
-        self.mft_clean_button.set_sensitive(True)
-        self.pause_button.set_sensitive(False)
-        self.pause_button.set_label("Pause")
-        self.progress_bar.set_fraction(0)
-        
-        # Re-enable drive selection
-        self.drives_combo.set_sensitive(True)
-        
-        return False
+        """Reset UI after metadata-only cleaning (the worker already set the result text)"""
+        return self._operation_complete()
     
     def _wipe_free_space(self, drive_info, method):
         mount_point = drive_info['mount_point']
@@ -2471,18 +6384,31 @@ class FreeSpaceWipeWindow(Gtk.Window):
             GLib.idle_add(self._update_info_label, "Cleaning MFT metadata...")
             if not self._clean_mft_metadata(mount_point, drive_info):
                 print("MFT cleaning failed, continuing with free space wipe...")
+            self._invalidate_persistent_scan(drive_info)
         elif 'EXFAT' in fstype:
             print("exFAT drive detected - cleaning directory metadata first...")
             GLib.idle_add(self._update_info_label, "Cleaning exFAT metadata...")
             if not self._clean_exfat_metadata(mount_point, drive_info):
                 print("exFAT cleaning failed, continuing with free space wipe...")
+            self._invalidate_persistent_scan(drive_info)
         
         wipe_folder = os.path.join(mount_point, "Free Space Cleaner")
+        disk_filled = False
+        bytes_written = 0
+        summaries = []
+        governor = None
+        ballast = None
+        job_log = JobLog('fill', drive_info['name'])
+        physical_free_start = self._physical_free(mount_point)
+        free_map = None
         
         try:
             # Create the wipe folder
             os.makedirs(wipe_folder, exist_ok=True)
             
+            # Free space before the fill, to check which of it the wipe files really landed on
+            free_map = self._read_free_map(drive_info, wipe_folder)
+            
             # Get initial free space
             total_free = drive_info['free']
             
@@ -2490,18 +6416,30 @@ class FreeSpaceWipeWindow(Gtk.Window):
             chunk_size = 64 * 1024 * 1024  # 64MB chunks - balance between speed and update frequency
             max_file_size = 1024 * 1024 * 1024  # 1GB per file (CCleaner style)
             
-            if method == "zeros":
-                data_chunk = b'\x00' * chunk_size
-            elif method == "ones":
-                data_chunk = b'\xFF' * chunk_size
-            elif method == "3487":
-                pattern = b"3487"
-                data_chunk = pattern * (chunk_size // len(pattern))
-            else:  # random
-                data_chunk = None  # Generate on the fly
+            # Compressed/deduplicated storage would swallow repeating patterns without filling anything
+            compression = self._detect_compression(drive_info, wipe_folder)
+            if compression and method != "keystream":
+                print(f"🗜️ {', '.join(compression)} - writing an incompressible keystream instead of {method}")
+                GLib.idle_add(self._update_info_label, f"Compression detected ({compression[0]}) - using incompressible data")
+                method = "keystream"
+            
+            pattern = WipePattern(method, chunk_size)
+            job_log.record('start', mount_point=mount_point, method=method, free=total_free)
+            
+            governor = DirtyMemoryGovernor(self.dirty_watermark_spin.get_value() / 100,
+                                           self._get_physical_device(drive_info['name'])).start()
+            self._start_idle_scheduler(drive_info)
+            self._start_thermal_governor(drive_info, job_log)
+            
+            reserve_reached = False
+            rotated_from = None
+            rotation_target = 0
+            if self.check_ballast.get_active():
+                ballast = self._start_ballast(mount_point)
+                rotation_target = ballast.reserve_bytes * BallastManager.ROTATION_PASSES
+                total_free = max(1, total_free - ballast.reserve_bytes) + rotation_target
             
             file_count = 0
-            bytes_written = 0
             start_time = time.time()
             last_update_time = start_time
             last_update_bytes = 0
@@ -2536,19 +6474,26 @@ class FreeSpaceWipeWindow(Gtk.Window):
                 try:
                     with open(file_path, 'wb', buffering=chunk_size) as f:
                         while self.wiping and current_file_size < max_file_size:
-                            # Check if paused
-                            while self.paused and self.wiping:
+                            # Check if paused (by the user or by opportunistic mode)
+                            while self._waiting_for_disk() and self.wiping:
                                 time.sleep(0.1)
                             
                             if not self.wiping:
                                 break
                             
-                            if method == "random":
-                                chunk = os.urandom(chunk_size)
-                            else:
-                                chunk = data_chunk
+                            if ballast and ballast.headroom() < chunk_size:
+                                reserve_reached = True
+                                break
+                            
+                            governor.pace(lambda: self.wiping)
+                            self.rate_limiter.consume(chunk_size, lambda: self.wiping)
+                            chunk = pattern.chunk()
                             
-                            f.write(chunk)
+                            if self.idle_scheduler:
+                                # Opportunistic mode tells our writes from others' only once they are on disk
+                                write_through(f, chunk, current_file_size, IdleWindowScheduler.WRITE_THROUGH_SIZE)
+                            else:
+                                f.write(chunk)
                             bytes_written += len(chunk)
                             current_file_size += len(chunk)
                             
@@ -2559,8 +6504,14 @@ class FreeSpaceWipeWindow(Gtk.Window):
                                 bytes_diff = bytes_written - last_update_bytes
                                 rate = bytes_diff / time_diff / (1024 * 1024) if time_diff > 0 else 0
                                 
-                                progress = bytes_written / total_free
-                                remaining_bytes = total_free - bytes_written
+                                if compression:
+                                    # Logical bytes say nothing about coverage here; follow the real free space
+                                    physical_used = physical_free_start - self._physical_free(mount_point)
+                                    progress = physical_used / physical_free_start if physical_free_start else 0
+                                    remaining_bytes = max(0, physical_free_start - physical_used)
+                                else:
+                                    progress = bytes_written / total_free
+                                    remaining_bytes = total_free - bytes_written
                                 time_remaining = remaining_bytes / (bytes_diff / time_diff) if bytes_diff > 0 else 0
                                 
                                 # Check if we should update free space display
@@ -2582,9 +6533,23 @@ class FreeSpaceWipeWindow(Gtk.Window):
                     
                     file_count += 1
                     
+                    if ballast:
+                        if current_file_size:
+                            ballast.add(file_path)
+                        else:
+                            os.unlink(file_path)
+                        if reserve_reached:
+                            # At the reserve: swap the oldest file out so new writes land elsewhere
+                            if rotated_from is None:
+                                rotated_from = bytes_written
+                            if bytes_written - rotated_from >= rotation_target or not ballast.rotate():
+                                break
+                            reserve_reached = False
+                    
                 except OSError as e:
-                    # Disk is full
+                    # Disk is full (with a reserve, other writers got there first: not a complete fill)
                     if e.errno == 28:
+                        disk_filled = not ballast
                         break
                     else:
                         raise
@@ -2592,6 +6557,46 @@ class FreeSpaceWipeWindow(Gtk.Window):
         except Exception as e:
             print(f"Error during wipe: {e}")
         finally:
+            idle_summary = self._stop_idle_scheduler()
+            if idle_summary:
+                print(f"🕰️ {idle_summary}")
+                summaries.append(idle_summary)
+            
+            thermal_summary = self._stop_thermal_governor()
+            if thermal_summary:
+                print(f"🌡️ {thermal_summary}")
+                summaries.append(thermal_summary)
+            
+            if ballast:
+                ballast.stop()
+                ballast_summary = (f"Safe fill kept {ballast.reserve_bytes / (1024**3):.1f} GB free, rotated "
+                                   f"{(bytes_written - rotated_from if rotated_from is not None else 0) / (1024**3):.1f} GB")
+                if ballast.release_count:
+                    ballast_summary += (f", gave {ballast.released_bytes / (1024**3):.1f} GB back to other programs "
+                                        f"{ballast.release_count} times (slowest {ballast.slowest_release * 1000:.0f} ms)")
+                print(f"⚓ {ballast_summary}")
+                summaries.append(ballast_summary)
+            
+            if governor:
+                governor.stop()
+                if governor.throttled_seconds >= 1:
+                    throttle = (f"Writes paced for {governor.throttled_seconds:.0f}s to keep dirty memory under "
+                                f"{governor.high_watermark / (1024**2):.0f} MB (peak {governor.peak_dirty / (1024**2):.0f} MB)")
+                    print(f"🚦 {throttle}")
+                    summaries.append(throttle)
+            
+            if bytes_written and physical_free_start:
+                physical_used = physical_free_start - self._physical_free(mount_point)
+                coverage = (f"Physical coverage {physical_used / (1024**3):.1f} of {physical_free_start / (1024**3):.1f} GB "
+                            f"free ({physical_used / physical_free_start * 100:.1f}%) for "
+                            f"{bytes_written / (1024**3):.1f} GB written")
+                print(f"📏 {coverage}")
+                summaries.append(coverage)
+                
+                extent_summary = self._report_extent_coverage(wipe_folder, free_map)
+                if extent_summary:
+                    summaries.append(extent_summary)
+            
             # Clean up - Remove wipe folder and all contents recursively
             try:
                 if os.path.exists(wipe_folder):
@@ -2600,8 +6605,19 @@ class FreeSpaceWipeWindow(Gtk.Window):
             except Exception as e:
                 print(f"Error removing wipe folder: {e}")
             
+            bitmap = None
+            if disk_filled and not self.cancelled:
+                bitmap = self._snapshot_free_space(drive_info)
+            
+            if not self.cancelled and self.check_trim_after.get_active():
+                trim_summary = self._post_wipe_trim(drive_info, bitmap)
+                if trim_summary:
+                    summaries.append(trim_summary)
+            
+            job_log.record('end', bytes_written=bytes_written, cancelled=self.cancelled, summary=" | ".join(summaries))
+            
             # Reset UI
-            GLib.idle_add(self._wipe_complete)
+            GLib.idle_add(self._wipe_complete, " | ".join(summaries) or None)
     
         
         # Update free space display for current drive (only every 3 seconds)
@@ -2659,7 +6675,7 @@ class FreeSpaceWipeWindow(Gtk.Window):
         
         return False
     
-    def _wipe_complete(self):
+    def _wipe_complete(self, summary=None):
         self.wiping = False
         self.paused = False
         
@@ -2694,10 +6710,8 @@ class FreeSpaceWipeWindow(Gtk.Window):
                     self.radio_zeros.set_active(True)
                 # MFT clean option is skipped in cycling - it doesn't make sense to cycle it
             
-            # Only restart if not MFT clean mode
-            if not self.radio_mft_clean.get_active():
-                # Restart the wipe
-                GLib.timeout_add(500, self._restart_wipe)
+            # Restart the wipe (MFT clean has its own button and never gets here)
+            GLib.timeout_add(500, self._restart_wipe)
         else:
             # Normal completion or cancelled - reset UI
             self.current_drive_index = -1
@@ -2706,10 +6720,11 @@ class FreeSpaceWipeWindow(Gtk.Window):
             self.pause_button.set_sensitive(False)
             self.pause_button.set_label("Pause")
             self.progress_bar.set_fraction(0)
-            self.info_label.set_text("Rate: 0 MB/sec  Est Time Remaining: --")
+            self.info_label.set_text(summary or "Rate: 0 MB/sec  Est Time Remaining: --")
             
             # Re-enable drive selection and wipe methods
             self.drives_combo.set_sensitive(True)
+            self.mode_combo.set_sensitive(True)
             self.radio_zeros.set_sensitive(True)
             self.radio_random.set_sensitive(True)
             self.radio_ones.set_sensitive(True)
@@ -2718,6 +6733,11 @@ class FreeSpaceWipeWindow(Gtk.Window):
         return False
     
     def _restart_wipe(self):
+        # Incremental runs were confirmed once; later passes skip the unmount prompt
+        if self.mode_combo.get_active_id() == 'incremental' and 0 <= self.current_drive_index < len(self.drives):
+            self._start_operation(self._incremental_rewipe, self.drives[self.current_drive_index],
+                                  self._get_selected_wipe_method() or "zeros")
+            return False
         # Trigger start button click to restart
         self.on_start_clicked(None)
         return False
@@ -2727,7 +6747,49 @@ class FreeSpaceWipeWindow(Gtk.Window):
         self._update_mft_tooltip_status()
 
 def main():
+    parser = argparse.ArgumentParser(description="Barone's Free Space Cleaner")
+    parser.add_argument('--rate-limit', type=float, metavar='MB_PER_SEC',
+                        help="limit wipe writes to this many MB/sec (0 = unlimited)")
+    parser.add_argument('--dirty-watermark', type=float, metavar='PERCENT',
+                        help="keep the fill's unwritten page cache under this share of RAM (0 = no cap)")
+    parser.add_argument('--io-priority', choices=IO_PRIORITIES,
+                        help="I/O class for wipe threads")
+    parser.add_argument('--control-file', default=os.path.join(get_cache_dir(), 'control'),
+                        help="file a running instance watches for live changes")
+    parser.add_argument('--set-rate', type=float, metavar='MB_PER_SEC',
+                        help="change the rate limit of a running instance and exit")
+    parser.add_argument('--benchmark-pressure', metavar='DIRECTORY',
+                        help="time sharded metadata pressure file creation in DIRECTORY and exit")
+    parser.add_argument('--pressure-files', type=int, default=200000,
+                        help="files to create for --benchmark-pressure")
+    parser.add_argument('--pressure-fstype', choices=('NTFS', 'EXFAT'), default='NTFS',
+                        help="shard layout to benchmark with --benchmark-pressure")
+    parser.add_argument('--pressure-fanout', type=int, default=PRESSURE_SHARD_FANOUT, metavar='DIRECTORIES',
+                        help="most shard subdirectories for MFT/exFAT pressure files (cleaning and benchmark)")
+    parser.add_argument('--benchmark-health-parser', metavar='CORPUS_DIR',
+                        help="time the SMART parser over `smartctl -j -a` outputs (*.json, samples in "
+                             "assets/smartctl) and exit")
+    parser.add_argument('--repeat', type=int, default=200,
+                        help="parses per file for --benchmark-health-parser")
+    args = parser.parse_args()
+    
+    if args.benchmark_pressure:
+        benchmark_pressure_files(args.benchmark_pressure, args.pressure_files, args.pressure_fstype,
+                                 max(1, args.pressure_fanout))
+        return
+    
+    if args.benchmark_health_parser:
+        benchmark_health_parser(args.benchmark_health_parser, args.repeat)
+        return
+    
+    if args.set_rate is not None:
+        write_control_file(args.control_file, args.set_rate)
+        print(f"Rate limit {args.set_rate:g} MB/sec sent to {args.control_file}")
+        return
+    
     win = FreeSpaceWipeWindow()
+    win.configure(rate_limit=args.rate_limit, io_priority=args.io_priority, control_file=args.control_file,
+                  dirty_watermark=args.dirty_watermark, pressure_fanout=max(1, args.pressure_fanout))
     win.connect("destroy", Gtk.main_quit)
     win.show_all()
     Gtk.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Check the opportunistic-mode idle scheduler against a real disk.
+
+Runs a fill the way the app does in opportunistic mode (write_through in WRITE_THROUGH_SIZE steps) in a
+scratch directory while IdleWindowScheduler watches the directory's disk:
+
+    sudo python3 tools/check_idle_scheduler.py /mnt/scratch                  # must never pause itself
+    sudo python3 tools/check_idle_scheduler.py /mnt/scratch --foreign-writer  # must pause for another writer
+
+Exits non-zero when the scheduler does the wrong thing.
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import shutil
+import subprocess
+import time
+
+_spec = importlib.util.spec_from_file_location(
+    'free_space_wipe', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'free-space-wipe.py'))
+fsw = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(fsw)
+
+
+def disk_for_path(path):
+    """Whole-disk /proc/diskstats name holding path (sda for sda2), or None for virtual filesystems"""
+    st_dev = os.stat(path).st_dev
+    sys_path = os.path.realpath(f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}")
+    if not os.path.isdir(sys_path):
+        return None
+    if os.path.exists(os.path.join(sys_path, 'partition')):
+        sys_path = os.path.dirname(sys_path)
+    return os.path.basename(sys_path)
+
+
+def check_idle_scheduler(directory, megabytes=2048, disk_name=None, foreign_writer=False, settle_seconds=5.0):
+    """Fill a scratch directory under the scheduler; True if it paused exactly when another writer was running"""
+    disk_name = disk_name or disk_for_path(directory)
+    scheduler = fsw.IdleWindowScheduler(disk_name).start() if disk_name else None
+    if not scheduler:
+        print(f"❌ No disk statistics for {directory} - pass --disk")
+        return False
+
+    temp_dir = os.path.join(directory, f"IDLE_CHECK_{random.randint(1000, 9999)}")
+    os.makedirs(temp_dir, exist_ok=True)
+    chunk = b'\x00' * (64 * 1024 * 1024)
+    written = 0
+    writer = None
+    print(f"📂 Writing {megabytes:,} MB to {temp_dir} while watching {disk_name}")
+    start_time = time.time()
+    try:
+        if foreign_writer:
+            # Another program writing steadily at about 16 MB/s, like a busy database
+            writer = subprocess.Popen(
+                ['sh', '-c', f"for i in $(seq 1 40); do dd if=/dev/zero of={temp_dir}/foreign bs=4M count=1 "
+                             f"oflag=direct conv=notrunc seek=$i status=none; sleep 0.25; done"])
+        file_index = 0
+        while written < megabytes * 1024 * 1024 or (writer and writer.poll() is None):
+            with open(os.path.join(temp_dir, f"fill_{file_index:04d}.tmp"), 'wb') as f:
+                for _ in range(16):
+                    while scheduler.paused:
+                        time.sleep(0.1)
+                    fsw.write_through(f, chunk, f.tell(), fsw.IdleWindowScheduler.WRITE_THROUGH_SIZE)
+                    written += len(chunk)
+            file_index += 1
+        # Keep watching while the last of it settles
+        time.sleep(settle_seconds)
+    finally:
+        if writer:
+            writer.wait()
+        scheduler.stop()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    elapsed = time.time() - start_time
+    print(f"Wrote {written / (1024 * 1024):,.0f} MB in {elapsed:.1f}s, "
+          f"paused {scheduler.pause_count} time(s) for {scheduler.paused_seconds:.1f}s")
+    if foreign_writer and not scheduler.pause_count:
+        print(f"❌ Scheduler never paused for the other writer on {disk_name}")
+        return False
+    if not foreign_writer and scheduler.pause_count:
+        print(f"❌ Scheduler paused the fill with no other I/O on {disk_name}")
+        return False
+    print("✅ Scheduler paused only for the other writer" if foreign_writer else "✅ Scheduler never paused the fill")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the idle scheduler used by opportunistic mode")
+    parser.add_argument('directory', help="scratch directory on the disk to check")
+    parser.add_argument('--megabytes', type=int, default=2048, help="data to write")
+    parser.add_argument('--disk', help="/proc/diskstats name to watch (default: disk of DIRECTORY)")
+    parser.add_argument('--foreign-writer', action='store_true',
+                        help="run another writer alongside and require a pause")
+    args = parser.parse_args()
+    if not check_idle_scheduler(args.directory, args.megabytes, args.disk, args.foreign_writer):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()